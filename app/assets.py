@@ -0,0 +1,429 @@
+"""
+Offline stylesheet build for the templates' Tailwind utility classes.
+
+Instead of Tailwind's in-browser compiler, `build()` scans app/templates for
+the class names actually used, generates CSS for the ones it recognises (a
+Tailwind v3 compatible subset: spacing, sizing, flex/grid, typography, colours,
+borders, radii, shadows, rings, transitions, and the hover:/focus:/sm:/md:/lg:/xl:
+variants) after a compact preflight, and writes it to app/static under a
+content-hashed name, with .gz and .br variants next to it. Nothing is fetched
+from the network, at build time or in the browser.
+
+The current file name is recorded in app/static/manifest.json together with a
+digest of the templates it was built from. Startup rebuilds only when that
+digest changes; the Docker image builds at image build time:
+
+    python -m app.assets
+
+`AssetFiles` serves /static: hashed files get a one-year immutable Cache-Control
+and the precompressed variant the client accepts.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.responses import FileResponse
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except ImportError:  # optional: without it only the gzip variant is written
+    brotli = None
+
+APP_DIR = Path(__file__).parent
+TEMPLATE_DIR = APP_DIR / "templates"
+STATIC_DIR = APP_DIR / "static"
+MANIFEST = STATIC_DIR / "manifest.json"
+STYLESHEET = "app.css"
+# Hand-written rules appended after the utilities
+CUSTOM_CSS = STATIC_DIR / "style.css"
+
+# Builds kept on disk besides the current one, for pages rendered before a rebuild
+KEEP_PREVIOUS_BUILDS = 3
+IMMUTABLE = "public, max-age=31536000, immutable"
+_HASHED_NAME_RE = re.compile(r"^[\w-]+\.[0-9a-f]{12}\.\w+$")
+
+
+# --- Theme (Tailwind v3 defaults) ---
+
+COLORS: Dict[str, Dict[str, str]] = {
+    "slate": {"50": "#f8fafc", "100": "#f1f5f9", "200": "#e2e8f0", "300": "#cbd5e1", "400": "#94a3b8",
+              "500": "#64748b", "600": "#475569", "700": "#334155", "800": "#1e293b", "900": "#0f172a"},
+    "gray": {"50": "#f9fafb", "100": "#f3f4f6", "200": "#e5e7eb", "300": "#d1d5db", "400": "#9ca3af",
+             "500": "#6b7280", "600": "#4b5563", "700": "#374151", "800": "#1f2937", "900": "#111827"},
+    "red": {"50": "#fef2f2", "100": "#fee2e2", "200": "#fecaca", "300": "#fca5a5", "400": "#f87171",
+            "500": "#ef4444", "600": "#dc2626", "700": "#b91c1c", "800": "#991b1b", "900": "#7f1d1d"},
+    "orange": {"50": "#fff7ed", "100": "#ffedd5", "200": "#fed7aa", "300": "#fdba74", "400": "#fb923c",
+               "500": "#f97316", "600": "#ea580c", "700": "#c2410c", "800": "#9a3412", "900": "#7c2d12"},
+    "yellow": {"50": "#fefce8", "100": "#fef9c3", "200": "#fef08a", "300": "#fde047", "400": "#facc15",
+               "500": "#eab308", "600": "#ca8a04", "700": "#a16207", "800": "#854d0e", "900": "#713f12"},
+    "green": {"50": "#f0fdf4", "100": "#dcfce7", "200": "#bbf7d0", "300": "#86efac", "400": "#4ade80",
+              "500": "#22c55e", "600": "#16a34a", "700": "#15803d", "800": "#166534", "900": "#14532d"},
+    "sky": {"50": "#f0f9ff", "100": "#e0f2fe", "200": "#bae6fd", "300": "#7dd3fc", "400": "#38bdf8",
+            "500": "#0ea5e9", "600": "#0284c7", "700": "#0369a1", "800": "#075985", "900": "#0c4a6e"},
+    "blue": {"50": "#eff6ff", "100": "#dbeafe", "200": "#bfdbfe", "300": "#93c5fd", "400": "#60a5fa",
+             "500": "#3b82f6", "600": "#2563eb", "700": "#1d4ed8", "800": "#1e40af", "900": "#1e3a8a"},
+}
+NAMED_COLORS = {"white": "#fff", "black": "#000", "transparent": "transparent", "current": "currentColor"}
+
+SCREENS = (("sm", "640px"), ("md", "768px"), ("lg", "1024px"), ("xl", "1280px"), ("2xl", "1536px"))
+PSEUDO_VARIANTS = ("hover", "focus")
+
+FONT_SIZES = {
+    "xs": ("0.75rem", "1rem"), "sm": ("0.875rem", "1.25rem"), "base": ("1rem", "1.5rem"),
+    "lg": ("1.125rem", "1.75rem"), "xl": ("1.25rem", "1.75rem"), "2xl": ("1.5rem", "2rem"),
+    "3xl": ("1.875rem", "2.25rem"), "4xl": ("2.25rem", "2.5rem"),
+}
+FONT_WEIGHTS = {"light": "300", "normal": "400", "medium": "500", "semibold": "600", "bold": "700"}
+RADII = {"none": "0px", "sm": "0.125rem", "": "0.25rem", "md": "0.375rem", "lg": "0.5rem", "xl": "0.75rem", "full": "9999px"}
+SHADOWS = {
+    "sm": "0 1px 2px 0 rgb(0 0 0 / 0.05)",
+    "": "0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)",
+    "md": "0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)",
+    "lg": "0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)",
+    "none": "0 0 #0000",
+}
+TRANSITIONS = {
+    "": "color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, transform, filter",
+    "colors": "color, background-color, border-color, text-decoration-color, fill, stroke",
+    "shadow": "box-shadow",
+    "opacity": "opacity",
+}
+SIDES = {"t": ("top",), "r": ("right",), "b": ("bottom",), "l": ("left",), "x": ("left", "right"), "y": ("top", "bottom")}
+CORNERS = {"t": ("top-left", "top-right"), "r": ("top-right", "bottom-right"),
+           "b": ("bottom-right", "bottom-left"), "l": ("top-left", "bottom-left")}
+DISPLAYS = {"block": "block", "inline-block": "inline-block", "inline": "inline", "flex": "flex",
+            "inline-flex": "inline-flex", "grid": "grid", "hidden": "none"}
+ALIGN = {"start": "flex-start", "end": "flex-end", "center": "center", "baseline": "baseline", "stretch": "stretch"}
+JUSTIFY = {"start": "flex-start", "end": "flex-end", "center": "center", "between": "space-between", "around": "space-around"}
+
+PREFLIGHT = """\
+*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb;\
+--tw-ring-offset-width:0px;--tw-ring-offset-color:#fff;--tw-ring-color:rgb(59 130 246 / 0.5);\
+--tw-ring-offset-shadow:0 0 #0000;--tw-ring-shadow:0 0 #0000;--tw-shadow:0 0 #0000}
+html{line-height:1.5;-webkit-text-size-adjust:100%;tab-size:4;\
+font-family:ui-sans-serif,system-ui,sans-serif,"Apple Color Emoji","Segoe UI Emoji","Segoe UI Symbol","Noto Color Emoji"}
+body{margin:0;line-height:inherit}
+hr{height:0;color:inherit;border-top-width:1px}
+h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}
+a{color:inherit;text-decoration:inherit}
+b,strong{font-weight:bolder}
+code,kbd,samp,pre{font-family:ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,monospace;font-size:1em}
+small{font-size:80%}
+table{text-indent:0;border-color:inherit;border-collapse:collapse}
+button,input,optgroup,select,textarea{font-family:inherit;font-size:100%;font-weight:inherit;line-height:inherit;\
+color:inherit;margin:0;padding:0}
+button,select{text-transform:none}
+button,[type='button'],[type='reset'],[type='submit']{-webkit-appearance:button;background-color:transparent;background-image:none}
+:-moz-focusring{outline:auto}
+progress{vertical-align:baseline}
+summary{display:list-item}
+blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{margin:0}
+fieldset{margin:0;padding:0}
+legend{padding:0}
+ol,ul,menu{list-style:none;margin:0;padding:0}
+textarea{resize:vertical}
+input::placeholder,textarea::placeholder{opacity:1;color:#9ca3af}
+button,[role="button"]{cursor:pointer}
+:disabled{cursor:default}
+img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}
+img,video{max-width:100%;height:auto}
+[hidden]{display:none}
+"""
+
+
+# --- Utilities ---
+
+def _spacing(value: str) -> Optional[str]:
+    if value == "0":
+        return "0px"
+    if value == "px":
+        return "1px"
+    if value == "auto":
+        return "auto"
+    if re.fullmatch(r"\d+(\.5)?", value):
+        return f"{float(value) / 4:g}rem"
+    return None
+
+
+def _size(value: str) -> Optional[str]:
+    if value == "full":
+        return "100%"
+    if value == "screen":
+        return "100vw"
+    fraction = re.fullmatch(r"(\d+)/(\d+)", value)
+    if fraction:
+        return f"{int(fraction.group(1)) / int(fraction.group(2)) * 100:g}%"
+    return _spacing(value)
+
+
+def _color(value: str) -> Optional[str]:
+    if value in NAMED_COLORS:
+        return NAMED_COLORS[value]
+    family, _, shade = value.rpartition("-")
+    return COLORS.get(family, {}).get(shade)
+
+
+def _negate(sign: str, value: Optional[str]) -> Optional[str]:
+    if not sign or value in (None, "auto"):
+        return None if sign and value == "auto" else value
+    return value if value == "0px" else f"-{value}"
+
+
+def _box(prop: str, sides: str, value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    if not sides:
+        return f"{prop}:{value}"
+    return ";".join(f"{prop}-{side}:{value}" for side in SIDES[sides])
+
+
+# Each rule maps a utility (without variants) to declarations, or to
+# (declarations, selector suffix) for utilities that style children. A rule's
+# position in this list is its position in the stylesheet, so shorthands come
+# before the axis and side utilities that refine them, as in Tailwind.
+Rule = Tuple["re.Pattern[str]", Callable[..., object]]
+RULES: List[Rule] = [
+    (re.compile(r"container"), lambda m: "width:100%"),
+    (re.compile(r"(block|inline-block|inline|flex|inline-flex|grid|hidden)"), lambda m: f"display:{DISPLAYS[m[1]]}"),
+    (re.compile(r"(-?)m([xytrbl]?)-(.+)"), lambda m: _box("margin", m[2], _negate(m[1], _spacing(m[3])))),
+    (re.compile(r"space-([xy])-(.+)"), lambda m: _spacing(m[2]) and (
+        f"margin-{'left' if m[1] == 'x' else 'top'}:{_spacing(m[2])}", " > :not([hidden]) ~ :not([hidden])")),
+    (re.compile(r"w-(.+)"), lambda m: _size(m[1]) and f"width:{_size(m[1])}"),
+    (re.compile(r"h-(.+)"), lambda m: _size(m[1]) and f"height:{_size(m[1]).replace('vw', 'vh')}"),
+    (re.compile(r"flex-(1|auto|none)"), lambda m: "flex:" + {"1": "1 1 0%", "auto": "1 1 auto", "none": "none"}[m[1]]),
+    (re.compile(r"flex-grow|grow"), lambda m: "flex-grow:1"),
+    (re.compile(r"flex-(row|col)"), lambda m: "flex-direction:" + ("row" if m[1] == "row" else "column")),
+    (re.compile(r"flex-(wrap|nowrap)"), lambda m: f"flex-wrap:{m[1]}"),
+    (re.compile(r"grid-cols-(\d+)"), lambda m: f"grid-template-columns:repeat({m[1]},minmax(0,1fr))"),
+    (re.compile(r"col-span-(\d+)"), lambda m: f"grid-column:span {m[1]} / span {m[1]}"),
+    (re.compile(r"items-(start|end|center|baseline|stretch)"), lambda m: f"align-items:{ALIGN[m[1]]}"),
+    (re.compile(r"justify-(start|end|center|between|around)"), lambda m: f"justify-content:{JUSTIFY[m[1]]}"),
+    (re.compile(r"gap-(.+)"), lambda m: _spacing(m[1]) and f"gap:{_spacing(m[1])}"),
+    (re.compile(r"gap-([xy])-(.+)"), lambda m: _spacing(m[2]) and f"{'column' if m[1] == 'x' else 'row'}-gap:{_spacing(m[2])}"),
+    (re.compile(r"rounded(?:-(none|sm|md|lg|xl|full))?"), lambda m: f"border-radius:{RADII[m[1] or '']}"),
+    (re.compile(r"rounded-([trbl])(?:-(none|sm|md|lg|xl|full))?"), lambda m: ";".join(
+        f"border-{corner}-radius:{RADII[m[2] or '']}" for corner in CORNERS[m[1]])),
+    (re.compile(r"border(?:-(0|2|4|8))?"), lambda m: f"border-width:{m[1] or 1}px"),
+    (re.compile(r"border-([trblxy])(?:-(0|2|4|8))?"), lambda m: ";".join(
+        f"border-{side}-width:{m[2] or 1}px" for side in SIDES[m[1]])),
+    (re.compile(r"border-(.+)"), lambda m: _color(m[1]) and f"border-color:{_color(m[1])}"),
+    (re.compile(r"bg-(.+)"), lambda m: _color(m[1]) and f"background-color:{_color(m[1])}"),
+    (re.compile(r"(-?)p([xytrbl]?)-(.+)"), lambda m: not m[1] and _box("padding", m[2], _spacing(m[3]))),
+    (re.compile(r"text-(left|center|right)"), lambda m: f"text-align:{m[1]}"),
+    (re.compile(r"text-(xs|sm|base|lg|xl|2xl|3xl|4xl)"), lambda m: "font-size:{};line-height:{}".format(*FONT_SIZES[m[1]])),
+    (re.compile(r"font-(light|normal|medium|semibold|bold)"), lambda m: f"font-weight:{FONT_WEIGHTS[m[1]]}"),
+    (re.compile(r"text-(.+)"), lambda m: _color(m[1]) and f"color:{_color(m[1])}"),
+    (re.compile(r"(underline|no-underline|line-through)"), lambda m: "text-decoration-line:" + ("none" if m[1] == "no-underline" else m[1])),
+    (re.compile(r"shadow(?:-(sm|md|lg|none))?"), lambda m: (
+        f"--tw-shadow:{SHADOWS[m[1] or '']};"
+        "box-shadow:var(--tw-ring-offset-shadow,0 0 #0000),var(--tw-ring-shadow,0 0 #0000),var(--tw-shadow)")),
+    (re.compile(r"outline-none"), lambda m: "outline:2px solid transparent;outline-offset:2px"),
+    (re.compile(r"ring(?:-(0|1|2|4|8))?"), lambda m: (
+        "--tw-ring-offset-shadow:var(--tw-ring-inset,) 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color);"
+        f"--tw-ring-shadow:var(--tw-ring-inset,) 0 0 0 calc({m[1] or 3}px + var(--tw-ring-offset-width)) var(--tw-ring-color);"
+        "box-shadow:var(--tw-ring-offset-shadow),var(--tw-ring-shadow),var(--tw-shadow,0 0 #0000)")),
+    (re.compile(r"ring-offset-(0|1|2|4|8)"), lambda m: f"--tw-ring-offset-width:{m[1]}px"),
+    (re.compile(r"ring-offset-(.+)"), lambda m: _color(m[1]) and f"--tw-ring-offset-color:{_color(m[1])}"),
+    (re.compile(r"ring-(.+)"), lambda m: _color(m[1]) and f"--tw-ring-color:{_color(m[1])}"),
+    (re.compile(r"transition(?:-(colors|shadow|opacity))?"), lambda m: (
+        f"transition-property:{TRANSITIONS[m[1] or '']};"
+        "transition-timing-function:cubic-bezier(0.4,0,0.2,1);transition-duration:150ms")),
+]
+
+_CANDIDATE_RE = re.compile(r"[a-z0-9:/._-]+")
+
+
+def _escape(class_name: str) -> str:
+    return re.sub(r"([:/.])", r"\\\1", class_name)
+
+
+def _utility(name: str) -> Optional[Tuple[int, str, str]]:
+    """(rule index, declarations, selector suffix) for a utility without variants."""
+    for index, (pattern, build) in enumerate(RULES):
+        match = pattern.fullmatch(name)
+        if match is None:
+            continue
+        result = build(match)
+        if not result:
+            continue
+        if isinstance(result, tuple):
+            return index, result[0], result[1]
+        return index, result, ""
+    return None
+
+
+def _rule(class_name: str) -> Optional[Tuple[tuple, str]]:
+    """Sort key and CSS text for one class, or None if it isn't a known utility."""
+    *variants, name = class_name.split(":")
+    screen, pseudos = None, []
+    for variant in variants:
+        if variant in dict(SCREENS) and screen is None and not pseudos:
+            screen = variant
+        elif variant in PSEUDO_VARIANTS and variant not in pseudos:
+            pseudos.append(variant)
+        else:
+            return None
+    utility = _utility(name)
+    if utility is None:
+        return None
+    index, declarations, suffix = utility
+    selector = "." + _escape(class_name) + "".join(f":{p}" for p in pseudos) + suffix
+    css = f"{selector}{{{declarations}}}"
+    screen_order = [s for s, _ in SCREENS].index(screen) + 1 if screen else 0
+    if name == "container":
+        # The container's max-width steps are part of the utility itself
+        css += "".join(f"@media (min-width:{width}){{.{_escape(class_name)}{{max-width:{width}}}}}" for _, width in SCREENS)
+    key = (screen_order, len(pseudos), [p for p in PSEUDO_VARIANTS if p in pseudos], index, class_name)
+    return key, css
+
+
+def scan_classes(directory: Path = TEMPLATE_DIR) -> List[str]:
+    """Every token in the templates that could be a class name; unknown ones are dropped later."""
+    found = set()
+    for path in sorted(directory.rglob("*.html")):
+        found.update(_CANDIDATE_RE.findall(path.read_text(encoding="utf-8")))
+    return sorted(found)
+
+
+def generate_css(class_names: Iterable[str]) -> str:
+    rules = [rule for rule in map(_rule, set(class_names)) if rule is not None]
+    rules.sort(key=lambda rule: rule[0])
+    lines = [PREFLIGHT]
+    for screen_order in sorted({key[0] for key, _ in rules}):
+        group = [css for key, css in rules if key[0] == screen_order]
+        if screen_order == 0:
+            lines.extend(group)
+        else:
+            _, width = SCREENS[screen_order - 1]
+            lines.append(f"@media (min-width:{width}){{" + "".join(group) + "}")
+    if CUSTOM_CSS.exists():
+        lines.append(CUSTOM_CSS.read_text(encoding="utf-8"))
+    return "\n".join(lines) + "\n"
+
+
+# --- Build ---
+
+def sources_digest() -> str:
+    """Hash of everything the stylesheet is generated from: templates, custom CSS and this module."""
+    digest = hashlib.sha256()
+    paths = sorted(TEMPLATE_DIR.rglob("*.html")) + [CUSTOM_CSS, Path(__file__)]
+    for path in paths:
+        if path.exists():
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    # Several workers may build at once; each sees either no file or a complete one
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _prune(current: str) -> None:
+    stem = STYLESHEET.rsplit(".", 1)[0]
+    builds = sorted(
+        (p for p in STATIC_DIR.glob(f"{stem}.*.css") if p.name != current and _HASHED_NAME_RE.match(p.name)),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for old in builds[KEEP_PREVIOUS_BUILDS:]:
+        for path in (old, old.with_name(old.name + ".gz"), old.with_name(old.name + ".br")):
+            path.unlink(missing_ok=True)
+
+
+def build() -> Dict[str, str]:
+    """Generate, hash, precompress and record the stylesheet; returns the manifest."""
+    css = generate_css(scan_classes()).encode()
+    stem, ext = STYLESHEET.rsplit(".", 1)
+    name = f"{stem}.{hashlib.sha256(css).hexdigest()[:12]}.{ext}"
+    target = STATIC_DIR / name
+    _write_atomic(target, css)
+    # mtime=0 keeps the gzip bytes identical across rebuilds of the same CSS
+    _write_atomic(target.with_name(name + ".gz"), gzip.compress(css, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _write_atomic(target.with_name(name + ".br"), brotli.compress(css, quality=11))
+    manifest = {STYLESHEET: name, "sources": sources_digest()}
+    _write_atomic(MANIFEST, json.dumps(manifest, indent=2).encode() + b"\n")
+    _prune(name)
+    return manifest
+
+
+def _read_manifest() -> Dict[str, str]:
+    try:
+        return json.loads(MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+_manifest: Dict[str, str] = {}
+
+
+def ensure_built() -> Dict[str, str]:
+    """Load the manifest, rebuilding first if it is missing or its sources changed."""
+    global _manifest
+    manifest = _read_manifest()
+    if manifest.get("sources") != sources_digest() or not (STATIC_DIR / manifest.get(STYLESHEET, "")).is_file():
+        manifest = build()
+    _manifest = manifest
+    return manifest
+
+
+def asset_path(name: str) -> str:
+    """The hashed file name for a logical asset name (the name itself if there is no build)."""
+    if not _manifest:
+        ensure_built()
+    return _manifest.get(name, name)
+
+
+# --- Serving ---
+
+class AssetFiles(StaticFiles):
+    """StaticFiles that serves precompressed variants of hashed assets with immutable caching."""
+
+    async def get_response(self, path: str, scope):
+        name = os.path.basename(path)
+        if not _HASHED_NAME_RE.match(name):
+            return await super().get_response(path, scope)
+        response = await super().get_response(path, scope)
+        if response.status_code == 304:
+            response.headers["Cache-Control"] = IMMUTABLE
+        if response.status_code != 200 or not isinstance(response, FileResponse):
+            return response
+        accepted = _accepted_encodings(scope)
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = self.lookup_path(path + suffix)
+            if stat_result is not None:
+                response = FileResponse(full_path, stat_result=stat_result, media_type=response.media_type)
+                response.headers["Content-Encoding"] = encoding
+                break
+        response.headers["Cache-Control"] = IMMUTABLE
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+def _accepted_encodings(scope) -> set:
+    for key, value in scope.get("headers", ()):
+        if key == b"accept-encoding":
+            return {
+                part.split(";")[0].strip() for part in value.decode("latin-1").split(",")
+                if not part.strip().endswith(";q=0")
+            }
+    return set()
+
+
+if __name__ == "__main__":
+    result = build()
+    print(f"Wrote {STATIC_DIR / result[STYLESHEET]} (+ .gz{'' if brotli is None else ', .br'})")
+    sys.exit(0)
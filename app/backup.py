@@ -0,0 +1,616 @@
+"""
+Online backups of the application data, and parallel restore.
+
+    python -m app.backup backup                     # full backup into backups/<UTC timestamp>-full
+    python -m app.backup backup --incremental       # only rows changed since the latest backup
+    python -m app.backup restore backups/20261018T120000Z-incremental --jobs 4
+    python -m app.backup verify backups/20261018T120000Z-incremental
+    python -m app.backup list
+
+A backup reads every table inside one REPEATABLE READ, READ ONLY transaction, so
+it is consistent without stopping the app. On PostgreSQL the snapshot is
+exported, and `--jobs` connections dump id ranges of the large tables in
+parallel from that same snapshot. Rows are written as gzip-compressed JSON
+lines in chunks of `--chunk-rows`. Each chunk's SHA-256 is recorded in the
+backup's `manifest.json`, which is written last: a directory without one is an
+unfinished backup.
+
+An incremental backup stores the applications and notes whose `updated_at` is
+newer than its base backup's snapshot (less BACKUP_OVERLAP_SECONDS, for writes
+stamped before they committed), and the reminders fired since then. It also
+holds the tombstones that delete triggers wrote to `deleted_rows` in that window,
+so deletes are replayed as well. Once a backup is taken, tombstones older than
+its window are pruned: the next incremental builds on it and doesn't need them.
+Users and statuses are small and always copied whole.
+`application_stats` is not backed up; restore rebuilds it from the restored
+applications.
+
+Restore verifies the checksums of the whole chain (the full backup and each
+incremental up to the one named), then loads the full backup with one
+transaction per chunk across `--jobs` connections. Tables load in foreign-key
+order, and a table's chunks load in parallel. During that load the secondary
+indexes and search triggers are dropped, then rebuilt in parallel afterwards.
+Each incremental then has its deletes replayed and its rows upserted (in that
+order, because SQLite can reuse the id of a deleted row). The target
+must be migrated to the backup's revision, and be empty unless `--replace` is given.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Date, DateTime, Numeric, Table, create_engine, delete, func, insert, inspect, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine, make_url
+
+from . import models, search, stats
+from .preflight import sync_url
+
+FORMAT_VERSION = 1
+BACKUP_DIR = Path(os.getenv("BACKUP_DIR", "backups"))
+# Incremental backups re-copy rows stamped this long before the base snapshot:
+# updated_at is set when a row is written, which can be a little before its commit
+OVERLAP = timedelta(seconds=float(os.getenv("BACKUP_OVERLAP_SECONDS", "300")))
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_JOBS = 4
+# Rows per INSERT ... VALUES batch when restoring
+RESTORE_BATCH_ROWS = 5_000
+COMPRESS_LEVEL = 6
+
+MANIFEST = "manifest.json"
+# Tables in foreign-key order. Incremental backups copy only the rows of these
+# tables stamped after their base (reminders are never changed once fired), and
+# their tombstones; the others are copied whole.
+TABLES = ("users", "statuses", "job_applications", "notes", "reminders")
+INCREMENTAL_TABLES = {"job_applications": "updated_at", "notes": "updated_at", "reminders": "fired_at"}
+# Kept current by triggers on PostgreSQL, rebuilt after a restore
+DERIVED_COLUMNS = frozenset(("search_vector",))
+# Tables whose secondary indexes are dropped for a full restore and rebuilt after it
+BULK_LOAD_TABLES = ("job_applications", "notes")
+
+
+class BackupError(Exception):
+    pass
+
+
+@dataclass
+class BackupReport:
+    name: str
+    kind: str
+    rows: Dict[str, int] = field(default_factory=dict)
+    bytes: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class RestoreReport:
+    chain: List[str] = field(default_factory=list)
+    rows: Dict[str, int] = field(default_factory=dict)
+    deleted: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+def _table(name: str) -> Table:
+    return models.Base.metadata.tables[name]
+
+
+def _tables_of(manifest: dict) -> List[str]:
+    # Backups taken before a table existed restore into a database migrated to that
+    # same older revision, which doesn't have it either
+    return [name for name in TABLES if name in manifest["tables"]]
+
+
+def backup_columns(table: Table) -> list:
+    return [column for column in table.columns if column.name not in DERIVED_COLUMNS]
+
+
+# --- Chunks ---
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot back up a {type(value).__name__}")
+
+
+def _decoder(column) -> Callable[[Any], Any]:
+    # DateTime before Date: JSON only has strings for both
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat
+    if isinstance(column.type, Date):
+        return date.fromisoformat
+    if isinstance(column.type, Numeric) and column.type.asdecimal:
+        return Decimal
+    return lambda value: value
+
+
+def write_chunk(directory: Path, file_name: str, rows: List[Any]) -> dict:
+    """Write rows as gzip-compressed JSON lines; returns the manifest entry for the chunk."""
+    body = "".join(json.dumps(list(row), default=_encode, separators=(",", ":")) + "\n" for row in rows)
+    data = gzip.compress(body.encode("utf-8"), COMPRESS_LEVEL, mtime=0)
+    (directory / file_name).write_bytes(data)
+    return {"file": file_name, "rows": len(rows), "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def _chunk_bytes(directory: Path, chunk: dict) -> bytes:
+    data = (directory / chunk["file"]).read_bytes()
+    if hashlib.sha256(data).hexdigest() != chunk["sha256"]:
+        raise BackupError(f"Checksum mismatch in {directory / chunk['file']}")
+    return data
+
+
+def read_chunk(directory: Path, chunk: dict) -> List[list]:
+    return [json.loads(line) for line in gzip.decompress(_chunk_bytes(directory, chunk)).decode("utf-8").splitlines()]
+
+
+# --- Manifests ---
+
+def read_manifest(directory: Path) -> dict:
+    path = directory / MANIFEST
+    if not path.is_file():
+        raise BackupError(f"{directory} is not a complete backup (no {MANIFEST})")
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("format") != FORMAT_VERSION:
+        raise BackupError(f"{directory}: unsupported backup format {manifest.get('format')}")
+    return manifest
+
+
+def list_backups(backup_dir: Path = BACKUP_DIR) -> List[Tuple[Path, dict]]:
+    """Complete backups in `backup_dir`, oldest snapshot first."""
+    found = []
+    for directory in sorted(backup_dir.glob("*")) if backup_dir.is_dir() else []:
+        if (directory / MANIFEST).is_file():
+            found.append((directory, read_manifest(directory)))
+    return sorted(found, key=lambda item: item[1]["snapshot_at"])
+
+
+def backup_chain(directory: Path) -> List[Tuple[Path, dict]]:
+    """The full backup `directory` builds on, then each incremental up to and including it."""
+    chain = []
+    while True:
+        manifest = read_manifest(directory)
+        chain.append((directory, manifest))
+        if manifest["kind"] == "full":
+            return chain[::-1]
+        directory = directory.parent / manifest["base"]
+
+
+def verify(directory: Path) -> int:
+    """Check every chunk checksum of a backup and the backups it builds on; returns the chunks checked."""
+    checked = 0
+    for path, manifest in backup_chain(directory):
+        for entry in manifest["tables"].values():
+            for chunk in entry["chunks"] + entry.get("deleted", []):
+                _chunk_bytes(path, chunk)
+                checked += 1
+    return checked
+
+
+# --- Backup ---
+
+def _engine(url: str, jobs: int) -> Engine:
+    url = sync_url(url)
+    if make_url(url).get_backend_name() == "sqlite":
+        return create_engine(url)
+    # The snapshot's own connection plus one per job
+    return create_engine(url, pool_size=jobs + 1, max_overflow=0)
+
+
+@contextmanager
+def _snapshot(engine: Engine) -> Iterator[Tuple[Connection, Optional[str], datetime]]:
+    """
+    A read-only connection inside the snapshot every table is read from, the
+    PostgreSQL snapshot id other connections can join, and the snapshot time.
+    """
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            connection.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+            snapshot_id = connection.exec_driver_sql("SELECT pg_export_snapshot()").scalar_one()
+            snapshot_at = connection.exec_driver_sql("SELECT now()").scalar_one()
+        else:
+            # One SQLite read transaction sees a single state of the file
+            snapshot_id, snapshot_at = None, datetime.now(timezone.utc)
+            connection.exec_driver_sql("BEGIN")
+        try:
+            yield connection, snapshot_id, snapshot_at
+        finally:
+            connection.rollback()
+
+
+@contextmanager
+def _joined_snapshot(engine: Engine, snapshot_id: str) -> Iterator[Connection]:
+    with engine.connect() as connection:
+        connection.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+        connection.exec_driver_sql(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'")
+        try:
+            yield connection
+        finally:
+            connection.rollback()
+
+
+@dataclass(frozen=True)
+class _DumpTask:
+    table: str
+    part: int
+    # Half-open id range [low, high); None for the whole table
+    low: Optional[int] = None
+    high: Optional[int] = None
+
+
+def _plan(connection: Connection, jobs: int) -> List[_DumpTask]:
+    """One task per small table; large tables split into `jobs` id ranges."""
+    tasks = [_DumpTask(name, 0) for name in TABLES if name not in INCREMENTAL_TABLES]
+    for name in INCREMENTAL_TABLES:
+        table = _table(name)
+        low, high = connection.execute(select(func.min(table.c.id), func.max(table.c.id))).one()
+        if low is None or jobs <= 1:
+            tasks.append(_DumpTask(name, 0))
+            continue
+        step = max(1, -(-(high + 1 - low) // jobs))
+        tasks += [
+            _DumpTask(name, part, start, min(start + step, high + 1))
+            for part, start in enumerate(range(low, high + 1, step))
+        ]
+    return tasks
+
+
+def _dump(connection: Connection, task: _DumpTask, since: Optional[datetime], directory: Path, chunk_rows: int) -> List[dict]:
+    table = _table(task.table)
+    query = select(*backup_columns(table)).order_by(table.c.id)
+    if since is not None and task.table in INCREMENTAL_TABLES:
+        query = query.where(table.c[INCREMENTAL_TABLES[task.table]] > since)
+    if task.low is not None:
+        query = query.where(table.c.id >= task.low, table.c.id < task.high)
+    result = connection.execution_options(stream_results=True, yield_per=chunk_rows).execute(query)
+    return [
+        write_chunk(directory, f"{task.table}.{task.part:03d}.{n:05d}.jsonl.gz", rows)
+        for n, rows in enumerate(result.partitions())
+    ]
+
+
+def _dump_deletes(connection: Connection, name: str, since: datetime, directory: Path, chunk_rows: int) -> List[dict]:
+    tombstone = models.DeletedRow
+    result = connection.execution_options(stream_results=True, yield_per=chunk_rows).execute(
+        select(tombstone.user_id, tombstone.row_id)
+        .where(tombstone.table_name == name, tombstone.deleted_at > since)
+        .order_by(tombstone.row_id)
+    )
+    return [write_chunk(directory, f"{name}.deleted.{n:05d}.jsonl.gz", rows) for n, rows in enumerate(result.partitions())]
+
+
+def _prune_tombstones(engine: Engine, before: datetime) -> None:
+    tombstone = models.DeletedRow
+    with engine.begin() as connection:
+        connection.execute(delete(tombstone).where(tombstone.deleted_at <= before))
+
+
+def backup(
+    url: str,
+    backup_dir: Path = BACKUP_DIR,
+    incremental: bool = False,
+    jobs: int = DEFAULT_JOBS,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    progress: Optional[Callable[[str], None]] = None,
+) -> BackupReport:
+    """Take a consistent online backup of the database at `url` into a new directory of `backup_dir`."""
+    started = time.perf_counter()
+    base: Optional[dict] = None
+    if incremental:
+        previous = list_backups(backup_dir)
+        if not previous:
+            raise BackupError(f"No complete backup in {backup_dir} to base an incremental backup on")
+        base = previous[-1][1]
+    since = datetime.fromisoformat(base["snapshot_at"]) - OVERLAP if base else None
+
+    kind = "incremental" if incremental else "full"
+    backup_name = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}-{kind}"
+    directory = backup_dir / backup_name
+    directory.mkdir(parents=True)
+    engine = _engine(url, jobs)
+    try:
+        with _snapshot(engine) as (connection, snapshot_id, snapshot_at):
+            revision = connection.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+            parallel = snapshot_id is not None and jobs > 1
+            tasks = _plan(connection, jobs if parallel else 1)
+
+            def run(task: _DumpTask) -> List[dict]:
+                if not parallel:
+                    return _dump(connection, task, since, directory, chunk_rows)
+                with _joined_snapshot(engine, snapshot_id) as worker:
+                    return _dump(worker, task, since, directory, chunk_rows)
+
+            if parallel:
+                with ThreadPoolExecutor(jobs) as pool:
+                    dumped = list(pool.map(run, tasks))
+            else:
+                dumped = [run(task) for task in tasks]
+
+            tables: Dict[str, dict] = {
+                name: {"columns": [column.name for column in backup_columns(_table(name))], "chunks": []}
+                for name in TABLES
+            }
+            for task, chunks in zip(tasks, dumped):
+                tables[task.table]["chunks"] += chunks
+                if progress:
+                    progress(f"{task.table} part {task.part}: {sum(c['rows'] for c in chunks)} rows")
+            if incremental:
+                for name in INCREMENTAL_TABLES:
+                    tables[name]["deleted"] = _dump_deletes(connection, name, since, directory, chunk_rows)
+
+        manifest = {
+            "format": FORMAT_VERSION,
+            "name": backup_name,
+            "kind": kind,
+            "base": base["name"] if base else None,
+            "since": since.isoformat() if since else None,
+            "snapshot_at": snapshot_at.astimezone(timezone.utc).isoformat(),
+            "alembic_version": revision,
+            "dialect": engine.dialect.name,
+            "tables": tables,
+        }
+        # Written last and renamed into place: only finished backups have a manifest
+        (directory / (MANIFEST + ".tmp")).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        (directory / (MANIFEST + ".tmp")).replace(directory / MANIFEST)
+    except BaseException:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+    else:
+        # The next incremental builds on this backup and only reads tombstones from its window on
+        _prune_tombstones(engine, snapshot_at - OVERLAP)
+    finally:
+        engine.dispose()
+
+    report = BackupReport(name=backup_name, kind=kind, seconds=time.perf_counter() - started)
+    for table_name, entry in tables.items():
+        report.rows[table_name] = sum(chunk["rows"] for chunk in entry["chunks"])
+        report.bytes += sum(chunk["bytes"] for chunk in entry["chunks"] + entry.get("deleted", []))
+    return report
+
+
+# --- Restore ---
+
+def _existing_indexes(connection: Connection, table_name: str) -> set:
+    if connection.dialect.name == "postgresql":
+        query = text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :table")
+    else:
+        query = text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table")
+    return set(connection.execute(query, {"table": table_name}).scalars())
+
+
+def _begin_bulk_load(engine: Engine) -> list:
+    """Drop the secondary indexes and search maintenance of the bulk-loaded tables; returns the indexes to rebuild."""
+    dropped = []
+    with engine.begin() as connection:
+        for name in BULK_LOAD_TABLES:
+            existing = _existing_indexes(connection, name)
+            for index in _table(name).indexes:
+                # Unique indexes stay: foreign keys depend on them
+                if index.name in existing and not index.unique:
+                    index.drop(connection)
+                    dropped.append(index)
+        if connection.dialect.name == "postgresql":
+            for name, trigger in search.PG_SEARCH_TRIGGERS.items():
+                connection.exec_driver_sql(f"ALTER TABLE {name} DISABLE TRIGGER {trigger}")
+        else:
+            for statement in search.SQLITE_FTS_TEARDOWN:
+                connection.exec_driver_sql(statement)
+    return dropped
+
+
+def _end_bulk_load(engine: Engine, indexes: list, jobs: int) -> None:
+    """Rebuild what _begin_bulk_load dropped: indexes in parallel, then the search documents in one pass."""
+    def create(index) -> None:
+        with engine.begin() as connection:
+            index.create(connection)
+
+    if engine.dialect.name == "postgresql" and jobs > 1:
+        # CREATE INDEX takes a SHARE lock, so several can build on one table at once
+        with ThreadPoolExecutor(jobs) as pool:
+            list(pool.map(create, indexes))
+    else:
+        for index in indexes:
+            create(index)
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            for name, trigger in search.PG_SEARCH_TRIGGERS.items():
+                connection.exec_driver_sql(f"ALTER TABLE {name} ENABLE TRIGGER {trigger}")
+            connection.exec_driver_sql(search.PG_SEARCH_BACKFILL)
+        else:
+            search.install_sqlite_fts(connection)
+
+
+def _primary_key(engine: Engine, name: str) -> List[str]:
+    # (user_id, id) where the tenancy migration hash-partitioned the table, otherwise id
+    with engine.connect() as connection:
+        return inspect(connection).get_pk_constraint(name)["constrained_columns"]
+
+
+def _insert(connection: Connection, table: Table, upsert: bool, key: List[str]):
+    if not upsert:
+        return insert(table)
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[connection.dialect.name]
+    statement = dialect_insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c[name] for name in key],
+        set_={column.name: statement.excluded[column.name] for column in backup_columns(table) if column.name not in key},
+    )
+
+
+def _load_chunk(
+    engine: Engine, directory: Path, name: str, columns: List[str], chunk: dict, upsert: bool, key: List[str]
+) -> int:
+    table = _table(name)
+    decoders = [_decoder(table.c[column]) for column in columns]
+    rows = [
+        {column: None if value is None else decode(value) for column, decode, value in zip(columns, decoders, row)}
+        for row in read_chunk(directory, chunk)
+    ]
+    with engine.begin() as connection:
+        statement = _insert(connection, table, upsert, key)
+        for start in range(0, len(rows), RESTORE_BATCH_ROWS):
+            connection.execute(statement, rows[start:start + RESTORE_BATCH_ROWS])
+    return len(rows)
+
+
+def _load(engine: Engine, directory: Path, manifest: dict, jobs: int, upsert: bool, report: RestoreReport) -> None:
+    parallel = engine.dialect.name == "postgresql" and jobs > 1
+    for name in _tables_of(manifest):
+        entry = manifest["tables"][name]
+        key = _primary_key(engine, name) if upsert else []
+
+        def load(chunk: dict) -> int:
+            return _load_chunk(engine, directory, name, entry["columns"], chunk, upsert, key)
+
+        if parallel:
+            with ThreadPoolExecutor(jobs) as pool:
+                loaded = sum(pool.map(load, entry["chunks"]))
+        else:
+            loaded = sum(load(chunk) for chunk in entry["chunks"])
+        report.rows[name] = report.rows.get(name, 0) + loaded
+
+
+def _replay_deletes(engine: Engine, directory: Path, manifest: dict, report: RestoreReport) -> None:
+    """Delete the rows the incremental backup's tombstones name (children first)."""
+    for name in reversed(_tables_of(manifest)):
+        if name not in INCREMENTAL_TABLES:
+            continue
+        table = _table(name)
+        deleted = 0
+        with engine.begin() as connection:
+            for chunk in manifest["tables"][name]["deleted"]:
+                gone = read_chunk(directory, chunk)
+                for start in range(0, len(gone), RESTORE_BATCH_ROWS):
+                    batch = gone[start:start + RESTORE_BATCH_ROWS]
+                    # ids are unique on their own; the user_ids let PostgreSQL skip other users' partitions
+                    deleted += connection.execute(
+                        delete(table).where(
+                            table.c.user_id.in_({user_id for user_id, _ in batch}),
+                            table.c.id.in_([row_id for _, row_id in batch]),
+                        )
+                    ).rowcount
+        report.deleted[name] = report.deleted.get(name, 0) + deleted
+
+
+def _prepare_target(connection: Connection, manifest: dict, replace: bool) -> None:
+    revision = manifest["alembic_version"]
+    current = connection.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+    if current != revision:
+        raise BackupError(f"The backup is at migration {revision} but the database is at {current}; migrate it first")
+    tables = _tables_of(manifest)
+    if not replace:
+        for name in tables:
+            if name in INCREMENTAL_TABLES and connection.execute(select(_table(name).c.id).limit(1)).first() is not None:
+                raise BackupError(f"{name} is not empty; restore into an empty database or pass --replace")
+    # A freshly migrated database has the canonical statuses and the default user; the backup's replace them.
+    # Tombstones of the target's own deletes go too (after the deletes, which write more on SQLite).
+    tombstones = [models.DeletedRow.__tablename__] if inspect(connection).has_table(models.DeletedRow.__tablename__) else []
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"TRUNCATE {', '.join(['application_stats', *tables, *tombstones])}")
+        return
+    for name in ("application_stats", *reversed(tables), *tombstones):
+        connection.execute(delete(models.Base.metadata.tables[name]))
+
+
+def _reset_sequences(connection: Connection, manifest: dict) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+    for name in _tables_of(manifest):
+        connection.exec_driver_sql(
+            f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), coalesce(max(id), 1), max(id) IS NOT NULL) FROM {name}"
+        )
+
+
+def restore(
+    url: str,
+    directory: Path,
+    jobs: int = DEFAULT_JOBS,
+    replace: bool = False,
+    progress: Optional[Callable[[str], None]] = None,
+) -> RestoreReport:
+    """Restore the backup in `directory` (with the backups it builds on) into the database at `url`."""
+    started = time.perf_counter()
+    chain = backup_chain(directory)
+    verify(directory)
+    report = RestoreReport(chain=[manifest["name"] for _, manifest in chain])
+    (full_dir, full), incrementals = chain[0], chain[1:]
+
+    engine = _engine(url, jobs)
+    try:
+        with engine.begin() as connection:
+            _prepare_target(connection, chain[-1][1], replace)
+        indexes = _begin_bulk_load(engine)
+        try:
+            _load(engine, full_dir, full, jobs, upsert=False, report=report)
+            if progress:
+                progress(f"{full['name']}: loaded {report.rows}")
+        finally:
+            _end_bulk_load(engine, indexes, jobs)
+        if progress:
+            progress(f"rebuilt {len(indexes)} indexes and the search index")
+        for path, manifest in incrementals:
+            _replay_deletes(engine, path, manifest, report)
+            _load(engine, path, manifest, jobs, upsert=True, report=report)
+            if progress:
+                progress(f"{manifest['name']}: applied")
+        with engine.begin() as connection:
+            _reset_sequences(connection, chain[-1][1])
+            stats.rebuild_stats(connection, commit=False)
+    finally:
+        engine.dispose()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.backup", description="Online backups and parallel restore.")
+    parser.add_argument("--dir", type=Path, default=BACKUP_DIR, help="Backup directory (default: BACKUP_DIR or ./backups)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    take = commands.add_parser("backup", help="Take a consistent online backup")
+    take.add_argument("--incremental", action="store_true", help="Only rows changed since the latest backup")
+    take.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="Parallel connections (PostgreSQL)")
+    take.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    load = commands.add_parser("restore", help="Restore a backup and the backups it builds on")
+    load.add_argument("path", type=Path)
+    load.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="Parallel connections (PostgreSQL)")
+    load.add_argument("--replace", action="store_true", help="Delete the existing applications and notes first")
+    check = commands.add_parser("verify", help="Check the checksums of a backup and the backups it builds on")
+    check.add_argument("path", type=Path)
+    commands.add_parser("list", help="List complete backups, oldest first")
+    args = parser.parse_args(argv)
+
+    url = os.getenv("DATABASE_URL", "postgresql+asyncpg://user:password@db/apptrackerdb")
+    log = lambda line: print(line, file=sys.stderr)
+    try:
+        if args.command == "backup":
+            report = backup(url, args.dir, args.incremental, args.jobs, args.chunk_rows, progress=log)
+            rows = ", ".join(f"{count} {name}" for name, count in report.rows.items())
+            print(f"{report.name}: {rows}; {report.bytes / 1e6:.1f} MB in {report.seconds:.1f}s")
+        elif args.command == "restore":
+            report = restore(url, args.path, args.jobs, args.replace, progress=log)
+            rows = ", ".join(f"{count} {name}" for name, count in report.rows.items())
+            print(f"Restored {' + '.join(report.chain)}: {rows}; deleted {report.deleted or 'none'} in {report.seconds:.1f}s")
+        elif args.command == "verify":
+            print(f"{args.path}: {verify(args.path)} chunks OK")
+        else:
+            for path, manifest in list_backups(args.dir):
+                print(f"{path.name}  {manifest['kind']:<11} snapshot {manifest['snapshot_at']}  base {manifest['base'] or '-'}")
+    except BackupError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""
+Benchmarks for the crud layer and the HTML routes.
+
+    python -m app.benchmarks seed --applications 100000 --notes-per-application 20
+    python -m app.benchmarks run --save baseline.json
+    python -m app.benchmarks run --compare baseline.json
+
+Point DATABASE_URL at a dedicated database: `seed` appends generated rows and
+`seed --truncate` empties the tables first.
+"""
@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import sys
+from typing import List, Optional
+
+from .. import database
+from . import datagen, loadgen, runner
+
+
+async def _with_engine(awaitable):
+    # Commands run outside the app's lifespan, so they own the engine
+    database.init_engine()
+    try:
+        return await awaitable
+    finally:
+        await database.dispose_engine()
+
+
+def _seed(args: argparse.Namespace) -> int:
+    async def run() -> datagen.SeedReport:
+        if args.truncate:
+            await datagen.truncate(database.engine)
+        return await datagen.seed(
+            database.engine,
+            applications=args.applications,
+            notes_per_application=args.notes_per_application,
+            users=args.users,
+            chunk_size=args.chunk_size,
+            progress=lambda line: print(line, file=sys.stderr),
+        )
+
+    report = asyncio.run(_with_engine(run()))
+    rate = report.applications / report.seconds if report.seconds else 0
+    print(f"Seeded {report.applications} applications and {report.notes} notes in {report.seconds:.1f}s ({rate:.0f} applications/s)")
+    return 0
+
+
+def _run(args: argparse.Namespace) -> int:
+    report = asyncio.run(_with_engine(runner.run_benchmarks(
+        iterations=args.iterations,
+        warmup=args.warmup,
+        groups=args.group,
+        match=args.match,
+        seed=args.seed,
+        use_cache=args.cache,
+        progress=lambda result: print(runner.format_result(result)),
+    )))
+    if args.save:
+        runner.save_report(report, args.save)
+        print(f"Saved results to {args.save}")
+    if args.compare:
+        regressions = runner.compare_reports(runner.load_report(args.compare), report, tolerance=args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.compare}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+def _load(args: argparse.Namespace) -> int:
+    try:
+        mix = loadgen.parse_mix(args.mix)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    transport = None
+    if args.in_process:
+        import httpx
+        from ..main import app
+
+        transport = httpx.ASGITransport(app=app)
+    load = loadgen.run_load(
+        args.url,
+        duration=args.duration,
+        rate=args.rate or None,
+        concurrency=args.concurrency,
+        mix=mix,
+        seed=args.seed,
+        interval=args.interval,
+        keep_data=args.keep_data,
+        transport=transport,
+    )
+    summary = asyncio.run(_with_engine(load) if args.in_process else load)
+    print(loadgen.format_summary(summary))
+    if args.save:
+        loadgen.save_summary(summary, args.save)
+        print(f"Saved summary to {args.save}")
+    return 1 if summary["overall"]["error_rate"] > args.max_error_rate else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks", description="Seed benchmark data and run benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="Generate synthetic applications and notes in bulk")
+    seed.add_argument("--applications", type=int, default=100_000)
+    seed.add_argument("--notes-per-application", type=int, default=20, help="Average notes per application")
+    seed.add_argument("--users", type=int, default=1, help="Tenants to deal the applications to, round-robin")
+    seed.add_argument("--chunk-size", type=int, default=datagen.DEFAULT_CHUNK_SIZE, help="Applications per transaction")
+    seed.add_argument("--truncate", action="store_true", help="Delete all applications and notes first")
+    seed.set_defaults(handler=_seed)
+
+    run = commands.add_parser("run", help="Run benchmarks and report latency, throughput, queries and RSS")
+    run.add_argument("--iterations", type=int, default=200)
+    run.add_argument("--warmup", type=int, default=10)
+    run.add_argument("--group", action="append", choices=("crud", "hydration", "routes"), help="Only run this group (repeatable)")
+    run.add_argument("--match", help="Only run cases whose name contains this text")
+    run.add_argument("--seed", type=int, default=1234, help="Random seed for the ids each case picks")
+    run.add_argument("--cache", action="store_true", help="Leave the page cache enabled")
+    run.add_argument("--save", metavar="PATH", help="Write the results as a JSON baseline")
+    run.add_argument("--compare", metavar="PATH", help="Compare against a saved baseline; exit 1 on regression")
+    run.add_argument("--tolerance", type=float, default=0.2, help="Allowed latency growth before it counts as a regression")
+    run.set_defaults(handler=_run)
+
+    load = commands.add_parser("load", help="Replay a traffic mix against a running instance")
+    load.add_argument("--url", default="http://localhost:8000", help="Base URL of the instance under test")
+    load.add_argument("--in-process", action="store_true", help="Drive app.main:app in this process instead of --url")
+    load.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load for")
+    load.add_argument("--rate", type=float, default=50.0, help="Requests started per second; 0 runs closed-loop")
+    load.add_argument("--concurrency", type=int, default=50, help="Concurrent clients (max requests in flight)")
+    load.add_argument("--mix", help="Scenario weights, e.g. list=40,search=15,detail=30,edit=5,note=10")
+    load.add_argument("--seed", type=int, default=1234)
+    load.add_argument("--interval", type=float, default=5.0, help="Seconds between progress lines")
+    load.add_argument("--keep-data", action="store_true", help="Keep the applications created for writes")
+    load.add_argument("--max-error-rate", type=float, default=0.01, help="Exit 1 above this error rate")
+    load.add_argument("--save", metavar="PATH", help="Write the summary as JSON")
+    load.set_defaults(handler=_load)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Bulk synthetic data for benchmarks.
+
+Rows are generated by the database itself with INSERT ... SELECT over a number
+series, so seeding a million applications and tens of millions of notes never
+moves a row through Python. Values are pure functions of the row number (a
+multiplicative hash picks words, dates and flags), which makes a dataset of a
+given size identical on every run.
+
+Search maintenance is suspended while loading (PostgreSQL triggers disabled,
+SQLite FTS triggers dropped) and rebuilt in one pass at the end, because the
+per-note triggers would otherwise re-aggregate every application's notes once
+per inserted note. The pipeline stats counters are recounted the same way.
+
+With `users` > 1 the rows are dealt round-robin to that many tenants: the
+`default` user and `bench-1` ... `bench-<users - 1>`, created as needed. The
+benchmark cases act as `default`, so comparing seeds with the same number of
+applications per user shows whether a query's cost follows one user's rows or
+the whole table.
+"""
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .. import search, stats, users as accounts
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+COMPANIES = (
+    "Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka", "Cyberdyne", "Tyrell",
+    "Soylent", "Aperture", "Vandelay", "Massive", "Dunder", "Pied Piper", "Prestige", "Oscorp", "Gringotts", "Monarch",
+)
+ROLE_LEVELS = ("Junior", "Senior", "Staff", "Lead", "Principal")
+ROLES = ("Engineer", "Developer", "Designer", "Manager", "Analyst", "Scientist", "Architect", "Consultant")
+# Canonical names (app/statuses.py), so every generated row has a status_id
+STATUSES = ("Applied", "Phone Screen", "Interviewing", "Offer", "Rejected", "Ghosted")
+CONTACTS = ("Alex Kim", "Sam Patel", "Jordan Lee", "Riley Chen", "Casey Diaz", "Morgan Reed", "Taylor Fox")
+NOTE_WORDS = (
+    "recruiter", "called", "kubernetes", "salary", "onsite", "followup", "python", "postgres", "referral",
+    "timeline", "takehome", "manager", "offer", "benefits", "remote", "team",
+)
+
+# Knuth's multiplicative hash; keeps consecutive row numbers from picking consecutive words
+_HASH = 2654435761
+
+
+@dataclass
+class SeedReport:
+    applications: int = 0
+    notes: int = 0
+    seconds: float = 0.0
+
+
+def _pick(words: Sequence[str], number_sql: str) -> str:
+    """SQL choosing one of `words` by `number_sql`, as substr() of a fixed-width packed literal."""
+    width = max(len(w) for w in words)
+    packed = "".join(w.ljust(width) for w in words).replace("'", "''")
+    return f"trim(substr('{packed}', 1 + (({number_sql}) % {len(words)}) * {width}, {width}))"
+
+
+def _h(column: str, salt: int) -> str:
+    return f"(({column} * {_HASH} + {salt}) % 1000003)"
+
+
+class _Dialect:
+    def __init__(self, name: str):
+        self.name = name
+
+    def series(self, name: str) -> str:
+        # A CTE `name(g)` holding :lo .. :hi
+        if self.name == "postgresql":
+            return f"{name}(g) AS (SELECT generate_series(CAST(:lo AS bigint), CAST(:hi AS bigint)))"
+        return f"{name}(g) AS (SELECT :lo UNION ALL SELECT g + 1 FROM {name} WHERE g < :hi)"
+
+    def days_after(self, origin: str, days_sql: str) -> str:
+        if self.name == "postgresql":
+            return f"(DATE '{origin}' + CAST({days_sql} AS integer))"
+        return f"date('{origin}', '+' || ({days_sql}) || ' days')"
+
+    def minutes_after(self, origin: str, minutes_sql: str) -> str:
+        if self.name == "postgresql":
+            return f"(TIMESTAMP '{origin}' + ({minutes_sql}) * INTERVAL '1 minute')"
+        return f"datetime('{origin}', '+' || ({minutes_sql}) || ' minutes')"
+
+
+def _username_sql(number_sql: str, users: int) -> str:
+    slot = f"{number_sql} % {users}"
+    return f"CASE WHEN {slot} = 0 THEN '{accounts.DEFAULT_USERNAME}' ELSE 'bench-' || CAST({slot} AS varchar) END"
+
+
+def _applications_sql(d: _Dialect, users: int) -> str:
+    g = "s.g"
+    role = f"{_pick(ROLE_LEVELS, _h(g, 3))} || ' ' || {_pick(ROLES, _h(g, 5))}"
+    status = _pick(STATUSES, _h(g, 11))
+    return f"""
+        WITH RECURSIVE {d.series('s')}
+        INSERT INTO job_applications (
+            user_id, company_name, role, application_date, status, status_id, contact_person, phone, url, cover_letter,
+            interview_date, offer, salary, equity, bonus, health_coverage, pto, is_active,
+            created_at, updated_at, version
+        )
+        SELECT
+            (SELECT u.id FROM users u WHERE u.username = {_username_sql(g, users)}),
+            {_pick(COMPANIES, _h(g, 1))} || ' ' || CAST({_h(g, 2)} % 997 AS varchar),
+            {role},
+            {d.days_after('2020-01-01', f'{_h(g, 7)} % 2000')},
+            {status},
+            (SELECT st.id FROM statuses st WHERE st.name = {status}),
+            {_pick(CONTACTS, _h(g, 13))},
+            NULL,
+            'https://jobs.example.com/' || CAST({g} AS varchar),
+            ({_h(g, 17)} % 2 = 0),
+            CASE WHEN {_h(g, 19)} % 3 = 0 THEN {d.days_after('2020-02-01', f'{_h(g, 7)} % 2000')} END,
+            ({_h(g, 23)} % 20 = 0),
+            50000 + {_h(g, 29)} % 150000,
+            ({_h(g, 31)} % 4 = 0),
+            CASE WHEN {_h(g, 37)} % 2 = 0 THEN ({_h(g, 37)} % 20) / 100.0 END,
+            ({_h(g, 41)} % 3 <> 0),
+            NULL,
+            ({_h(g, 43)} % 5 <> 0),
+            CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 1
+        FROM s
+    """
+
+
+def _notes_sql(d: _Dialect, notes_per_application: int) -> str:
+    # Between 0 and 2 * notes_per_application notes each, averaging notes_per_application
+    spread = 2 * notes_per_application + 1
+    number = "(a.id * 64 + k.g)"
+    stamp = d.minutes_after("2020-01-01 09:00:00", f"{_h('a.id', 47)} % 2000 * 1440 + k.g * 617")
+    words = " || ' ' || ".join(_pick(NOTE_WORDS, _h(number, salt)) for salt in (53, 59, 61, 67))
+    return f"""
+        WITH RECURSIVE {d.series('k')}
+        INSERT INTO notes (user_id, content, application_id, created_at, updated_at, version)
+        SELECT
+            a.user_id, {words},
+            a.id, {stamp}, {stamp}, 1
+        FROM job_applications a
+        JOIN k ON k.g <= {_h('a.id', 71)} % {spread}
+        WHERE a.id > :first_id AND a.id <= :last_id
+    """
+
+
+async def _suspend_search_maintenance(conn: AsyncConnection, dialect: str) -> None:
+    if dialect == "postgresql":
+        await conn.execute(text("ALTER TABLE job_applications DISABLE TRIGGER job_applications_search_vector_update"))
+        await conn.execute(text("ALTER TABLE notes DISABLE TRIGGER notes_search_vector_update"))
+    elif dialect == "sqlite":
+        for statement in search.SQLITE_FTS_TEARDOWN:
+            await conn.exec_driver_sql(statement)
+
+
+async def _rebuild_search(conn: AsyncConnection, dialect: str, first_id: int, last_id: int, chunk_size: int) -> None:
+    if dialect == "postgresql":
+        await conn.execute(text("ALTER TABLE job_applications ENABLE TRIGGER job_applications_search_vector_update"))
+        await conn.execute(text("ALTER TABLE notes ENABLE TRIGGER notes_search_vector_update"))
+        for lo in range(first_id, last_id, chunk_size):
+            await conn.execute(
+                text("""
+                    UPDATE job_applications
+                    SET search_vector = job_application_search_vector(id, company_name, role, status, contact_person)
+                    WHERE id > :lo AND id <= :hi
+                """),
+                {"lo": lo, "hi": min(lo + chunk_size, last_id)},
+            )
+            await conn.commit()
+    elif dialect == "sqlite":
+        await conn.run_sync(search.install_sqlite_fts)
+        await conn.commit()
+
+
+async def _ensure_users(conn: AsyncConnection, users: int) -> None:
+    names = [accounts.DEFAULT_USERNAME] + [f"bench-{slot}" for slot in range(1, users)]
+    await conn.execute(
+        text("INSERT INTO users (username) SELECT :name WHERE NOT EXISTS (SELECT 1 FROM users WHERE username = :name)"),
+        [{"name": name} for name in names],
+    )
+    await conn.commit()
+
+
+async def truncate(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            await conn.execute(text("TRUNCATE reminders, notes, job_applications RESTART IDENTITY"))
+        else:
+            await conn.execute(text("DELETE FROM reminders"))
+            await conn.execute(text("DELETE FROM notes"))
+            await conn.execute(text("DELETE FROM job_applications"))
+        await conn.execute(text("DELETE FROM application_stats"))
+
+
+async def seed(
+    engine: AsyncEngine,
+    applications: int,
+    notes_per_application: int = 10,
+    users: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: Optional[Callable[[str], None]] = None,
+) -> SeedReport:
+    """Append `applications` generated applications (and their notes) to the database behind `engine`."""
+    dialect = engine.dialect.name
+    d = _Dialect(dialect)
+    applications_sql = text(_applications_sql(d, users))
+    notes_sql = text(_notes_sql(d, notes_per_application))
+    report = SeedReport()
+    started = time.perf_counter()
+
+    async with engine.connect() as conn:
+        await _ensure_users(conn, users)
+        first_id = (await conn.execute(text("SELECT coalesce(max(id), 0) FROM job_applications"))).scalar_one()
+        await _suspend_search_maintenance(conn, dialect)
+        await conn.commit()
+        last_id = first_id
+        try:
+            # Row numbers continue from the existing rows so repeated seeds don't duplicate values
+            for lo in range(first_id + 1, first_id + applications + 1, chunk_size):
+                hi = min(lo + chunk_size - 1, first_id + applications)
+                await conn.execute(applications_sql, {"lo": lo, "hi": hi})
+                chunk_last_id = (await conn.execute(text("SELECT max(id) FROM job_applications"))).scalar_one()
+                if notes_per_application > 0:
+                    result = await conn.execute(
+                        notes_sql,
+                        {"lo": 1, "hi": 2 * notes_per_application, "first_id": last_id, "last_id": chunk_last_id},
+                    )
+                    inserted = result.rowcount
+                    if inserted < 0:
+                        # sqlite3 reports no rowcount for a statement that starts with WITH
+                        inserted = (await conn.execute(
+                            text("SELECT count(*) FROM notes WHERE application_id > :first_id AND application_id <= :last_id"),
+                            {"first_id": last_id, "last_id": chunk_last_id},
+                        )).scalar_one()
+                    report.notes += inserted
+                await conn.commit()
+                report.applications += hi - lo + 1
+                last_id = chunk_last_id
+                if progress:
+                    progress(f"{report.applications} applications, {report.notes} notes")
+        finally:
+            # Discards a failed chunk; completed chunks are already committed
+            await conn.rollback()
+            await _rebuild_search(conn, dialect, first_id, last_id, chunk_size)
+            # Generated rows bypass app/crud.py, so recount the pipeline stats in one pass
+            await conn.run_sync(stats.rebuild_stats)
+        await conn.execute(text("ANALYZE"))
+        await conn.commit()
+
+    report.seconds = time.perf_counter() - started
+    return report
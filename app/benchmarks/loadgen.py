@@ -0,0 +1,305 @@
+"""
+Open-loop HTTP load generator that replays a mix of tracker traffic.
+
+Requests are started on a fixed schedule (`--rate` per second) by many
+concurrent async clients, independent of how fast earlier ones finish, so a
+slow server shows up as growing latency instead of a politely reduced load.
+Latency is measured from each request's *scheduled* start: time spent waiting
+for a free client slot counts, which avoids coordinated omission. Without
+`--rate` it runs closed-loop instead, each client sending back to back.
+
+POST routes answer 303; redirects are followed, so an edit or a note costs the
+POST plus the detail page it lands on, as it does in a browser.
+
+Writes go only to applications the run creates through the JSON API, which
+are deleted at the end (unless --keep-data).
+"""
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from .runner import SEARCH_TERMS, percentile
+
+LOAD_COMPANY = "Load Test"
+DEFAULT_MIX = {"list": 40, "search": 15, "detail": 30, "edit": 5, "note": 10}
+WRITE_POOL_SIZE = 50
+
+
+@dataclass
+class Sample:
+    scenario: str
+    started: float  # seconds since the run began (scheduled start in open-loop mode)
+    latency: float
+    ok: bool
+    status: Optional[int]
+
+
+@dataclass
+class LoadContext:
+    client: httpx.AsyncClient
+    read_ids: List[int] = field(default_factory=list)
+    write_ids: List[int] = field(default_factory=list)
+
+
+Scenario = Callable[[LoadContext, random.Random], Awaitable[httpx.Response]]
+
+
+async def _list(ctx: LoadContext, rng: random.Random) -> httpx.Response:
+    return await ctx.client.get(rng.choice(("/", "/", "/?view=all", "/inactive")))
+
+
+async def _search(ctx: LoadContext, rng: random.Random) -> httpx.Response:
+    term = rng.choice([term for label, term in SEARCH_TERMS.items() if label != "miss"])
+    return await ctx.client.get("/", params={"view": "all", "search": term})
+
+
+async def _detail(ctx: LoadContext, rng: random.Random) -> httpx.Response:
+    return await ctx.client.get(f"/applications/{rng.choice(ctx.read_ids)}")
+
+
+async def _edit(ctx: LoadContext, rng: random.Random) -> httpx.Response:
+    application_id = rng.choice(ctx.write_ids)
+    return await ctx.client.post(f"/applications/{application_id}/edit", data={
+        "company_name": LOAD_COMPANY,
+        "role": f"Role {rng.randint(1, 10**6)}",
+        "status": rng.choice(("Applied", "Interviewing", "Rejected")),
+    })
+
+
+async def _note(ctx: LoadContext, rng: random.Random) -> httpx.Response:
+    application_id = rng.choice(ctx.write_ids)
+    return await ctx.client.post(f"/applications/{application_id}/notes/new", data={"content": "load test note"})
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "list": _list,
+    "search": _search,
+    "detail": _detail,
+    "edit": _edit,
+    "note": _note,
+}
+
+
+def parse_mix(spec: Optional[str]) -> Dict[str, int]:
+    """'list=40,detail=30,...' -> weights; unknown names are rejected."""
+    if not spec:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = int(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("The traffic mix needs at least one non-zero weight")
+    return mix
+
+
+async def _prepare(ctx: LoadContext) -> None:
+    response = await ctx.client.get("/api/applications", params={"view": "all", "limit": 200})
+    response.raise_for_status()
+    ctx.read_ids = [item["id"] for item in response.json()["items"]]
+    response = await ctx.client.post("/api/applications/batch", json=[
+        {"company_name": LOAD_COMPANY, "role": f"Role {i}"} for i in range(WRITE_POOL_SIZE)
+    ])
+    response.raise_for_status()
+    ctx.write_ids = response.json()["created"]
+    if not ctx.read_ids:
+        ctx.read_ids = list(ctx.write_ids)
+
+
+async def _cleanup(ctx: LoadContext) -> None:
+    await ctx.client.post("/api/applications/batch/state", json={"ids": ctx.write_ids, "action": "delete"})
+
+
+class Recorder:
+    def __init__(self, interval: float, report: Optional[Callable[[str], None]]):
+        self.samples: List[Sample] = []
+        self.interval = interval
+        self.report = report
+        self._window: List[Sample] = []
+        self._window_started = 0.0
+
+    def add(self, sample: Sample) -> None:
+        self.samples.append(sample)
+        self._window.append(sample)
+
+    def flush(self, now: float) -> None:
+        """Print one progress line for the requests completed since the last flush."""
+        window, self._window = self._window, []
+        elapsed = now - self._window_started
+        self._window_started = now
+        if not self.report or elapsed <= 0:
+            return
+        latencies = sorted(s.latency for s in window)
+        errors = sum(not s.ok for s in window)
+        self.report(
+            f"t={now:6.1f}s  {len(window) / elapsed:7.1f} rps  errors {errors:4d}  "
+            f"p50 {percentile(latencies, 50) * 1000:7.1f}ms  p95 {percentile(latencies, 95) * 1000:7.1f}ms  "
+            f"p99 {percentile(latencies, 99) * 1000:7.1f}ms"
+        )
+
+
+async def _execute(ctx: LoadContext, name: str, rng: random.Random, scheduled: float, origin: float, recorder: Recorder) -> None:
+    status = None
+    try:
+        response = await SCENARIOS[name](ctx, rng)
+        status = response.status_code
+        ok = status < 400
+    except httpx.HTTPError:
+        ok = False
+    recorder.add(Sample(name, scheduled - origin, time.perf_counter() - scheduled, ok, status))
+
+
+async def _open_loop(ctx, choose, rng, rate, concurrency, duration, recorder) -> None:
+    slots = asyncio.Semaphore(concurrency)
+    tasks = set()
+    origin = time.perf_counter()
+    next_flush = recorder.interval
+    count = 0
+    while True:
+        scheduled = origin + count / rate
+        if scheduled - origin >= duration:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        # Blocks when every client is busy; the wait is charged to the request's latency
+        await slots.acquire()
+
+        async def one(name=choose(), scheduled=scheduled):
+            try:
+                await _execute(ctx, name, rng, scheduled, origin, recorder)
+            finally:
+                slots.release()
+
+        task = asyncio.create_task(one())
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        count += 1
+        now = time.perf_counter() - origin
+        if now >= next_flush:
+            recorder.flush(now)
+            next_flush += recorder.interval
+    if tasks:
+        await asyncio.gather(*tasks)
+    recorder.flush(time.perf_counter() - origin)
+
+
+async def _closed_loop(ctx, choose, rng, concurrency, duration, recorder) -> None:
+    origin = time.perf_counter()
+    deadline = origin + duration
+
+    async def client_loop():
+        while time.perf_counter() < deadline:
+            await _execute(ctx, choose(), rng, time.perf_counter(), origin, recorder)
+
+    async def reporter():
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(recorder.interval)
+            recorder.flush(time.perf_counter() - origin)
+
+    reporting = asyncio.create_task(reporter())
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    reporting.cancel()
+    recorder.flush(time.perf_counter() - origin)
+
+
+def summarize(samples: List[Sample], duration: float) -> Dict[str, object]:
+    def stats(group: List[Sample]) -> Dict[str, float]:
+        latencies = sorted(s.latency for s in group)
+        errors = sum(not s.ok for s in group)
+        return {
+            "requests": len(group),
+            "errors": errors,
+            "error_rate": errors / len(group) if group else 0.0,
+            "rps": len(group) / duration if duration else 0.0,
+            **{f"p{q}_ms": percentile(latencies, q) * 1000 for q in (50, 90, 95, 99)},
+            "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        }
+
+    by_scenario: Dict[str, List[Sample]] = defaultdict(list)
+    statuses: Dict[str, int] = defaultdict(int)
+    per_second: Dict[int, int] = defaultdict(int)
+    for sample in samples:
+        by_scenario[sample.scenario].append(sample)
+        statuses[str(sample.status or "error")] += 1
+        per_second[int(sample.started)] += 1
+    return {
+        "overall": stats(samples),
+        "scenarios": {name: stats(group) for name, group in sorted(by_scenario.items())},
+        "statuses": dict(sorted(statuses.items())),
+        "rps_over_time": [per_second.get(second, 0) for second in range(int(duration) + 1)],
+    }
+
+
+async def run_load(
+    base_url: str,
+    duration: float = 30.0,
+    rate: Optional[float] = 50.0,
+    concurrency: int = 50,
+    mix: Optional[Dict[str, int]] = None,
+    seed: int = 1234,
+    interval: float = 5.0,
+    keep_data: bool = False,
+    report: Optional[Callable[[str], None]] = print,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> Dict[str, object]:
+    """Drive `base_url` (or an in-process `transport`) with the traffic mix; returns the summary."""
+    mix = mix or dict(DEFAULT_MIX)
+    rng = random.Random(seed)
+    names, weights = zip(*[(name, weight) for name, weight in mix.items() if weight > 0])
+
+    def choose() -> str:
+        return rng.choices(names, weights)[0]
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, transport=transport, limits=limits, follow_redirects=True, timeout=30.0
+    ) as client:
+        ctx = LoadContext(client)
+        await _prepare(ctx)
+        recorder = Recorder(interval, report)
+        started = time.perf_counter()
+        try:
+            if rate:
+                await _open_loop(ctx, choose, rng, rate, concurrency, duration, recorder)
+            else:
+                await _closed_loop(ctx, choose, rng, concurrency, duration, recorder)
+        finally:
+            elapsed = time.perf_counter() - started
+            if not keep_data:
+                await _cleanup(ctx)
+
+    summary = summarize(recorder.samples, elapsed)
+    summary["config"] = {
+        "base_url": base_url, "duration": duration, "rate": rate, "concurrency": concurrency, "mix": mix, "seed": seed,
+    }
+    return summary
+
+
+def format_summary(summary: Dict[str, object]) -> str:
+    def line(name: str, s: Dict[str, float]) -> str:
+        return (
+            f"{name:<10} {s['requests']:8d} req  {s['rps']:7.1f} rps  errors {s['error_rate']:6.2%}  "
+            f"p50 {s['p50_ms']:7.1f}  p90 {s['p90_ms']:7.1f}  p95 {s['p95_ms']:7.1f}  "
+            f"p99 {s['p99_ms']:7.1f}  max {s['max_ms']:7.1f} ms"
+        )
+
+    lines = [line("overall", summary["overall"])]
+    lines += [line(name, s) for name, s in summary["scenarios"].items()]
+    lines.append("statuses: " + ", ".join(f"{status}={count}" for status, count in summary["statuses"].items()))
+    return "\n".join(lines)
+
+
+def save_summary(summary: Dict[str, object], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,422 @@
+"""
+Benchmark cases for the crud layer and the HTML routes, and the code that runs,
+reports, saves and compares them.
+
+Every case runs sequentially in this process against the database in
+DATABASE_URL: crud cases open a session per operation, route cases go through
+the full ASGI stack with an in-process httpx transport (no server, no network).
+Each operation's statements are counted with `metrics.count_queries()`.
+
+The "hydration" cases load the same large page of applications as ORM
+entities, as pydantic models and as readmodels records, and also report the
+memory each loaded row keeps alive (`bytes_per_row`, traced once per case).
+"""
+import json
+import platform
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import sqlalchemy
+from sqlalchemy import func, literal, null, select
+
+from .. import crud, database, metrics, models, readmodels, schemas, users
+from ..cache import response_cache
+
+BENCH_COMPANY = "Benchmark Writes"
+SEARCH_TERMS = {
+    "common": "engineer",
+    "company": "acme",
+    "note": "kubernetes",
+    "miss": "zzqxv",
+}
+VIEWS = {"active": True, "inactive": False, "all": None}
+DEEP_PAGE = 10
+# Rows per operation of the hydration cases
+HYDRATION_ROWS = 500
+
+Operation = Callable[[random.Random], Awaitable[Any]]
+
+
+@dataclass
+class Case:
+    name: str
+    run: Operation
+    group: str = "crud"
+    # Rows the operation returns, for cases that report bytes_per_row
+    rows: int = 0
+
+
+@dataclass
+class CaseResult:
+    name: str
+    group: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    max_ms: float
+    throughput_ops: float
+    queries_per_op: float
+    peak_rss_mb: float
+    bytes_per_row: Optional[float] = None
+
+
+@dataclass
+class Fixture:
+    """
+    Ids the cases work on, chosen once per run. Reads sample the seeded rows;
+    writes only touch rows created for the run (`written_ids`), which are
+    deleted afterwards, so benchmarking never changes the dataset. Everything
+    runs as the default user, like the route cases (no AUTH_USER_HEADER).
+    """
+    user_id: int = 0
+    application_ids: List[int] = field(default_factory=list)
+    deep_cursors: Dict[str, str] = field(default_factory=dict)
+    written_ids: List[int] = field(default_factory=list)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(q / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def _sample_fixture(sample_size: int, rng: random.Random) -> Fixture:
+    JA = models.JobApplication
+    fixture = Fixture()
+    async with database.AsyncSessionLocal() as db:
+        fixture.user_id = await users.user_id_for(db, users.DEFAULT_USERNAME)
+        owned = JA.user_id == fixture.user_id
+        low, high = (await db.execute(select(func.min(JA.id), func.max(JA.id)).where(owned))).one()
+        if low is None:
+            raise SystemExit("The database is empty; seed it first: python -m app.benchmarks seed")
+        # With several seeded users only some ids in the range are the default user's
+        candidates = {rng.randint(low, high) for _ in range(sample_size * 8)}
+        result = await db.execute(select(JA.id).where(owned, JA.id.in_(candidates)).order_by(JA.id))
+        fixture.application_ids = list(result.scalars().all())[:sample_size] or [low]
+        # A cursor DEEP_PAGE pages into each view, to measure deep keyset pages
+        for view, is_active in VIEWS.items():
+            page = await crud.get_job_application_list(db, fixture.user_id, is_active=is_active)
+            for _ in range(DEEP_PAGE - 1):
+                if not page.next_cursor:
+                    break
+                cursor = page.next_cursor
+                page = await crud.get_job_application_list(db, fixture.user_id, is_active=is_active, after=cursor)
+            if page.next_cursor:
+                fixture.deep_cursors[view] = page.next_cursor
+        fixture.written_ids = await crud.create_job_applications(db, fixture.user_id, [
+            schemas.JobApplicationCreate(company_name=BENCH_COMPANY, role=f"Role {i}", application_date=date.today())
+            for i in range(50)
+        ])
+    return fixture
+
+
+def crud_cases(fixture: Fixture) -> List[Case]:
+    def pick_id(rng: random.Random) -> int:
+        return rng.choice(fixture.application_ids)
+
+    def pick_written_id(rng: random.Random) -> int:
+        return rng.choice(fixture.written_ids)
+
+    def list_case(is_active: Optional[bool], term: Optional[str], after: Optional[str] = None) -> Operation:
+        async def run(rng: random.Random) -> None:
+            async with database.AsyncSessionLocal() as db:
+                await crud.get_job_application_list(db, fixture.user_id, is_active=is_active, search_term=term, after=after)
+        return run
+
+    async def get_one(rng: random.Random) -> None:
+        async with database.AsyncSessionLocal() as db:
+            await crud.get_job_application(db, fixture.user_id, pick_id(rng))
+
+    async def create(rng: random.Random) -> None:
+        async with database.AsyncSessionLocal() as db:
+            application = await crud.create_job_application(db, fixture.user_id, schemas.JobApplicationCreate(
+                company_name=BENCH_COMPANY, role=f"Role {rng.randint(1, 10**6)}", application_date=date.today(),
+            ))
+            fixture.written_ids.append(application.id)
+
+    async def update(rng: random.Random) -> None:
+        async with database.AsyncSessionLocal() as db:
+            await crud.update_job_application(db, fixture.user_id, pick_written_id(rng), schemas.JobApplicationUpdate(status=rng.choice(
+                ("Applied", "Interviewing", "Rejected")
+            )))
+
+    async def add_note(rng: random.Random) -> None:
+        async with database.AsyncSessionLocal() as db:
+            await crud.create_note_for_application(
+                db, fixture.user_id, schemas.NoteCreate(content="benchmark note"), pick_written_id(rng)
+            )
+
+    cases = []
+    for view, is_active in VIEWS.items():
+        cases.append(Case(f"list[{view}]", list_case(is_active, None)))
+        if view in fixture.deep_cursors:
+            cases.append(Case(f"list[{view},page={DEEP_PAGE + 1}]", list_case(is_active, None, fixture.deep_cursors[view])))
+        for label, term in SEARCH_TERMS.items():
+            cases.append(Case(f"list[{view},search={label}]", list_case(is_active, term)))
+    cases += [
+        Case("get_job_application", get_one),
+        Case("create_job_application", create),
+        Case("update_job_application", update),
+        Case("create_note_for_application", add_note),
+    ]
+    return cases
+
+
+def hydration_cases() -> List[Case]:
+    JA = models.JobApplication
+    # The list page's columns, without the note aggregates the comparison isn't about
+    page = select(
+        JA.id, JA.company_name, JA.role, JA.application_date, JA.status, JA.status_id, JA.contact_person,
+        JA.is_active, literal(0).label("note_count"), null().label("last_note_at"),
+    ).order_by(JA.id.desc()).limit(HYDRATION_ROWS)
+
+    async def orm(rng: random.Random) -> list:
+        async with database.AsyncSessionLocal() as db:
+            result = await db.execute(select(JA).order_by(JA.id.desc()).limit(HYDRATION_ROWS))
+            return list(result.scalars().all())
+
+    async def pydantic(rng: random.Random) -> list:
+        async with database.AsyncSessionLocal() as db:
+            result = await readmodels.execute(db, page)
+            return [schemas.JobApplicationSimple.model_validate(dict(row._mapping)) for row in result]
+
+    async def records(rng: random.Random) -> list:
+        async with database.AsyncSessionLocal() as db:
+            result = await readmodels.execute(db, page)
+            return readmodels.to_records(readmodels.ApplicationListItem, result.all())
+
+    return [
+        Case(f"hydrate[orm,{HYDRATION_ROWS}]", orm, "hydration", HYDRATION_ROWS),
+        Case(f"hydrate[pydantic,{HYDRATION_ROWS}]", pydantic, "hydration", HYDRATION_ROWS),
+        Case(f"hydrate[records,{HYDRATION_ROWS}]", records, "hydration", HYDRATION_ROWS),
+    ]
+
+
+async def bytes_per_row(case: Case, rng: random.Random) -> float:
+    """Memory still allocated while the operation's result is held, per row it returned."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        loaded = await case.run(rng)
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return retained / max(1, len(loaded))
+
+
+def route_cases(fixture: Fixture, client: httpx.AsyncClient) -> List[Case]:
+    def get(path: Callable[[random.Random], str]) -> Operation:
+        async def run(rng: random.Random) -> None:
+            response = await client.get(path(rng))
+            if response.status_code != 200:
+                raise RuntimeError(f"GET {response.request.url} returned {response.status_code}")
+        return run
+
+    def post(path: Callable[[random.Random], str], data: Callable[[random.Random], Dict[str, str]]) -> Operation:
+        async def run(rng: random.Random) -> None:
+            response = await client.post(path(rng), data=data(rng))
+            if response.status_code != 303:
+                raise RuntimeError(f"POST {response.request.url} returned {response.status_code}")
+        return run
+
+    def detail(rng: random.Random) -> str:
+        return f"/applications/{rng.choice(fixture.application_ids)}"
+
+    def new_application(rng: random.Random) -> Dict[str, str]:
+        return {"company_name": BENCH_COMPANY, "role": f"Role {rng.randint(1, 10**6)}", "status": "Applied"}
+
+    def written(rng: random.Random) -> str:
+        return f"/applications/{rng.choice(fixture.written_ids)}"
+
+    def edit(rng: random.Random) -> Dict[str, str]:
+        return {"company_name": BENCH_COMPANY, "role": f"Role {rng.randint(1, 10**6)}", "status": "Interviewing"}
+
+    cases = [
+        Case("GET /", get(lambda rng: "/"), "routes"),
+        Case("GET /?view=all", get(lambda rng: "/?view=all"), "routes"),
+        Case("GET /inactive", get(lambda rng: "/inactive"), "routes"),
+        Case("GET /?search=common", get(lambda rng: f"/?view=all&search={SEARCH_TERMS['common']}"), "routes"),
+        Case("GET /?search=note", get(lambda rng: f"/?view=all&search={SEARCH_TERMS['note']}"), "routes"),
+        Case("GET /applications/{id}", get(detail), "routes"),
+        Case("GET /applications/{id}/edit", get(lambda rng: detail(rng) + "/edit"), "routes"),
+        Case("POST /applications/new", post(lambda rng: "/applications/new", new_application), "routes"),
+        Case("POST /applications/{id}/notes/new",
+             post(lambda rng: written(rng) + "/notes/new", lambda rng: {"content": "benchmark note"}), "routes"),
+        Case("POST /applications/{id}/edit", post(lambda rng: written(rng) + "/edit", edit), "routes"),
+    ]
+    if fixture.deep_cursors.get("all"):
+        cursor = fixture.deep_cursors["all"]
+        cases.insert(3, Case(f"GET /?view=all&page={DEEP_PAGE + 1}", get(lambda rng: f"/?view=all&after={cursor}"), "routes"))
+    return cases
+
+
+async def run_case(case: Case, iterations: int, warmup: int, rng: random.Random) -> CaseResult:
+    for _ in range(warmup):
+        await case.run(rng)
+    latencies: List[float] = []
+    queries = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with metrics.count_queries() as counter:
+            t0 = time.perf_counter()
+            await case.run(rng)
+            latencies.append(time.perf_counter() - t0)
+        queries += counter[0]
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    ms = 1000.0
+    return CaseResult(
+        name=case.name,
+        group=case.group,
+        iterations=iterations,
+        p50_ms=percentile(latencies, 50) * ms,
+        p95_ms=percentile(latencies, 95) * ms,
+        p99_ms=percentile(latencies, 99) * ms,
+        mean_ms=sum(latencies) / len(latencies) * ms,
+        max_ms=latencies[-1] * ms,
+        throughput_ops=iterations / elapsed if elapsed else 0.0,
+        queries_per_op=queries / iterations,
+        peak_rss_mb=peak_rss_mb(),
+        # Traced separately: tracemalloc would slow the timed iterations down
+        bytes_per_row=await bytes_per_row(case, rng) if case.rows else None,
+    )
+
+
+async def _dataset_size() -> Dict[str, int]:
+    async with database.AsyncSessionLocal() as db:
+        applications = (await db.execute(select(func.count()).select_from(models.JobApplication))).scalar_one()
+        notes = (await db.execute(select(func.count()).select_from(models.Note))).scalar_one()
+        user_count = (await db.execute(select(func.count()).select_from(models.User))).scalar_one()
+    return {"applications": applications, "notes": notes, "users": user_count}
+
+
+async def _cleanup(fixture: Fixture) -> None:
+    JA = models.JobApplication
+    async with database.AsyncSessionLocal() as db:
+        result = await db.execute(select(JA.id).where(JA.user_id == fixture.user_id, JA.company_name == BENCH_COMPANY))
+        await crud.set_job_applications_state(db, fixture.user_id, list(result.scalars().all()), "delete")
+
+
+async def run_benchmarks(
+    iterations: int = 200,
+    warmup: int = 10,
+    groups: Optional[List[str]] = None,
+    match: Optional[str] = None,
+    seed: int = 1234,
+    use_cache: bool = False,
+    progress: Optional[Callable[[CaseResult], None]] = None,
+) -> Dict[str, Any]:
+    """Run the selected cases; returns a JSON-serializable report."""
+    from ..main import app
+
+    # The in-process transport doesn't run the app's lifespan
+    database.init_engine()
+    # Measure the database and templates, not the page cache, unless asked to
+    response_cache.enabled = use_cache
+    rng = random.Random(seed)
+    # Sized before the fixture adds the rows the write cases work on
+    dataset = await _dataset_size()
+    fixture = await _sample_fixture(200, rng)
+    report: Dict[str, Any] = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "dialect": database.engine.dialect.name,
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "warmup": warmup,
+            "seed": seed,
+            "cache": use_cache,
+            "dataset": dataset,
+        },
+        "results": {},
+    }
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            cases = crud_cases(fixture) + hydration_cases() + route_cases(fixture, client)
+            for case in cases:
+                if groups and case.group not in groups:
+                    continue
+                if match and match not in case.name:
+                    continue
+                result = await run_case(case, iterations, warmup, rng)
+                report["results"][case.name] = asdict(result)
+                if progress:
+                    progress(result)
+    finally:
+        await _cleanup(fixture)
+    return report
+
+
+# --- Baselines ---
+
+# A case regresses when a latency percentile grows by more than the tolerance,
+# or when it issues more statements per operation than the baseline did.
+COMPARED_LATENCIES = ("p50_ms", "p95_ms")
+
+
+@dataclass
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    def __str__(self) -> str:
+        change = (self.current / self.baseline - 1) * 100 if self.baseline else float("inf")
+        return f"{self.name}: {self.metric} {self.baseline:.2f} -> {self.current:.2f} ({change:+.0f}%)"
+
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.2) -> List[Regression]:
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        for metric_name in COMPARED_LATENCIES:
+            if result[metric_name] > before[metric_name] * (1 + tolerance):
+                regressions.append(Regression(name, metric_name, before[metric_name], result[metric_name]))
+        # Query counts are deterministic, so any increase is a regression (e.g. a new N+1)
+        if result["queries_per_op"] > before["queries_per_op"] + 1e-9:
+            regressions.append(Regression(name, "queries_per_op", before["queries_per_op"], result["queries_per_op"]))
+    return regressions
+
+
+def format_result(result: CaseResult) -> str:
+    line = (
+        f"{result.name:<44} p50 {result.p50_ms:8.2f}ms  p95 {result.p95_ms:8.2f}ms  p99 {result.p99_ms:8.2f}ms  "
+        f"{result.throughput_ops:8.1f} op/s  {result.queries_per_op:5.1f} q/op  rss {result.peak_rss_mb:7.1f}MB"
+    )
+    if result.bytes_per_row is not None:
+        line += f"  {result.bytes_per_row:7.0f} B/row"
+    return line
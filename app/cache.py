@@ -0,0 +1,170 @@
+"""
+In-process cache for rendered list and detail pages.
+
+Entries are stored with the generation numbers of the topics they depend on
+("applications:<user id>" for a user's list pages, "application:<id>" for a
+detail page).
+Writes bump the relevant generations; an entry whose recorded generations no
+longer match is treated as a miss. Nothing is ever scanned or deleted on
+write, so invalidation is O(1) and precise, and stale entries simply age out of
+the LRU.
+
+Generations live in a broker. `LocalBroker` keeps them in process memory;
+`SharedFileBroker` keeps them in a small memory-mapped file, which stands in
+for a real message broker when several worker processes on one host must see
+each other's invalidations. Select one with APP_CACHE_BROKER=local or
+APP_CACHE_BROKER=file:/path/to/generations.
+"""
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+def lists_topic(user_id: int) -> str:
+    # Per user, so one user's writes never invalidate anyone else's pages
+    return f"applications:{user_id}"
+
+
+def application_topic(application_id: int) -> str:
+    return f"application:{application_id}"
+
+
+class InvalidationBroker:
+    """Source of truth for topic generations."""
+
+    def generation(self, topic: str) -> int:
+        raise NotImplementedError
+
+    def bump(self, topics: Iterable[str]) -> None:
+        raise NotImplementedError
+
+
+class LocalBroker(InvalidationBroker):
+    def __init__(self):
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, topic: str) -> int:
+        return self._generations.get(topic, 0)
+
+    def bump(self, topics: Iterable[str]) -> None:
+        with self._lock:
+            for topic in topics:
+                self._generations[topic] = self._generations.get(topic, 0) + 1
+
+
+class SharedFileBroker(InvalidationBroker):
+    """
+    Generations in a fixed array of 64-bit counters in a shared mmap'd file.
+
+    Topics hash onto slots; two topics sharing a slot only cause an extra
+    invalidation, never a stale read. Reads are a lock-free 8-byte load;
+    bumps take an exclusive flock so concurrent increments aren't lost.
+    """
+    SLOTS = 4096
+    _COUNTER = struct.Struct("<Q")
+
+    def __init__(self, path: str):
+        import fcntl  # POSIX only; the local broker works everywhere
+
+        self._fcntl = fcntl
+        size = self.SLOTS * self._COUNTER.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+
+    def _offset(self, topic: str) -> int:
+        return (zlib.crc32(topic.encode()) % self.SLOTS) * self._COUNTER.size
+
+    def generation(self, topic: str) -> int:
+        return self._COUNTER.unpack_from(self._map, self._offset(topic))[0]
+
+    def bump(self, topics: Iterable[str]) -> None:
+        self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+        try:
+            for topic in topics:
+                offset = self._offset(topic)
+                value = self._COUNTER.unpack_from(self._map, offset)[0]
+                self._COUNTER.pack_into(self._map, offset, value + 1)
+        finally:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+
+Generations = Tuple[Tuple[str, int], ...]
+
+
+class ResponseCache:
+    """Size-bounded LRU of rendered bodies, validated against broker generations on every read."""
+
+    def __init__(self, max_entries: int = 512, broker: Optional[InvalidationBroker] = None, enabled: bool = True):
+        self.max_entries = max_entries
+        self.broker = broker or LocalBroker()
+        self.enabled = enabled and max_entries > 0
+        self._entries: "OrderedDict[Hashable, Tuple[bytes, Generations]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def snapshot(self, topics: Iterable[str]) -> Generations:
+        """Current generations of `topics`. Take this *before* reading the database and pass it to set()."""
+        return tuple((topic, self.broker.generation(topic)) for topic in topics)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            body, generations = entry
+            if all(self.broker.generation(topic) == gen for topic, gen in generations):
+                self.hits += 1
+                return body
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, body: bytes, generations: Generations) -> None:
+        # A write that landed while the page was being built has already bumped a
+        # generation past the snapshot, so the entry is born stale rather than wrong.
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (body, generations)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, topics: Iterable[str]) -> None:
+        self.broker.bump(list(topics))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def applications_changed(user_id: int, *application_ids: int, lists: bool = True) -> None:
+    """Invalidate `user_id`'s list pages and/or the detail pages of the given applications."""
+    topics = [application_topic(i) for i in application_ids]
+    if lists:
+        topics.append(lists_topic(user_id))
+    if topics:
+        response_cache.invalidate(topics)
+
+
+def _broker_from_env() -> InvalidationBroker:
+    spec = os.getenv("APP_CACHE_BROKER", "local")
+    if spec.startswith("file:"):
+        return SharedFileBroker(spec[len("file:"):])
+    return LocalBroker()
+
+
+response_cache = ResponseCache(
+    max_entries=int(os.getenv("APP_CACHE_MAX_ENTRIES", "512")),
+    broker=_broker_from_env(),
+    enabled=os.getenv("APP_CACHE_ENABLED", "1") not in ("0", "false", "no"),
+)
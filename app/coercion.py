@@ -0,0 +1,130 @@
+"""
+Coercion of loosely-typed input (HTML form fields, CSV cells, NDJSON values)
+into the types stored on a job application.
+
+The `parse_*` helpers return None for blank input and raise ValueError for input
+that is present but unparseable; `lenient()` turns that into a fallback value,
+which is how the HTML forms treat bad input.
+"""
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Mapping, Optional, TypeVar
+
+from pydantic import HttpUrl
+
+from . import schemas
+
+T = TypeVar("T")
+
+TRUE_STRINGS = {"true", "t", "yes", "y", "1", "on", "x"}
+FALSE_STRINGS = {"false", "f", "no", "n", "0", "off", ""}
+
+
+def empty_str_to_none(value: Optional[str]) -> Optional[str]:
+    return None if value == "" else value
+
+
+def _blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def parse_date(value: Any) -> Optional[date]:
+    if _blank(value):
+        return None
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip())
+
+
+def parse_salary(value: Any) -> Optional[Decimal]:
+    if _blank(value):
+        return None
+    try:
+        return Decimal(str(value).strip())
+    except InvalidOperation as e:
+        raise ValueError(f"Invalid salary: {value!r}") from e
+
+
+def parse_bonus(value: Any) -> Optional[float]:
+    # "10", "10%" and 10 all mean a 10% bonus, stored as 0.10
+    if _blank(value):
+        return None
+    bonus_val_str = str(value).strip().rstrip('%')
+    if not bonus_val_str:
+        return None
+    return float(bonus_val_str) / 100.0
+
+
+def parse_url(value: Any) -> Optional[str]:
+    if _blank(value):
+        return None
+    # pydantic's ValidationError is a ValueError
+    return str(HttpUrl(str(value).strip()))
+
+
+def parse_bool(value: Any) -> bool:
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in TRUE_STRINGS:
+        return True
+    if text in FALSE_STRINGS:
+        return False
+    raise ValueError(f"Invalid boolean: {value!r}")
+
+
+def lenient(parser: Callable[[Any], T], value: Any, default: Optional[T] = None) -> Optional[T]:
+    try:
+        return parser(value)
+    except ValueError:
+        return default
+
+
+def _optional_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def application_from_fields(fields: Mapping[str, Any], strict: bool = False) -> schemas.JobApplicationCreate:
+    """
+    Build a JobApplicationCreate from raw field values, applying the same rules as
+    the "Add New Job Application" form: ISO dates, Decimal salary, "10%" bonus,
+    validated http(s) URL, and blanks stored as NULL.
+
+    With strict=False unparseable optional values are dropped (the form's
+    behaviour); with strict=True they raise ValueError so importers can report them.
+    """
+    def coerce(parser, key, default=None):
+        if strict:
+            try:
+                return parser(fields.get(key))
+            except ValueError as e:
+                raise ValueError(f"{key}: {e}") from e
+        return lenient(parser, fields.get(key), default)
+
+    company_name = str(fields.get("company_name") or "").strip()
+    role = str(fields.get("role") or "").strip()
+    if strict and not (company_name and role):
+        raise ValueError("company_name and role are required")
+
+    return schemas.JobApplicationCreate(
+        company_name=company_name,
+        role=role,
+        application_date=coerce(parse_date, "application_date"),
+        status=_optional_text(fields.get("status")),
+        contact_person=_optional_text(fields.get("contact_person")),
+        phone=_optional_text(fields.get("phone")),
+        url=coerce(parse_url, "url"),
+        cover_letter=coerce(parse_bool, "cover_letter", False),
+        interview_date=coerce(parse_date, "interview_date"),
+        offer=coerce(parse_bool, "offer", False),
+        salary=coerce(parse_salary, "salary"),
+        equity=coerce(parse_bool, "equity", False),
+        bonus=coerce(parse_bonus, "bonus"),
+        health_coverage=coerce(parse_bool, "health_coverage", False),
+        pto=_optional_text(fields.get("pto")),
+        # Absent or blank (the form, most imports) means active; exports carry it, so archived rows re-import archived
+        is_active=True if _optional_text(fields.get("is_active")) is None else coerce(parse_bool, "is_active", True),
+    )
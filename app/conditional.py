@@ -0,0 +1,92 @@
+"""
+HTTP conditional requests for the HTML pages.
+
+A page's validators are derived from a cheap version probe (see
+`crud.get_job_application_list_version` / `crud.get_job_application_version`)
+rather than from the rendered body, so a matching `If-None-Match` is answered
+with 304 before the page query runs or the template renders.
+
+ETags are strong: they hash everything the body depends on — the route and its
+parameters, the probed row versions and a digest of the templates themselves,
+so a deploy that changes markup also changes every ETag.
+
+Last-Modified is only sent where the probed timestamp moves on every change
+(one application's updated_at). A list's max(updated_at) does not move when a
+row other than the newest is deleted, so list pages are validated by ETag alone.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+# Browsers may keep a copy but must revalidate it; without this they would apply
+# heuristic freshness to Last-Modified and could show a page from before a POST.
+CACHE_CONTROL = "private, no-cache"
+
+
+def _templates_digest() -> str:
+    digest = hashlib.sha1()
+    for path in sorted(TEMPLATE_DIR.rglob("*.html")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+TEMPLATES_DIGEST = _templates_digest()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything the app writes is UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1(TEMPLATES_DIGEST.encode())
+    for part in parts:
+        if isinstance(part, datetime):
+            part = _as_utc(part).isoformat()
+        digest.update(repr(part).encode())
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison: W/"x" matches "x"
+    if header.strip() == "*":
+        return True
+    candidates = (c.strip() for c in header.split(","))
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # When both are sent, If-None-Match takes precedence (RFC 9110 13.2.2)
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -1,92 +1,530 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import desc, select, or_ # Import or_ for combining search conditions
+from sqlalchemy import and_, bindparam, delete, func, insert, or_, select, update
 from sqlalchemy.orm import selectinload # Added for eager loading
-from . import models, schemas
-from typing import List, Optional
+from . import models, readmodels, reminders, schemas, search, stats, statuses
+from .cache import applications_changed
+from .pagination import DEFAULT_PAGE_SIZE, Page, SortKey, build_page, paginate_query
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
 from pydantic import HttpUrl
 
 # --- Job Application CRUD --- 
+# Every write calls applications_changed() after committing so cached list and
+# detail pages (app/cache.py) are invalidated precisely, and stamps the rows it
+# changes with _touched() so conditional requests (app/conditional.py) see a new version.
+# Writes that add, remove or change applications also record the change in the
+# pipeline counters (app/stats.py) inside the same transaction, and store statuses
+# through the statuses lookup table (app/statuses.py). Writes that can move a
+# reminder (dates, activity, state) wake the reminder scheduler (app/reminders.py).
+# Every function works for one user (app/users.py): reads filter on user_id, and
+# writes only ever match or create that user's rows. Statuses are a shared lookup,
+# but a user only sees the canonical ones and those of their own applications.
 
-async def get_job_application(db: AsyncSession, application_id: int) -> Optional[models.JobApplication]:
+def _application_values(data: dict) -> dict:
+    if isinstance(data.get("url"), HttpUrl):
+        data["url"] = str(data["url"])
+    return data
+
+def _touched() -> dict:
+    """UPDATE values that mark an application as changed; inserts get the same from column defaults."""
+    return {"updated_at": models.utcnow(), "version": models.JobApplication.version + 1}
+
+def _owned(user_id: int, application_ids: List[int]):
+    JA = models.JobApplication
+    return (JA.user_id == user_id, JA.id.in_(application_ids))
+
+async def _touch_applications(db: AsyncSession, user_id: int, application_ids: List[int]) -> int:
+    """Stamp the user's applications among `application_ids` as changed; returns how many there were."""
     result = await db.execute(
-        select(models.JobApplication)
-        .options(selectinload(models.JobApplication.notes))
-        .filter(models.JobApplication.id == application_id)
+        update(models.JobApplication)
+        .where(*_owned(user_id, application_ids))
+        .values(**_touched())
+        .execution_options(synchronize_session=False)
     )
+    return result.rowcount
+
+async def get_job_application_version(db: AsyncSession, user_id: int, application_id: int) -> Optional[tuple]:
+    """(updated_at, version) of one application, or None if the user has no such application. A unique key lookup."""
+    JA = models.JobApplication
+    result = await db.execute(select(JA.updated_at, JA.version).where(JA.user_id == user_id, JA.id == application_id))
+    return result.first()
+
+async def get_job_application_list_version(db: AsyncSession, user_id: int, is_active: Optional[bool] = True) -> tuple:
+    """
+    (row count, max(updated_at)) over one of the user's list views; changes whenever any row in the
+    view is inserted, updated or deleted. Answered from ix_job_applications_user_active_updated_at.
+    """
+    JA = models.JobApplication
+    query = select(func.count(), func.max(JA.updated_at)).select_from(JA).where(JA.user_id == user_id)
+    if is_active is not None:
+        query = query.where(JA.is_active == is_active)
+    result = await db.execute(query)
+    return tuple(result.one())
+
+async def get_job_application(
+    db: AsyncSession, user_id: int, application_id: int, include_notes: bool = False, for_update: bool = False
+) -> Optional[models.JobApplication]:
+    # Notes are unbounded, so only callers that really need all of them (the JSON
+    # detail endpoint) load them here; pages use get_notes_page().
+    query = select(models.JobApplication).filter(
+        models.JobApplication.user_id == user_id, models.JobApplication.id == application_id
+    )
+    if include_notes:
+        query = query.options(selectinload(models.JobApplication.notes))
+    if for_update:
+        # Writers that derive something from the current values hold the row until they commit
+        query = query.with_for_update()
+    result = await db.execute(query)
     return result.scalars().first()
 
-async def get_job_applications(db: AsyncSession, skip: int = 0, limit: int = 100, is_active: Optional[bool] = True, search_term: Optional[str] = None) -> List[models.JobApplication]:
-    query = select(models.JobApplication).options(selectinload(models.JobApplication.notes))
+# Listing order shared by every paginated read: newest application first, id as tie-breaker.
+# Backed by ix_job_applications_user_active_date_id so each page is a single index range scan.
+APPLICATION_LIST_KEYS = (
+    SortKey(models.JobApplication.application_date, nullable=True, kind="date"),
+    SortKey(models.JobApplication.id),
+)
+
+def application_list_key(application) -> tuple:
+    return (application.application_date, application.id)
+
+def _search_list_key(row) -> tuple:
+    return (row.relevance, row.id)
+
+def _dialect_name(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+# Status filter value for applications without a status (ids start at 1)
+NO_STATUS_ID = 0
+
+def _filter_status(query, status_id: Optional[int]):
+    JA = models.JobApplication
+    if status_id is None:
+        return query
+    if status_id == NO_STATUS_ID:
+        return query.filter(JA.status_id.is_(None))
+    return query.filter(JA.status_id == status_id)
+
+async def get_job_application_list(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = DEFAULT_PAGE_SIZE,
+    is_active: Optional[bool] = True,
+    search_term: Optional[str] = None,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    status_id: Optional[int] = None,
+) -> Page:
+    # List pages only show a handful of columns, so select exactly those and return
+    # them as readmodels records rather than ORM or pydantic objects (and never touch note content).
+    JA = models.JobApplication
+    query = (
+        select(JA.id, JA.company_name, JA.role, JA.application_date, JA.status, JA.status_id, JA.contact_person, JA.is_active)
+        .filter(JA.user_id == user_id)
+    )
     if is_active is not None:
-        query = query.filter(models.JobApplication.is_active == is_active)
-    if search_term:
-        search_filter = or_(
-            models.JobApplication.company_name.ilike(f"%{search_term}%"),
-            models.JobApplication.role.ilike(f"%{search_term}%")
+        query = query.filter(JA.is_active == is_active)
+    # With a view, the filter is a prefix of ix_job_applications_user_active_status_date_id
+    query = _filter_status(query, status_id)
+
+    if search_term and search_term.strip():
+        # Searches are ranked by relevance (id breaks ties) instead of by date
+        query, relevance = search.apply_search(query, search_term, _dialect_name(db), user_id)
+        query = query.add_columns(relevance.label("relevance"))
+        keys = (SortKey(relevance, kind="float"), SortKey(JA.id))
+        keys_of = _search_list_key
+    else:
+        keys = APPLICATION_LIST_KEYS
+        keys_of = application_list_key
+    query, backwards = paginate_query(query, keys, limit, after=after, before=before)
+
+    # Note count and last-note time for just this page's rows, from one grouped
+    # subquery over ix_notes_application_id_id, joined back in the same round trip.
+    page_rows = query.cte("page_rows")
+    note_stats = (
+        select(
+            models.Note.application_id,
+            func.count(models.Note.id).label("note_count"),
+            func.max(models.Note.created_at).label("last_note_at"),
         )
-        query = query.filter(search_filter)
-    query = query.order_by(desc(models.JobApplication.application_date), desc(models.JobApplication.id)) # Add consistent ordering
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
-
-async def create_job_application(db: AsyncSession, application: schemas.JobApplicationCreate) -> models.JobApplication:
-    app_data = application.model_dump()
-    if isinstance(app_data.get("url"), HttpUrl):
-        app_data["url"] = str(app_data["url"])
-    
-    db_application = models.JobApplication(**app_data)
+        .where(models.Note.application_id.in_(select(page_rows.c.id)))
+        .group_by(models.Note.application_id)
+        .subquery("note_stats")
+    )
+    if keys is APPLICATION_LIST_KEYS:
+        page_keys = (SortKey(page_rows.c.application_date, nullable=True), SortKey(page_rows.c.id))
+        cursor_columns = []
+    else:
+        page_keys = (SortKey(page_rows.c.relevance), SortKey(page_rows.c.id))
+        cursor_columns = [page_rows.c.relevance]
+    # Columns in ApplicationListItem's field order; the relevance (cursors only) goes last
+    result = await readmodels.execute(
+        db,
+        select(
+            *(page_rows.c[name] for name in readmodels.columns(readmodels.ApplicationListItem) if name in page_rows.c),
+            func.coalesce(note_stats.c.note_count, 0).label("note_count"),
+            note_stats.c.last_note_at,
+            *cursor_columns,
+        )
+        .outerjoin(note_stats, note_stats.c.application_id == page_rows.c.id)
+        .order_by(*(k.order_by(backwards) for k in page_keys))
+    )
+    page = build_page(result.all(), keys_of, limit, backwards, has_cursor=bool(after or before))
+    page.items = readmodels.to_records(readmodels.ApplicationListItem, page.items)
+    return page
+
+async def get_status_facets(
+    db: AsyncSession,
+    user_id: int,
+    is_active: Optional[bool] = True,
+    search_term: Optional[str] = None,
+) -> List[schemas.StatusFacet]:
+    """
+    Application counts per status over a list view (and search), in pipeline order,
+    from one grouped query; without a search it is answered from the status indexes.
+    """
+    JA, Status = models.JobApplication, models.Status
+    counts = select(JA.status_id, func.count().label("count")).filter(JA.user_id == user_id)
+    if is_active is not None:
+        counts = counts.filter(JA.is_active == is_active)
+    if search_term and search_term.strip():
+        counts, _ = search.apply_search(counts, search_term, _dialect_name(db), user_id)
+    counts = counts.group_by(JA.status_id).subquery("counts")
+    result = await db.execute(
+        select(counts.c.status_id, Status.name, counts.c["count"])
+        .outerjoin(Status, Status.id == counts.c.status_id)
+        # Applications without a status last
+        .order_by(counts.c.status_id.is_(None), Status.position, Status.name)
+    )
+    return [
+        schemas.StatusFacet(status_id=NO_STATUS_ID if status_id is None else status_id, name=name, count=count)
+        for status_id, name, count in result
+    ]
+
+async def get_statuses(db: AsyncSession, user_id: int) -> List[models.Status]:
+    """The canonical statuses, plus the other ones the user's applications have."""
+    # The table is shared, but a status made from one user's free text is that user's business;
+    # the used ones are read off ix_job_applications_user_status_id
+    Status, JA = models.Status, models.JobApplication
+    used = select(JA.status_id).where(JA.user_id == user_id, JA.status_id.isnot(None))
+    result = await db.execute(
+        select(Status)
+        .where(or_(Status.position < statuses.OTHER_POSITION, Status.id.in_(used)))
+        .order_by(Status.position, Status.name)
+    )
+    return list(result.scalars().all())
+
+async def create_job_application(db: AsyncSession, user_id: int, application: schemas.JobApplicationCreate) -> models.JobApplication:
+    app_data = _application_values(application.model_dump())
+    await statuses.resolve_application_statuses(db, [app_data])
+    db_application = models.JobApplication(**app_data, user_id=user_id)
     db.add(db_application)
+    await stats.record_changes(db, user_id, [(None, app_data)])
     await db.commit()
+    applications_changed(user_id)
+    reminders.scheduler.wake()
     await db.refresh(db_application)
     return db_application
 
-async def update_job_application(db: AsyncSession, application_id: int, application_update: schemas.JobApplicationUpdate) -> Optional[models.JobApplication]:
-    db_application = await get_job_application(db, application_id) # Must await here
+async def update_job_application(db: AsyncSession, user_id: int, application_id: int, application_update: schemas.JobApplicationUpdate) -> Optional[models.JobApplication]:
+    db_application = await get_job_application(db, user_id, application_id, for_update=True) # Must await here
     if db_application:
-        update_data = application_update.model_dump(exclude_unset=True)
-        if isinstance(update_data.get("url"), HttpUrl):
-            update_data["url"] = str(update_data["url"])
-            
+        before = stats.stat_values(db_application)
+        update_data = _application_values(application_update.model_dump(exclude_unset=True))
+        await statuses.resolve_application_statuses(db, [update_data])
         for key, value in update_data.items():
             setattr(db_application, key, value)
+        for key, value in _touched().items():
+            setattr(db_application, key, value)
+        await stats.record_changes(db, user_id, [(before, db_application)])
         await db.commit()
+        applications_changed(user_id, application_id)
+        reminders.scheduler.wake()
         await db.refresh(db_application)
     return db_application
 
-async def delete_job_application(db: AsyncSession, application_id: int) -> Optional[models.JobApplication]:
-    db_application = await get_job_application(db, application_id) # Must await here
-    if db_application:
-        await db.delete(db_application)
-        await db.commit()
-    return db_application # Note: after delete, this object might be in a transient state or detached
+# State changes are single UPDATE/DELETE ... RETURNING statements: no prior SELECT,
+# no note loading and no refresh round trip. The returned values feed the stats counters.
 
-async def activate_job_application(db: AsyncSession, application_id: int) -> Optional[models.JobApplication]:
-    db_application = await get_job_application(db, application_id) # Must await here
-    if db_application:
-        db_application.is_active = True
-        await db.commit()
-        await db.refresh(db_application)
-    return db_application
+async def delete_job_application(db: AsyncSession, user_id: int, application_id: int) -> Optional[int]:
+    # Notes go with it through ON DELETE CASCADE; the deleted values come back for the counters
+    result = await db.execute(
+        delete(models.JobApplication)
+        .where(*_owned(user_id, [application_id]))
+        .returning(models.JobApplication.id, *stats.stat_columns())
+    )
+    deleted = result.first()
+    deleted_id = deleted.id if deleted is not None else None
+    if deleted is not None:
+        await stats.record_changes(db, user_id, [(deleted, None)])
+    await db.commit()
+    if deleted_id is not None:
+        applications_changed(user_id, deleted_id)
+    return deleted_id
 
-async def deactivate_job_application(db: AsyncSession, application_id: int) -> Optional[models.JobApplication]:
-    db_application = await get_job_application(db, application_id) # Must await here
-    if db_application:
-        db_application.is_active = False
+async def _set_job_application_active(db: AsyncSession, user_id: int, application_id: int, is_active: bool) -> Optional[models.JobApplication]:
+    # Only a row that is actually changing state matches, so the returned row's
+    # previous state is known to be the opposite one
+    result = await db.execute(
+        update(models.JobApplication)
+        .where(*_owned(user_id, [application_id]), models.JobApplication.is_active != is_active)
+        .values(is_active=is_active, **_touched())
+        .returning(models.JobApplication)
+    )
+    db_application = result.scalars().first()
+    if db_application is None:
         await db.commit()
-        await db.refresh(db_application)
+        # Already in that state (nothing to change) or not found
+        return await get_job_application(db, user_id, application_id)
+    await stats.record_changes(db, user_id, [({**stats.stat_values(db_application), "is_active": not is_active}, db_application)])
+    await db.commit()
+    applications_changed(user_id, application_id)
+    reminders.scheduler.wake()
     return db_application
 
+async def activate_job_application(db: AsyncSession, user_id: int, application_id: int) -> Optional[models.JobApplication]:
+    return await _set_job_application_active(db, user_id, application_id, True)
+
+async def deactivate_job_application(db: AsyncSession, user_id: int, application_id: int) -> Optional[models.JobApplication]:
+    return await _set_job_application_active(db, user_id, application_id, False)
+
+# --- Bulk Job Application operations ---
+# Used by the JSON API for automation: each call is one transaction and one
+# multi-row statement (or one executemany) regardless of batch size.
+
+async def create_job_applications(db: AsyncSession, user_id: int, applications: List[schemas.JobApplicationCreate]) -> List[int]:
+    if not applications:
+        return []
+    rows = [{**_application_values(a.model_dump()), "user_id": user_id} for a in applications]
+    await statuses.resolve_application_statuses(db, rows)
+    # insertmanyvalues: a multi-row INSERT ... RETURNING, ids in the order of `rows`
+    result = await db.execute(
+        insert(models.JobApplication).returning(models.JobApplication.id, sort_by_parameter_order=True),
+        rows,
+    )
+    ids = list(result.scalars().all())
+    await stats.record_changes(db, user_id, [(None, row) for row in rows])
+    await db.commit()
+    applications_changed(user_id)
+    reminders.scheduler.wake()
+    return ids
+
+async def update_job_applications(db: AsyncSession, user_id: int, updates: Dict[int, schemas.JobApplicationUpdate]) -> List[int]:
+    """Apply partial updates keyed by application id; returns the ids that are the user's and were updated."""
+    if not updates:
+        return []
+    JA = models.JobApplication
+    # The current values are the "before" side of the counter changes, so lock them until commit
+    result = await db.execute(
+        select(JA.id, *stats.stat_columns()).where(*_owned(user_id, list(updates))).with_for_update()
+    )
+    existing = {row.id: stats.stat_values(row) for row in result}
+    values_by_id = {}
+    for application_id, application_update in updates.items():
+        values = _application_values(application_update.model_dump(exclude_unset=True))
+        values.pop("id", None)
+        values_by_id[application_id] = values
+    await statuses.resolve_application_statuses(db, values_by_id.values())
+    rows = []
+    changes = []
+    for application_id, values in values_by_id.items():
+        if application_id in existing and values:
+            rows.append({"id": application_id, "owner_id": user_id, **values})
+            changes.append((existing[application_id], {**existing[application_id], **values}))
+    if rows:
+        # ORM bulk UPDATE by primary key (executemany, grouped by column set). Each parameter set also
+        # carries its owner, so a row matches on (user_id, id) like every other tenant write, not on the
+        # id alone; no loaded objects need syncing, as only columns were selected above
+        await db.execute(
+            update(JA).where(JA.user_id == bindparam("owner_id")).execution_options(synchronize_session=None),
+            rows,
+        )
+        # Per-row parameter sets can't carry the version increment, so stamp them all in one more statement
+        await _touch_applications(db, user_id, [row["id"] for row in rows])
+        await stats.record_changes(db, user_id, changes)
+    await db.commit()
+    if rows:
+        applications_changed(user_id, *(row["id"] for row in rows))
+        reminders.scheduler.wake()
+    return [application_id for application_id in updates if application_id in existing]
+
+async def set_job_applications_state(db: AsyncSession, user_id: int, application_ids: List[int], action: str) -> List[int]:
+    """Activate, deactivate or delete many of the user's applications in one statement; returns the ids that were affected."""
+    JA = models.JobApplication
+    ids = list(dict.fromkeys(application_ids))
+    if not ids:
+        return []
+    if action == "delete":
+        # Notes are removed by ON DELETE CASCADE
+        statement = delete(JA).where(*_owned(user_id, ids))
+    elif action in ("activate", "deactivate"):
+        is_active = action == "activate"
+        # Rows already in the target state are left alone, so every returned row flipped
+        statement = update(JA).where(*_owned(user_id, ids), JA.is_active != is_active).values(is_active=is_active, **_touched())
+    else:
+        raise ValueError(f"Unknown state action: {action}")
+    result = await db.execute(
+        statement.returning(JA.id, *stats.stat_columns()).execution_options(synchronize_session=False)
+    )
+    changed_rows = result.all()
+    if action == "delete":
+        changes = [(row, None) for row in changed_rows]
+    else:
+        changes = [({**stats.stat_values(row), "is_active": not is_active}, row) for row in changed_rows]
+    await stats.record_changes(db, user_id, changes)
+    changed = [row.id for row in changed_rows]
+    unchanged = []
+    if action != "delete" and len(changed) < len(ids):
+        # The rest either exist and were already in that state, or don't exist
+        rest = set(ids).difference(changed)
+        unchanged = list((await db.execute(select(JA.id).where(*_owned(user_id, list(rest))))).scalars().all())
+    await db.commit()
+    if changed:
+        applications_changed(user_id, *changed)
+        reminders.scheduler.wake()
+    return changed + unchanged
+
 # --- Note CRUD --- 
 
-async def create_note_for_application(db: AsyncSession, note: schemas.NoteCreate, application_id: int) -> models.Note:
-    db_note = models.Note(**note.model_dump(), application_id=application_id)
+async def create_note_for_application(db: AsyncSession, user_id: int, note: schemas.NoteCreate, application_id: int) -> Optional[models.Note]:
+    """The new note, or None if the user has no such application."""
+    # The application's pages show its notes, so a new note is a new version of the application
+    if not await _touch_applications(db, user_id, [application_id]):
+        await db.rollback()
+        return None
+    db_note = models.Note(**note.model_dump(), user_id=user_id, application_id=application_id)
     db.add(db_note)
     await db.commit()
+    # Detail page shows the note; list pages show note counts
+    applications_changed(user_id, application_id)
+    reminders.scheduler.wake()
     await db.refresh(db_note)
     return db_note
 
-async def get_notes_for_application(db: AsyncSession, application_id: int) -> List[models.Note]:
-    query = select(models.Note).filter(models.Note.application_id == application_id).order_by(desc(models.Note.id))
-    result = await db.execute(query)
-    return result.scalars().all() 
\ No newline at end of file
+# Newest first; each page is a range scan of ix_notes_application_id_id
+NOTE_PAGE_KEYS = (SortKey(models.Note.id),)
+NOTES_PAGE_SIZE = 20
+
+def _note_key(note) -> tuple:
+    return (note.id,)
+
+async def get_notes_page(
+    db: AsyncSession,
+    user_id: int,
+    application_id: int,
+    limit: int = NOTES_PAGE_SIZE,
+    after: Optional[str] = None,
+) -> Page:
+    Note = models.Note
+    query = select(Note.id, Note.application_id, Note.content, Note.created_at).filter(
+        Note.user_id == user_id, Note.application_id == application_id
+    )
+    query, backwards = paginate_query(query, NOTE_PAGE_KEYS, limit, after=after)
+    result = await readmodels.execute(db, query)
+    page = build_page(result.all(), _note_key, limit, backwards, has_cursor=bool(after))
+    page.items = readmodels.to_records(readmodels.NoteItem, page.items)
+    return page
+
+# --- Activity feed ---
+
+# Notes of all the user's applications, newest first; each page is a range scan of ix_notes_user_created_at_id.
+# Old notes without a created_at (no timestamp to backfill from) are left out.
+ACTIVITY_PAGE_KEYS = (SortKey(models.Note.created_at, kind="datetime"), SortKey(models.Note.id))
+
+def _activity_key(row) -> tuple:
+    return (row.created_at, row.note_id)
+
+def _as_utc(value: datetime) -> datetime:
+    # Bounds without an offset are UTC, like everything the app stores
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+async def get_activity_page(
+    db: AsyncSession,
+    user_id: int,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> Page:
+    """Notes across all the user's applications in [since, until), with the application each belongs to."""
+    Note, JA = models.Note, models.JobApplication
+    query = (
+        select(
+            Note.id.label("note_id"), Note.application_id, JA.company_name, JA.role,
+            Note.content, Note.created_at,
+        )
+        .join(JA, and_(JA.user_id == Note.user_id, JA.id == Note.application_id))
+        .where(Note.user_id == user_id, Note.created_at.isnot(None))
+    )
+    if since is not None:
+        query = query.where(Note.created_at >= _as_utc(since))
+    if until is not None:
+        query = query.where(Note.created_at < _as_utc(until))
+    query, backwards = paginate_query(query, ACTIVITY_PAGE_KEYS, limit, after=after, before=before)
+    result = await readmodels.execute(db, query)
+    page = build_page(result.all(), _activity_key, limit, backwards, has_cursor=bool(after or before))
+    page.items = readmodels.to_records(readmodels.ActivityItem, page.items)
+    return page
+
+
+# --- Upcoming interviews and follow-ups ---
+# Read off the same (is_active, interview_date) and (is_active, updated_at) ranges the
+# reminder scheduler loads from.
+
+UPCOMING_DAYS = 14
+UPCOMING_LIMIT = 50
+
+def _upcoming_columns():
+    return [getattr(models.JobApplication, name) for name in readmodels.columns(readmodels.UpcomingItem)]
+
+async def get_upcoming_interviews(db: AsyncSession, user_id: int, days: int = UPCOMING_DAYS, limit: int = UPCOMING_LIMIT) -> List[readmodels.UpcomingItem]:
+    """Active applications interviewing from today through the next `days` days, soonest first."""
+    JA = models.JobApplication
+    today = date.today()
+    result = await readmodels.execute(
+        db,
+        select(*_upcoming_columns())
+        .where(JA.user_id == user_id, JA.is_active.is_(True))
+        .where(JA.interview_date >= today, JA.interview_date <= today + timedelta(days=days))
+        .order_by(JA.interview_date, JA.id)
+        .limit(limit),
+    )
+    return readmodels.to_records(readmodels.UpcomingItem, result.all())
+
+async def get_follow_ups_due(db: AsyncSession, user_id: int, limit: int = UPCOMING_LIMIT) -> List[readmodels.UpcomingItem]:
+    """Active applications without an interview and no activity for reminders.FOLLOW_UP_DAYS, longest waiting first."""
+    result = await readmodels.execute(
+        db,
+        reminders.follow_ups_between(None, reminders.utcnow(), columns=_upcoming_columns())
+        .where(models.JobApplication.user_id == user_id)
+        .limit(limit),
+    )
+    return readmodels.to_records(readmodels.UpcomingItem, result.all())
+
+async def get_recent_reminders(db: AsyncSession, user_id: int, limit: int = 20) -> List[readmodels.ReminderItem]:
+    """The last reminders sent, newest first; a range scan of ix_reminders_user_fired_at."""
+    Reminder = models.Reminder
+    result = await readmodels.execute(
+        db,
+        select(*(getattr(Reminder, name) for name in readmodels.columns(readmodels.ReminderItem)))
+        .where(Reminder.user_id == user_id)
+        .order_by(Reminder.fired_at.desc())
+        .limit(limit),
+    )
+    return readmodels.to_records(readmodels.ReminderItem, result.all())
+
+
+# --- Pipeline stats ---
+
+async def get_pipeline_stats(db: AsyncSession, user_id: int, weeks: int = stats.DEFAULT_WEEKS) -> schemas.PipelineStats:
+    """The user's dashboard numbers, read from their application_stats counters (never from job_applications)."""
+    Stat = models.ApplicationStat
+    oldest_week = stats.week_start(date.today()) - timedelta(weeks=weeks - 1)
+    result = await db.execute(
+        select(Stat.metric, Stat.bucket, Stat.count, Stat.total)
+        # Older weeks are the only counters that grow with history; "undated" sorts after every date
+        .where(Stat.user_id == user_id, or_(Stat.metric != "week", Stat.bucket >= oldest_week.isoformat()))
+    )
+    return stats.summarize(result.all(), date.today(), weeks)
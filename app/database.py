@@ -1,18 +1,37 @@
+import asyncio
 import os
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from . import metrics, replicas
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL is None:
     # Provide a default only if not set, and ensure it matches async driver
     DATABASE_URL = "postgresql+asyncpg://user:password@db/apptrackerdb"
 
-# Use create_async_engine for an asynchronous engine
-engine = create_async_engine(DATABASE_URL, echo=False) # Set echo=True for debugging SQL
+# Pool settings apply per worker process: with N workers the database sees up to
+# N * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "0") == "1"
+
+# The engine is created per process by init_engine() — the app's lifespan, or a
+# command-line entry point — and never at import time: a pool created before a
+# fork would hand the same sockets to several worker processes.
+engine: Optional[AsyncEngine] = None
+# Read replicas (DATABASE_REPLICA_URLS), created alongside the primary engine
+replica_set = replicas.ReplicaSet()
 
-# Use AsyncSession for the session_maker
+# Bound to the (primary) engine by init_engine(); read sessions on a replica override the bind
 AsyncSessionLocal = sessionmaker(
-    bind=engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
@@ -21,8 +40,105 @@ AsyncSessionLocal = sessionmaker(
 
 Base = declarative_base()
 
-# Dependency to get ASYNC DB session
-async def get_db() -> AsyncSession: # Marked as async, returns AsyncSession
+
+def _pool_options(url: str) -> dict:
+    # SQLite (aiosqlite) picks its own pool per database kind; sizing doesn't apply
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite only enforces foreign keys (and ON DELETE CASCADE) when asked to, per connection
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def init_engine(url: Optional[str] = None, replica_urls: Optional[List[str]] = None, **options) -> AsyncEngine:
+    """
+    Create this process's engine (once) and bind the session factory to it, plus
+    one engine per read replica (`replica_urls`, default DATABASE_REPLICA_URLS).
+    """
+    global engine
+    if engine is not None:
+        return engine
+    url = url or DATABASE_URL
+    engine = create_async_engine(url, echo=False, **{**_pool_options(url), **options}) # Set echo=True for debugging SQL
+    # Statement timing, per-request query counts and pool gauges for /metrics
+    metrics.instrument_engine(engine)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+    AsyncSessionLocal.configure(bind=engine)
+    for replica_url in replicas.REPLICA_URLS if replica_urls is None else replica_urls:
+        # Pinged on checkout: that is the health check that sends reads elsewhere
+        replica = create_async_engine(replica_url, echo=False, **{**_pool_options(replica_url), "pool_pre_ping": True, **options})
+        metrics.instrument_engine(replica, pool_gauges=False)
+        replica_set.add(replica)
+    return engine
+
+
+async def dispose_engine() -> None:
+    """Close every pooled connection; the next init_engine() starts afresh."""
+    global engine
+    if engine is None:
+        return
+    for replica in replica_set.clear():
+        await replica.dispose()
+    await engine.dispose()
+    engine = None
+    AsyncSessionLocal.configure(bind=None)
+
+
+def is_replica(session: AsyncSession) -> bool:
+    return session.info.get("replica", False)
+
+
+async def open_read_session(primary: bool = False) -> AsyncSession:
+    """
+    A session for reads on the next healthy replica, already connected; on the
+    primary when `primary` is set, when there are no replicas or none answers.
+    """
+    if primary or not replica_set:
+        metrics.DB_READ_SESSIONS.inc(target="primary")
+        return AsyncSessionLocal()
+    for replica in replica_set.candidates():
+        session = AsyncSessionLocal(bind=replica, info={"replica": True})
+        try:
+            await asyncio.wait_for(session.connection(), replicas.CONNECT_TIMEOUT)
+        except exc.TimeoutError:
+            # Its pool is exhausted, which says nothing about its health
+            await session.close()
+            continue
+        except (exc.DBAPIError, OSError, asyncio.TimeoutError):
+            await session.close()
+            replica_set.mark_down(replica)
+            continue
+        replica_set.mark_up(replica)
+        metrics.DB_READ_SESSIONS.inc(target="replica")
+        return session
+    metrics.DB_READ_SESSIONS.inc(target="fallback")
+    return AsyncSessionLocal()
+
+
+# Dependencies: GET routes read (from a replica when there are any), everything else writes to the primary
+async def get_read_db(request: Request) -> AsyncSession:
+    session = await open_read_session(primary=replicas.pins_primary(request.cookies))
+    async with session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_write_db() -> AsyncSession: # Marked as async, returns AsyncSession
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -30,4 +146,4 @@ async def get_db() -> AsyncSession: # Marked as async, returns AsyncSession
             await session.rollback() # Rollback on exception
             raise
         finally:
-            await session.close() # Close session in async context 
\ No newline at end of file
+            await session.close() # Close session in async context
@@ -0,0 +1,153 @@
+"""
+Constant-memory export of one user's job applications as CSV or NDJSON.
+
+Rows are read through a server-side cursor (`AsyncConnection.stream` with
+`yield_per`) as readmodels records, serialized one chunk at a time and handed
+to a StreamingResponse, so peak memory depends on the chunk size rather than on
+the table size. Notes, when requested, are fetched with one query per chunk.
+
+Exported fields use the importer's names and formats (bonus as "10%"), so an
+export can be fed back through `app.importer`.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import database, models, readmodels, search
+
+DEFAULT_CHUNK_SIZE = 1000
+
+EXPORT_FIELDS = list(readmodels.columns(readmodels.ExportRow))
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+
+def _export_query(user_id: int, is_active: Optional[bool], search_term: Optional[str], dialect_name: str):
+    JA = models.JobApplication
+    query = select(*(getattr(JA, name) for name in EXPORT_FIELDS)).where(JA.user_id == user_id)
+    if is_active is not None:
+        query = query.where(JA.is_active == is_active)
+    if search_term and search_term.strip():
+        query, _ = search.apply_search(query, search_term, dialect_name, user_id)
+    return query.order_by(JA.application_date.desc().nulls_first(), JA.id.desc())
+
+
+class ExportChunk(NamedTuple):
+    rows: List[readmodels.ExportRow]
+    # Each row's notes, newest first, when notes were requested
+    notes: Optional[Dict[int, List[readmodels.NoteItem]]] = None
+
+
+async def _notes_by_application(db: AsyncSession, user_id: int, application_ids: Sequence[int]) -> Dict[int, List[readmodels.NoteItem]]:
+    notes: Dict[int, List[readmodels.NoteItem]] = {application_id: [] for application_id in application_ids}
+    Note = models.Note
+    result = await readmodels.execute(
+        db,
+        select(Note.id, Note.application_id, Note.content, Note.created_at)
+        .where(Note.user_id == user_id, Note.application_id.in_(application_ids))
+        .order_by(Note.application_id, Note.id.desc())
+    )
+    for note in readmodels.to_records(readmodels.NoteItem, result):
+        notes[note.application_id].append(note)
+    return notes
+
+
+async def iter_export_chunks(
+    db: AsyncSession,
+    user_id: int,
+    is_active: Optional[bool] = None,
+    search_term: Optional[str] = None,
+    include_notes: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[ExportChunk]:
+    """Yield chunks of at most `chunk_size` application records, streamed from a server-side cursor."""
+    query = _export_query(user_id, is_active, search_term, db.get_bind().dialect.name)
+    connection = await db.connection()
+    result = await connection.stream(query.execution_options(yield_per=chunk_size))
+    async for partition in result.partitions(chunk_size):
+        rows = readmodels.to_records(readmodels.ExportRow, partition)
+        notes = await _notes_by_application(db, user_id, [row.id for row in rows]) if include_notes else None
+        yield ExportChunk(rows, notes)
+
+
+def _format_value(name: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if name == "bonus":
+        return f"{value * 100:g}%"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _csv_value(name: str, value: Any) -> str:
+    value = _format_value(name, value)
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _note_text(note: readmodels.NoteItem) -> str:
+    stamp = note.created_at.isoformat(sep=" ", timespec="seconds") if note.created_at else ""
+    return f"[{stamp}] {note.content}" if stamp else note.content
+
+
+def serialize_csv_chunk(chunk: ExportChunk, include_notes: bool, header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    fields = EXPORT_FIELDS + (["notes"] if include_notes else [])
+    if header:
+        writer.writerow(fields)
+    for row in chunk.rows:
+        # Records hold their values in EXPORT_FIELDS order
+        values = [_csv_value(name, value) for name, value in zip(EXPORT_FIELDS, row)]
+        if include_notes:
+            values.append("\n".join(_note_text(note) for note in chunk.notes[row.id]))
+        writer.writerow(values)
+    return buffer.getvalue().encode("utf-8")
+
+
+def serialize_ndjson_chunk(chunk: ExportChunk, include_notes: bool) -> bytes:
+    lines = []
+    for row in chunk.rows:
+        record = {name: _format_value(name, value) for name, value in zip(EXPORT_FIELDS, row)}
+        if include_notes:
+            record["notes"] = [
+                {"id": n.id, "content": n.content, "created_at": _format_value("created_at", n.created_at)}
+                for n in chunk.notes[row.id]
+            ]
+        lines.append(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+    return ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+
+async def stream_export(
+    fmt: str,
+    user_id: int,
+    is_active: Optional[bool] = None,
+    search_term: Optional[str] = None,
+    include_notes: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    primary: bool = False,
+) -> AsyncIterator[bytes]:
+    # Owns its session: the response body is produced after the request's
+    # dependencies may already have been torn down. Read from a replica unless
+    # the client has just written (`primary`).
+    async with await database.open_read_session(primary=primary) as db:
+        if fmt == "csv":
+            # Header goes out immediately, even for an empty export
+            yield serialize_csv_chunk(ExportChunk([]), include_notes, header=True)
+        async for chunk in iter_export_chunks(db, user_id, is_active, search_term, include_notes, chunk_size):
+            if fmt == "csv":
+                yield serialize_csv_chunk(chunk, include_notes, header=False)
+            else:
+                yield serialize_ndjson_chunk(chunk, include_notes)
@@ -0,0 +1,208 @@
+"""
+Streaming bulk import of job applications from CSV or NDJSON.
+
+Records are parsed lazily from the input stream, coerced with the same rules as
+the "Add New Job Application" form (see app/coercion.py), deduplicated on a
+normalized (company, role, url) key and written in batches: one existence query
+and one multi-row INSERT per batch, so memory stays bounded by the batch size.
+
+Command line usage (inside the web container):
+
+    python -m app.importer applications.csv
+    python -m app.importer export.ndjson --batch-size 1000 --user alice
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import coercion, crud, models, schemas, users
+
+DEFAULT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+FORMATS = ("csv", "ndjson")
+
+DedupKey = Tuple[str, str, str]
+
+_WHITESPACE_RE = re.compile(f"[{re.escape(models.WHITESPACE)}]+")
+
+
+@dataclass
+class ImportReport:
+    rows_read: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+
+# --- Parsing ---
+
+def iter_csv_records(stream: TextIO) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (line number, row) from a CSV with a header row named after the application fields."""
+    reader = csv.DictReader(stream)
+    for row in reader:
+        header_keys = {(k or "").strip().lower(): v for k, v in row.items()}
+        yield reader.line_num, header_keys
+
+
+def iter_ndjson_records(stream: TextIO) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, {"__error__": f"Invalid JSON: {e.msg}"}
+            continue
+        if not isinstance(record, dict):
+            yield line_number, {"__error__": "Each line must be a JSON object"}
+            continue
+        yield line_number, record
+
+
+def iter_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    if fmt == "csv":
+        return iter_csv_records(stream)
+    if fmt == "ndjson":
+        return iter_ndjson_records(stream)
+    raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def detect_format(filename: Optional[str]) -> str:
+    extension = os.path.splitext(filename or "")[1].lower()
+    return "ndjson" if extension in (".ndjson", ".jsonl") else "csv"
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# --- Deduplication ---
+
+def _normalize_text(value: Optional[str]) -> str:
+    # Exactly what models.normalized_name does in SQL to stored rows: the same whitespace,
+    # and lower() rather than casefold() so keys agree with SQL lower()
+    return _WHITESPACE_RE.sub(" ", value or "").strip(" ").lower()
+
+
+def _normalize_url(value: Optional[str]) -> str:
+    url = (value or "").strip().lower()
+    for prefix in ("https://", "http://"):
+        if url.startswith(prefix):
+            url = url[len(prefix):]
+            break
+    if url.startswith("www."):
+        url = url[4:]
+    return url.rstrip("/")
+
+
+def dedup_key(company_name: Optional[str], role: Optional[str], url: Any) -> DedupKey:
+    return (_normalize_text(company_name), _normalize_text(role), _normalize_url(str(url) if url else None))
+
+
+async def existing_keys(db: AsyncSession, user_id: int, candidates: Set[DedupKey]) -> Set[DedupKey]:
+    """Which of `candidates` the user already has; one query per batch via ix_job_applications_user_company_name_key."""
+    if not candidates:
+        return set()
+    JA = models.JobApplication
+    companies = {company for company, _, _ in candidates}
+    result = await db.execute(
+        select(JA.company_name, JA.role, JA.url).where(JA.user_id == user_id, models.normalized_name(JA.company_name).in_(companies))
+    )
+    stored = {dedup_key(*row) for row in result}
+    return candidates & stored
+
+
+# --- Pipeline ---
+
+async def import_records(
+    db: AsyncSession,
+    user_id: int,
+    records: Iterable[Tuple[int, Dict[str, Any]]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportReport:
+    report = ImportReport()
+    for batch in batched(records, batch_size):
+        pending: Dict[DedupKey, schemas.JobApplicationCreate] = {}
+        for line, record in batch:
+            report.rows_read += 1
+            if "__error__" in record:
+                report.add_error(line, record["__error__"])
+                continue
+            try:
+                application = coercion.application_from_fields(record, strict=True)
+            except (ValueError, ValidationError) as e:
+                report.add_error(line, str(e))
+                continue
+            key = dedup_key(application.company_name, application.role, application.url)
+            if key in pending:
+                report.duplicates += 1
+                continue
+            pending[key] = application
+
+        # Earlier batches are already committed, so this also catches duplicates across batches
+        already_stored = await existing_keys(db, user_id, set(pending))
+        report.duplicates += len(already_stored)
+        to_insert = [application for key, application in pending.items() if key not in already_stored]
+        created = await crud.create_job_applications(db, user_id, to_insert)
+        report.inserted += len(created)
+    return report
+
+
+async def import_stream(
+    db: AsyncSession, user_id: int, stream: TextIO, fmt: str, batch_size: int = DEFAULT_BATCH_SIZE
+) -> ImportReport:
+    return await import_records(db, user_id, iter_records(stream, fmt), batch_size=batch_size)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import job applications from CSV or NDJSON.")
+    parser.add_argument("path", help="File to import, or - for stdin")
+    parser.add_argument("--format", choices=FORMATS, help="Input format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--user", default=users.DEFAULT_USERNAME, help="Owner of the imported applications")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or detect_format(args.path)
+
+    async def run() -> ImportReport:
+        from . import database
+
+        database.init_engine()
+        try:
+            async with database.AsyncSessionLocal() as db:
+                user_id = await users.user_id_for(db, args.user)
+                if user_id is None:
+                    sys.exit(f"Unknown user {args.user!r}; create it with python -m app.users add")
+                if args.path == "-":
+                    return await import_stream(db, user_id, sys.stdin, fmt, args.batch_size)
+                with open(args.path, encoding="utf-8-sig", newline="") as stream:
+                    return await import_stream(db, user_id, stream, fmt, args.batch_size)
+        finally:
+            await database.dispose_engine()
+
+    report = asyncio.run(run())
+    print(json.dumps(report.__dict__, indent=2))
+    return 1 if report.failed and not report.inserted else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
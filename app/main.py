@@ -1,16 +1,20 @@
 from datetime import datetime
 from fastapi import FastAPI, Request, Depends, Form, HTTPException, Query
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, RedirectResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
-from typing import Optional
-from decimal import Decimal, InvalidOperation
-from pydantic import HttpUrl, ValidationError
-
-from . import crud, models, schemas, database
-from .database import get_db
+from typing import Dict, List, Optional
+
+from . import assets, coercion, conditional, crud, exporter, metrics, reminders, replicas, schemas, database, templating
+from .cache import application_topic, lists_topic, response_cache
+from .database import get_read_db, get_write_db
+from .pagination import InvalidCursor
+from .routers import activity as activity_router
+from .routers import applications as application_router
+from .routers import stats as stats_router
+from .routers import statuses as statuses_router
+from .templating import stream_template, templates
+from .users import get_user_id
 
 # Create database tables on startup
 # models.Base.metadata.create_all(bind=engine) # This will be handled by Alembic or a startup event
@@ -19,21 +23,39 @@ from .database import get_db
 async def lifespan(app: FastAPI):
     # Database tables are managed by Alembic migrations.
     # models.Base.metadata.create_all(bind=engine) # This line is removed
+    # Build the stylesheet if the templates changed since the last build, then compile
+    # (or load from the bytecode cache) every template before the first request
+    assets.ensure_built()
+    templating.precompile()
+    # One engine (and pool) per worker process, created after any fork
+    database.init_engine()
+    reminders.scheduler.start()
     yield
-    # Clean up resources if needed
+    # Runs once in-flight requests have finished on shutdown (SIGTERM drain)
+    await reminders.scheduler.stop()
+    await database.dispose_engine()
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(metrics.MetricsMiddleware)
+# After a write, the client's next reads go to the primary rather than a lagging replica
+app.add_middleware(replicas.ReadYourWritesMiddleware, replica_set=database.replica_set)
 
-# Mount static files (CSS, JS)
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
-
-# Setup Jinja2 templates
-templates = Jinja2Templates(directory="app/templates")
+# Mount static files (CSS, JS); hashed builds are served precompressed and cached forever
+app.mount("/static", assets.AssetFiles(directory=assets.STATIC_DIR), name="static")
 
 # --- HTML Routes ---
 
 @app.get("/", response_class=HTMLResponse)
-async def read_root(request: Request, db: AsyncSession = Depends(get_db), view: Optional[str] = "active", search: Optional[str] = Query(None)):
+async def read_root(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    user_id: int = Depends(get_user_id),
+    view: Optional[str] = "active",
+    search: Optional[str] = Query(None),
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+    status: Optional[int] = Query(None, ge=0, description="Status id from the facets; 0 for no status"),
+):
     current_is_active_filter: Optional[bool]
     if view == "active":
         current_is_active_filter = True
@@ -44,38 +66,271 @@ async def read_root(request: Request, db: AsyncSession = Depends(get_db), view:
     else: # Default to active
         current_is_active_filter = True
         view = "active"
+
+    page_key = ("index.html", user_id, view, search, status, after, before, str(request.base_url))
+    # Cheap probe first: a client holding the current page gets a 304 without the page query or a render
+    row_count, newest_change = await crud.get_job_application_list_version(db, user_id, is_active=current_is_active_filter)
+    # ETag only: deleting any row but the newest leaves max(updated_at) where it was
+    validators = conditional.validator_headers(
+        conditional.make_etag(*page_key, row_count, newest_change, datetime.now().year), None
+    )
+    if conditional.is_not_modified(request, validators["ETag"], None):
+        return conditional.not_modified_response(validators)
+    cache_key = _page_cache_key(validators)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return HTMLResponse(cached, headers=validators)
+    generations = response_cache.snapshot([lists_topic(user_id)])
     
-    applications = await crud.get_job_applications(db, skip=0, limit=100, is_active=current_is_active_filter, search_term=search)
+    try:
+        page = await crud.get_job_application_list(
+            db, user_id, is_active=current_is_active_filter, search_term=search, after=after, before=before, status_id=status
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid page cursor")
+    # Counts for the whole view and search, so every status stays selectable while one is
+    facets = await crud.get_status_facets(db, user_id, is_active=current_is_active_filter, search_term=search)
     
-    return templates.TemplateResponse(
+    # Streamed: the first rows go out while later ones are still rendering
+    return stream_template(
+        request,
         "index.html",
-        {"request": request, "applications": applications, "current_year": datetime.now().year, "current_view": view, "search_term": search}
+        {
+            "applications": page.items, "page": page, "facets": facets, "current_status": status,
+            "current_year": datetime.now().year, "current_view": view, "search_term": search,
+        },
+        headers=validators, cache_key=_cache_key_for(db, cache_key), generations=generations,
     )
 
 @app.get("/inactive", response_class=HTMLResponse)
-async def read_inactive_applications(request: Request, db: AsyncSession = Depends(get_db), search: Optional[str] = Query(None)):
-    applications = await crud.get_job_applications(db, skip=0, limit=100, is_active=False, search_term=search)
-    return templates.TemplateResponse(
+async def read_inactive_applications(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    user_id: int = Depends(get_user_id),
+    search: Optional[str] = Query(None),
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+):
+    page_key = ("inactive_applications.html", user_id, search, after, before, str(request.base_url))
+    row_count, newest_change = await crud.get_job_application_list_version(db, user_id, is_active=False)
+    # ETag only: deleting any row but the newest leaves max(updated_at) where it was
+    validators = conditional.validator_headers(
+        conditional.make_etag(*page_key, row_count, newest_change, datetime.now().year), None
+    )
+    if conditional.is_not_modified(request, validators["ETag"], None):
+        return conditional.not_modified_response(validators)
+    cache_key = _page_cache_key(validators)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return HTMLResponse(cached, headers=validators)
+    generations = response_cache.snapshot([lists_topic(user_id)])
+
+    try:
+        page = await crud.get_job_application_list(db, user_id, is_active=False, search_term=search, after=after, before=before)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid page cursor")
+    return stream_template(
+        request,
         "inactive_applications.html",
-        {"request": request, "applications": applications, "current_year": datetime.now().year, "search_term": search}
+        {"applications": page.items, "page": page, "current_year": datetime.now().year, "search_term": search},
+        headers=validators, cache_key=_cache_key_for(db, cache_key), generations=generations,
+    )
+
+def _page_cache_key(validators: Dict[str, str]) -> str:
+    # Cached pages are keyed by their ETag, which covers the page parameters and the probed
+    # row versions: an entry is only ever served for the version it was rendered from, even
+    # when a write on another worker never reached this worker's invalidation broker
+    return validators["ETag"]
+
+def _cache_key_for(db: AsyncSession, cache_key: str) -> Optional[str]:
+    # A page read from a lagging replica may predate a write whose invalidation it
+    # was snapshotted after, so only pages read from the primary are stored
+    return None if database.is_replica(db) else cache_key
+
+def _view_filter(view: Optional[str]) -> Optional[bool]:
+    return {"active": True, "inactive": False, "all": None}.get(view, True)
+
+@app.get("/export.{fmt}")
+async def export_applications(
+    request: Request,
+    fmt: str,
+    view: Optional[str] = "all",
+    search: Optional[str] = Query(None),
+    notes: bool = Query(False),
+    user_id: int = Depends(get_user_id),
+):
+    if fmt not in exporter.MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail="Unknown export format")
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return StreamingResponse(
+        exporter.stream_export(
+            fmt, user_id, is_active=_view_filter(view), search_term=search, include_notes=notes,
+            primary=replicas.pins_primary(request.cookies),
+        ),
+        media_type=exporter.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="applications_{stamp}.{fmt}"'},
     )
 
 @app.get("/applications/{application_id}", response_class=HTMLResponse)
 async def read_application_detail(
-    request: Request, application_id: int, db: AsyncSession = Depends(get_db)
+    request: Request,
+    application_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    user_id: int = Depends(get_user_id),
+    notes_after: Optional[str] = Query(None),
 ):
-    application = await crud.get_job_application(db, application_id=application_id)
+    page_key = ("application_detail.html", user_id, application_id, notes_after, str(request.base_url))
+    row_version = await crud.get_job_application_version(db, user_id, application_id)
+    if row_version is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    last_modified, version = row_version
+    validators = conditional.validator_headers(
+        conditional.make_etag(*page_key, version, last_modified, datetime.now().year), last_modified
+    )
+    if conditional.is_not_modified(request, validators["ETag"], last_modified):
+        return conditional.not_modified_response(validators)
+    cache_key = _page_cache_key(validators)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return HTMLResponse(cached, headers=validators)
+    generations = response_cache.snapshot([application_topic(application_id)])
+
+    # The application without its notes, then one bounded page of notes
+    application = await crud.get_job_application(db, user_id, application_id=application_id)
     if application is None:
         raise HTTPException(status_code=404, detail="Application not found")
-    notes = await crud.get_notes_for_application(db, application_id=application_id)
-    return templates.TemplateResponse(
+    try:
+        notes_page = await crud.get_notes_page(db, user_id, application_id, after=notes_after)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid page cursor")
+    response = templates.TemplateResponse(
+        request,
         "application_detail.html",
-        {"request": request, "application": application, "notes": notes, "current_year": datetime.now().year}
+        {"application": application, "notes_page": notes_page, "notes_after": notes_after, "current_year": datetime.now().year}
+    )
+    response.headers.update(validators)
+    if not database.is_replica(db):
+        response_cache.set(cache_key, response.body, generations)
+    return response
+
+@app.get("/applications/{application_id}/notes", response_class=HTMLResponse)
+async def read_application_notes(
+    request: Request,
+    application_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    user_id: int = Depends(get_user_id),
+    after: Optional[str] = Query(None),
+):
+    """HTML fragment with the next page of notes, loaded on demand by the detail page."""
+    row_version = await crud.get_job_application_version(db, user_id, application_id)
+    if row_version is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    last_modified, version = row_version
+    validators = conditional.validator_headers(
+        conditional.make_etag("_notes_page.html", user_id, application_id, after, str(request.base_url), version, last_modified),
+        last_modified,
+    )
+    if conditional.is_not_modified(request, validators["ETag"], last_modified):
+        return conditional.not_modified_response(validators)
+    try:
+        notes_page = await crud.get_notes_page(db, user_id, application_id, after=after)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid page cursor")
+    response = templates.TemplateResponse(
+        request, "_notes_page.html", {"notes_page": notes_page, "application_id": application_id}
+    )
+    response.headers.update(validators)
+    return response
+
+def _time_bound(value: Optional[str], name: str) -> Optional[datetime]:
+    # The activity form submits empty fields; anything else must be an ISO date or datetime
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} (expected YYYY-MM-DD or an ISO datetime)")
+
+@app.get("/activity", response_class=HTMLResponse)
+async def read_activity(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    user_id: int = Depends(get_user_id),
+    since: Optional[str] = Query(None),
+    until: Optional[str] = Query(None),
+    after: Optional[str] = Query(None),
+    before: Optional[str] = Query(None),
+):
+    """Notes from all the user's applications, newest first, optionally within [since, until)."""
+    since_at, until_at = _time_bound(since, "since"), _time_bound(until, "until")
+    page_key = ("activity.html", user_id, since, until, after, before, str(request.base_url))
+    # Any note write touches its application and deletes change the row count,
+    # so the user's all-applications list version also versions the feed
+    row_count, newest_change = await crud.get_job_application_list_version(db, user_id, is_active=None)
+    # ETag only: deleting any row but the newest leaves max(updated_at) where it was
+    validators = conditional.validator_headers(
+        conditional.make_etag(*page_key, row_count, newest_change, datetime.now().year), None
+    )
+    if conditional.is_not_modified(request, validators["ETag"], None):
+        return conditional.not_modified_response(validators)
+    cache_key = _page_cache_key(validators)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return HTMLResponse(cached, headers=validators)
+    generations = response_cache.snapshot([lists_topic(user_id)])
+
+    try:
+        page = await crud.get_activity_page(db, user_id, since=since_at, until=until_at, after=after, before=before)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid page cursor")
+    return stream_template(
+        request,
+        "activity.html",
+        {"page": page, "since": since or "", "until": until or "", "current_year": datetime.now().year},
+        headers=validators, cache_key=_cache_key_for(db, cache_key), generations=generations,
+    )
+
+@app.get("/stats", response_class=HTMLResponse)
+async def read_stats(
+    request: Request, db: AsyncSession = Depends(get_read_db), user_id: int = Depends(get_user_id)
+):
+    """Pipeline dashboard, drawn from the user's precomputed counters in application_stats."""
+    pipeline = await crud.get_pipeline_stats(db, user_id)
+    # Reading the counters is as cheap as any version probe, so the ETag is taken over them
+    validators = conditional.validator_headers(
+        conditional.make_etag("stats.html", user_id, pipeline.model_dump_json(), str(request.base_url), datetime.now().year), None
+    )
+    if conditional.is_not_modified(request, validators["ETag"], None):
+        return conditional.not_modified_response(validators)
+    response = templates.TemplateResponse(
+        request, "stats.html", {"stats": pipeline, "current_year": datetime.now().year}
+    )
+    response.headers.update(validators)
+    return response
+
+@app.get("/upcoming", response_class=HTMLResponse)
+async def read_upcoming(
+    request: Request, db: AsyncSession = Depends(get_read_db), user_id: int = Depends(get_user_id)
+):
+    """Interviews in the next two weeks, follow-ups that are due, and the reminders sent lately."""
+    # Due-ness moves with the clock, so this page is neither cached nor versioned
+    return templates.TemplateResponse(
+        request,
+        "upcoming.html",
+        {
+            "interviews": await crud.get_upcoming_interviews(db, user_id),
+            "follow_ups": await crud.get_follow_ups_due(db, user_id),
+            "recent_reminders": await crud.get_recent_reminders(db, user_id),
+            "upcoming_days": crud.UPCOMING_DAYS,
+            "follow_up_days": reminders.FOLLOW_UP_DAYS,
+            "current_year": datetime.now().year,
+        },
     )
 
 @app.post("/applications/new", response_class=RedirectResponse)
 async def create_new_application(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
+    user_id: int = Depends(get_user_id),
     company_name: str = Form(...),
     role: str = Form(...),
     application_date: Optional[str] = Form(None),
@@ -92,97 +347,45 @@ async def create_new_application(
     health_coverage: bool = Form(False),
     pto: Optional[str] = Form(None)
 ):
-    from datetime import date as py_date
-    from decimal import Decimal, InvalidOperation
-    from pydantic import HttpUrl, ValidationError
-
-    # Helper to convert empty strings to None for optional fields
-    def empty_str_to_none(value: Optional[str]) -> Optional[str]:
-        return None if value == "" else value
-
-    status = empty_str_to_none(status)
-    contact_person = empty_str_to_none(contact_person)
-    phone = empty_str_to_none(phone)
-    pto = empty_str_to_none(pto)
-    # url, salary, bonus are handled slightly differently below due to type conversion
-
-    parsed_application_date = None
-    if application_date and application_date.strip():
-        try:
-            parsed_application_date = py_date.fromisoformat(application_date.strip())
-        except ValueError:
-            # Consider raising HTTPException or adding to an error list
-            pass
-
-    parsed_interview_date = None
-    if interview_date and interview_date.strip():
-        try:
-            parsed_interview_date = py_date.fromisoformat(interview_date.strip())
-        except ValueError:
-            pass
-
-    parsed_salary = None
-    if salary and salary.strip():
-        try:
-            parsed_salary = Decimal(salary.strip())
-        except InvalidOperation:
-            pass 
-
-    parsed_bonus = None
-    if bonus and bonus.strip():
-        try:
-            bonus_val_str = bonus.strip().rstrip('%')
-            if bonus_val_str:
-                parsed_bonus = float(bonus_val_str) / 100.0
-        except ValueError:
-            pass
-            
-    validated_url_str = None
-    if url and url.strip():
-        try:
-            # Validate first
-            pydantic_url = HttpUrl(url.strip())
-            # Convert to string for DB
-            validated_url_str = str(pydantic_url)
-        except ValidationError:
-            pass 
-
-    application_data = schemas.JobApplicationCreate(
-        company_name=company_name,
-        role=role,
-        application_date=parsed_application_date,
-        status=status,
-        contact_person=contact_person,
-        phone=phone,
-        url=validated_url_str, # Pass the string representation
-        cover_letter=cover_letter,
-        interview_date=parsed_interview_date,
-        offer=offer,
-        salary=parsed_salary,
-        equity=equity,
-        bonus=parsed_bonus,
-        health_coverage=health_coverage,
-        pto=pto
-    )
-    await crud.create_job_application(db=db, application=application_data)
+    # Same coercion rules as the bulk importer: unparseable optional values are dropped
+    application_data = coercion.application_from_fields({
+        "company_name": company_name,
+        "role": role,
+        "application_date": application_date,
+        "status": status,
+        "contact_person": contact_person,
+        "phone": phone,
+        "url": url,
+        "cover_letter": cover_letter,
+        "interview_date": interview_date,
+        "offer": offer,
+        "salary": salary,
+        "equity": equity,
+        "bonus": bonus,
+        "health_coverage": health_coverage,
+        "pto": pto,
+    })
+    await crud.create_job_application(db=db, user_id=user_id, application=application_data)
     return RedirectResponse(url="/", status_code=303)
 
 @app.get("/applications/{application_id}/edit", response_class=HTMLResponse)
 async def edit_application_form(
-    request: Request, application_id: int, db: AsyncSession = Depends(get_db)
+    request: Request, application_id: int, db: AsyncSession = Depends(get_read_db), user_id: int = Depends(get_user_id)
 ):
-    application = await crud.get_job_application(db, application_id=application_id)
+    application = await crud.get_job_application(db, user_id, application_id=application_id)
     if application is None:
         raise HTTPException(status_code=404, detail="Application not found")
     return templates.TemplateResponse(
+        request,
         "edit_application.html",
-        {"request": request, "application": application, "current_year": datetime.now().year}
+        {"application": application, "current_year": datetime.now().year}
     )
 
 @app.post("/applications/{application_id}/edit", response_class=RedirectResponse)
 async def update_application_submit(
     application_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
+    user_id: int = Depends(get_user_id),
     company_name: str = Form(...),
     role: str = Form(...),
     application_date: Optional[str] = Form(None),
@@ -199,64 +402,29 @@ async def update_application_submit(
     health_coverage: bool = Form(False),
     pto: Optional[str] = Form(None)
 ):
-    from datetime import date as py_date
-    from decimal import Decimal, InvalidOperation
-    from pydantic import HttpUrl, ValidationError
-
-    # Helper to convert empty strings to None for optional fields
-    def empty_str_to_none(value: Optional[str]) -> Optional[str]:
-        return None if value == "" else value
-
-    db_application = await crud.get_job_application(db, application_id=application_id)
+    db_application = await crud.get_job_application(db, user_id, application_id=application_id)
     if db_application is None:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    parsed_application_date = db_application.application_date
-    if application_date is not None: # Check if field was submitted
-        if application_date.strip() == "": parsed_application_date = None
-        else: 
-            try: parsed_application_date = py_date.fromisoformat(application_date.strip())
-            except ValueError: pass # Keep existing if parse fails but was submitted
-    
-    parsed_interview_date = db_application.interview_date
-    if interview_date is not None:
-        if interview_date.strip() == "": parsed_interview_date = None
-        else:
-            try: parsed_interview_date = py_date.fromisoformat(interview_date.strip())
-            except ValueError: pass
-
-    parsed_salary = db_application.salary
-    if salary is not None:
-        if salary.strip() == "": parsed_salary = None
-        else:
-            try: parsed_salary = Decimal(salary.strip())
-            except InvalidOperation: pass
-    
-    parsed_bonus = db_application.bonus
-    if bonus is not None:
-        if bonus.strip() == "": parsed_bonus = None
-        else:
-            try:
-                bonus_val_str = bonus.strip().rstrip('%')
-                if bonus_val_str: parsed_bonus = float(bonus_val_str) / 100.0
-            except ValueError: pass
-
-    validated_url_str = db_application.url
-    if url is not None:
-        if url.strip() == "": validated_url_str = None
-        else:
-            try: 
-                pydantic_url = HttpUrl(url.strip())
-                validated_url_str = str(pydantic_url)
-            except ValidationError: pass
+    # A submitted blank clears the field; an unparseable value keeps the stored one
+    def submitted(parser, value, current):
+        if value is None: # Field not submitted
+            return current
+        return coercion.lenient(parser, value, default=current)
+
+    parsed_application_date = submitted(coercion.parse_date, application_date, db_application.application_date)
+    parsed_interview_date = submitted(coercion.parse_date, interview_date, db_application.interview_date)
+    parsed_salary = submitted(coercion.parse_salary, salary, db_application.salary)
+    parsed_bonus = submitted(coercion.parse_bonus, bonus, db_application.bonus)
+    validated_url_str = submitted(coercion.parse_url, url, db_application.url)
 
     update_data = schemas.JobApplicationUpdate(
         company_name=company_name, 
         role=role,                 
         application_date=parsed_application_date,
-        status=empty_str_to_none(status),
-        contact_person=empty_str_to_none(contact_person),
-        phone=empty_str_to_none(phone),
+        status=coercion.empty_str_to_none(status),
+        contact_person=coercion.empty_str_to_none(contact_person),
+        phone=coercion.empty_str_to_none(phone),
         url=validated_url_str, # Pass the string representation or None
         cover_letter=cover_letter,
         interview_date=parsed_interview_date,
@@ -265,7 +433,7 @@ async def update_application_submit(
         equity=equity,
         bonus=parsed_bonus,
         health_coverage=health_coverage,
-        pto=empty_str_to_none(pto)
+        pto=coercion.empty_str_to_none(pto)
     )
 
     # Pydantic's exclude_unset=True is not what we want here if we want to allow clearing fields.
@@ -284,7 +452,7 @@ async def update_application_submit(
     # it won't be in the update_data if we constructed it from raw form fields.
     # By explicitly constructing JobApplicationUpdate with all form fields, we are making a choice for each.
 
-    updated_app = await crud.update_job_application(db=db, application_id=application_id, application_update=update_data)
+    updated_app = await crud.update_job_application(db=db, user_id=user_id, application_id=application_id, application_update=update_data)
     if updated_app is None:
         raise HTTPException(status_code=404, detail="Update failed or application not found")
 
@@ -294,49 +462,78 @@ async def update_application_submit(
 async def create_new_note_for_application(
     application_id: int,
     content: str = Form(...),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db),
+    user_id: int = Depends(get_user_id),
 ):
-    from datetime import datetime
-    now = datetime.now()
-    timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Prepend timestamp to the note content
-    final_content = f"[{timestamp}] -- {content}"
-    
-    note_data = schemas.NoteCreate(content=final_content)
-    await crud.create_note_for_application(db=db, note=note_data, application_id=application_id)
+    # The note's time is its created_at column (UTC), shown next to it by the templates
+    note_data = schemas.NoteCreate(content=content)
+    note = await crud.create_note_for_application(db=db, user_id=user_id, note=note_data, application_id=application_id)
+    if note is None:
+        raise HTTPException(status_code=404, detail="Application not found")
     return RedirectResponse(url=f"/applications/{application_id}", status_code=303)
 
 @app.post("/applications/{application_id}/activate", response_class=RedirectResponse)
 async def activate_application_route(
-    application_id: int, db: AsyncSession = Depends(get_db), source: Optional[str] = Form(None)
+    application_id: int,
+    db: AsyncSession = Depends(get_write_db),
+    user_id: int = Depends(get_user_id),
+    source: Optional[str] = Form(None),
 ):
-    await crud.activate_job_application(db, application_id=application_id)
+    await crud.activate_job_application(db, user_id, application_id=application_id)
     if source == "inactive_list":
         return RedirectResponse(url="/inactive", status_code=303)
     return RedirectResponse(url="/", status_code=303)
 
 @app.post("/applications/{application_id}/deactivate", response_class=RedirectResponse)
 async def deactivate_application_route(
-    application_id: int, db: AsyncSession = Depends(get_db)
+    application_id: int, db: AsyncSession = Depends(get_write_db), user_id: int = Depends(get_user_id)
 ):
-    await crud.deactivate_job_application(db, application_id=application_id)
+    await crud.deactivate_job_application(db, user_id, application_id=application_id)
     return RedirectResponse(url="/", status_code=303)
 
 @app.post("/applications/{application_id}/delete", response_class=RedirectResponse)
 async def delete_application_route(
-    application_id: int, db: AsyncSession = Depends(get_db), source: Optional[str] = Form(None)
+    application_id: int,
+    db: AsyncSession = Depends(get_write_db),
+    user_id: int = Depends(get_user_id),
+    source: Optional[str] = Form(None),
 ):
-    await crud.delete_job_application(db, application_id=application_id)
+    await crud.delete_job_application(db, user_id, application_id=application_id)
     if source == "inactive_list":
         return RedirectResponse(url="/inactive", status_code=303)
     return RedirectResponse(url="/", status_code=303)
 
-# Placeholder for API routes if you want to separate them later
-# from .routers import applications as application_router
-# app.include_router(application_router.router, prefix="/api")
+@app.post("/applications/bulk", response_class=RedirectResponse)
+async def bulk_application_state_route(
+    db: AsyncSession = Depends(get_write_db),
+    user_id: int = Depends(get_user_id),
+    ids: List[int] = Form([]),
+    action: str = Form(...),
+    source: Optional[str] = Form(None),
+    view: Optional[str] = Form(None),
+):
+    if action not in ("activate", "deactivate", "delete"):
+        raise HTTPException(status_code=400, detail="Unknown bulk action")
+    # One UPDATE/DELETE for the whole selection
+    await crud.set_job_applications_state(db, user_id, ids, action)
+    if source == "inactive_list":
+        return RedirectResponse(url="/inactive", status_code=303)
+    if view in ("inactive", "all"):
+        return RedirectResponse(url=f"/?view={view}", status_code=303)
+    return RedirectResponse(url="/", status_code=303)
+
+# JSON API
+app.include_router(application_router.router, prefix="/api")
+app.include_router(activity_router.router, prefix="/api")
+app.include_router(stats_router.router, prefix="/api")
+app.include_router(statuses_router.router, prefix="/api")
 
 # Simple health check
 @app.get("/health")
 async def health_check():
-    return {"status": "ok"} 
\ No newline at end of file
+    return {"status": "ok"}
+
+# Prometheus scrape target (per worker process)
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE) 
\ No newline at end of file
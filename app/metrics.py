@@ -0,0 +1,369 @@
+"""
+In-process metrics in the Prometheus text exposition format, served at /metrics.
+
+Nothing external is required: counters, gauges and histograms live in this
+process and are rendered on scrape. With several worker processes each worker
+reports its own values, so scrape them individually (or aggregate by instance).
+
+Instrumented:
+- every HTTP request, by route template (`MetricsMiddleware`)
+- every SQL statement, by operation, plus statements issued per request
+  (`instrument_engine`, through SQLAlchemy engine events)
+- time spent waiting for a pool connection, and connections in use
+- Jinja template render time, rendered whole or streamed (`TimedTemplate`)
+- reminders sent (`app/reminders.py`)
+"""
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from jinja2 import Template
+from sqlalchemy import event
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+FAST_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class Gauge(_Metric):
+    """A gauge set explicitly, or read from `function` at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, *args, function: Optional[Callable[[], float]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self._function = function
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        if self._function is not None:
+            yield "", "", self._function()
+            return
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> [per-bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                yield "_bucket", labels, cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield "_sum", labels, state[-2]
+            yield "_count", labels, state[-1]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route template, method and status.", ("method", "route", "status")))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")))
+HTTP_IN_PROGRESS = REGISTRY.register(Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served."))
+DB_STATEMENT_LATENCY = REGISTRY.register(Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time by operation.", ("operation",), buckets=FAST_BUCKETS))
+DB_STATEMENT_ERRORS = REGISTRY.register(Counter(
+    "db_statement_errors_total", "SQL statements that raised, by operation.", ("operation",)))
+DB_QUERIES_PER_REQUEST = REGISTRY.register(Histogram(
+    "db_queries_per_request", "SQL statements issued while serving one HTTP request.", ("route",), buckets=COUNT_BUCKETS))
+DB_READ_SESSIONS = REGISTRY.register(Counter(
+    "db_read_sessions_total", "Read sessions opened, by where they went (replica, primary, fallback).", ("target",)))
+DB_POOL_WAIT = REGISTRY.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a connection from the pool.", buckets=FAST_BUCKETS))
+REMINDERS_FIRED = REGISTRY.register(Counter(
+    "reminders_fired_total", "Reminders sent by this worker, by kind (interview, follow_up).", ("kind",)))
+TEMPLATE_RENDER = REGISTRY.register(Histogram(
+    "template_render_duration_seconds", "Jinja template render time by template.", ("template",), buckets=FAST_BUCKETS))
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# --- HTTP ---
+
+# Statement counters active in the current context, innermost last. Mutable
+# holders rather than ints so engine events, which run in SQLAlchemy's greenlet
+# with a copy of this context, update the same objects the caller reads.
+_query_counters: ContextVar[Tuple[List[int], ...]] = ContextVar("query_counters", default=())
+
+
+@contextmanager
+def count_queries() -> Iterator[List[int]]:
+    """Count SQL statements issued inside the block: `with count_queries() as n: ...; n[0]`. Nests."""
+    counter = [0]
+    token = _query_counters.set(_query_counters.get() + (counter,))
+    try:
+        yield counter
+    finally:
+        _query_counters.reset(token)
+
+
+def _route_label(scope) -> str:
+    # The route template ("/applications/{application_id}"), never the raw path,
+    # so label cardinality stays bounded
+    route = getattr(scope.get("route"), "path", None)
+    if route:
+        # A route reached through include_router(prefix=...) may carry only its own path,
+        # so put back the leading segments of the request path that the template doesn't
+        # cover (include prefixes are literal); for other routes that part is empty
+        path = scope.get("path", "")
+        path = path[len(scope.get("root_path", "")):] if path.startswith(scope.get("root_path", "")) else path
+        segments = path.split("/")
+        return "/".join(segments[:max(len(segments) - route.count("/"), 1)]) + route
+    # Mounted apps (/static) only leave their prefix behind, in root_path
+    mount = scope.get("root_path", "")[len(scope.get("app_root_path", "")):]
+    return mount or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: request count, latency and SQL statement count per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            with count_queries() as queries:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_PROGRESS.inc(-1)
+            route = _route_label(scope)
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status_holder["status"]))
+            HTTP_LATENCY.observe(elapsed, method=method, route=route)
+            DB_QUERIES_PER_REQUEST.observe(queries[0], route=route)
+
+
+
+# --- SQL ---
+
+_OPERATION_RE = re.compile(r"^\s*(\w+)")
+_TIMER_KEY = "metrics_statement_start"
+
+
+def _operation(statement: str) -> str:
+    match = _OPERATION_RE.match(statement)
+    return match.group(1).upper() if match else "OTHER"
+
+
+def _timed_pool_class(base: type) -> type:
+    """A subclass of the engine's pool that times how long checkouts wait for a connection."""
+
+    class TimedPool(base):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+    TimedPool.__name__ = f"Timed{base.__name__}"
+    return TimedPool
+
+
+def instrument_engine(engine, pool_gauges: bool = True) -> None:
+    """
+    Attach statement timing, per-request query counting and pool metrics to an
+    (async) engine. The pool gauges describe one engine, the primary's; read
+    replicas pass `pool_gauges=False`.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_TIMER_KEY, []).append(time.perf_counter())
+        for counter in _query_counters.get():
+            counter[0] += 1
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info[_TIMER_KEY].pop()
+        DB_STATEMENT_LATENCY.observe(time.perf_counter() - start, operation=_operation(statement))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_TIMER_KEY):
+            conn.info[_TIMER_KEY].pop()
+        DB_STATEMENT_ERRORS.inc(operation=_operation(exception_context.statement or ""))
+
+    # Swap in a timing subclass of whatever pool the dialect chose, instead of
+    # passing poolclass= and second-guessing that choice. Pool.recreate()
+    # (engine.dispose()) builds from self.__class__, so the timing survives it.
+    pool = sync_engine.pool
+    pool.__class__ = _timed_pool_class(type(pool))
+
+    if not pool_gauges:
+        return
+    REGISTRY.register(Gauge(
+        "db_pool_connections_in_use", "Connections currently checked out of the pool.",
+        function=lambda: sync_engine.pool.checkedout() if hasattr(sync_engine.pool, "checkedout") else 0))
+    REGISTRY.register(Gauge(
+        "db_pool_size", "Configured pool size (0 when the pool is unbounded or not a queue pool).",
+        function=lambda: sync_engine.pool.size() if hasattr(sync_engine.pool, "size") else 0))
+    REGISTRY.register(Gauge(
+        "db_pool_overflow", "Connections currently open beyond the pool size.",
+        function=lambda: sync_engine.pool.overflow() if hasattr(sync_engine.pool, "overflow") else 0))
+
+
+# --- Templates ---
+
+class TimedTemplate(Template):
+    """Template class that records render time; install with `environment.template_class = TimedTemplate`."""
+
+    def render(self, *args, **kwargs) -> str:
+        start = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            TEMPLATE_RENDER.observe(time.perf_counter() - start, template=self.name or "<string>")
+
+    def generate(self, *args, **kwargs) -> Iterator[str]:
+        # Only time spent producing output counts, not time the consumer holds each piece
+        elapsed = 0.0
+        pieces = super().generate(*args, **kwargs)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    piece = next(pieces)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - start
+                yield piece
+        finally:
+            TEMPLATE_RENDER.observe(elapsed, template=self.name or "<string>")
@@ -11,14 +11,16 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
+# Leave loggers configured by the caller (e.g. app.preflight) enabled.
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 from app.models import Base
+from app.preflight import sync_url
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
@@ -61,13 +63,17 @@ def do_run_migrations(connection: Connection) -> None:
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
 
+    # app.preflight passes the connection it already holds
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
     # Check if URL contains asyncpg and use sync engine instead
     ini_section = config.get_section(config.config_ini_section, {})
     
-    # If URL uses asyncpg, replace it with psycopg2 for synchronous operation
-    url = ini_section.get('sqlalchemy.url', '')
-    if '+asyncpg' in url:
-        ini_section['sqlalchemy.url'] = url.replace('+asyncpg', '')
+    # If URL uses an async driver, swap in the sync one (psycopg2 / pysqlite)
+    ini_section['sqlalchemy.url'] = sync_url(ini_section.get('sqlalchemy.url', ''))
     
     connectable = engine_from_config(
         ini_section,
@@ -0,0 +1,159 @@
+"""keep search documents current without re-reading every note of an application
+
+Revision ID: 1b6f4e8a9d02
+Revises: f5a9d3c7e218
+Create Date: 2026-10-19 10:12:44.518302
+
+The search triggers from the search-indexes migration re-read and re-parse every
+note of an application whenever a note was added or a searched column was
+written, even with an unchanged value (as the status backfill does). Now:
+
+- a new note is appended to its application's document;
+- an application write that changes a searched column recomputes only those
+  columns and keeps the notes part of the document; other writes leave it alone;
+- editing or deleting a note (which can take words away) still rebuilds it.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b6f4e8a9d02'
+down_revision: Union[str, None] = 'f5a9d3c7e218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PG_APPLICATION_REFRESH = """
+CREATE OR REPLACE FUNCTION job_applications_search_vector_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    notes_part tsvector := ''::tsvector;
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF NEW.company_name IS NOT DISTINCT FROM OLD.company_name
+           AND NEW.role IS NOT DISTINCT FROM OLD.role
+           AND NEW.status IS NOT DISTINCT FROM OLD.status
+           AND NEW.contact_person IS NOT DISTINCT FROM OLD.contact_person THEN
+            RETURN NEW;
+        END IF;
+        -- Notes are the weight C part; kept first so their positions don't move when the names change
+        notes_part := ts_filter(coalesce(OLD.search_vector, ''::tsvector), '{c}');
+    END IF;
+    NEW.search_vector := notes_part
+        || setweight(to_tsvector('english', coalesce(NEW.company_name, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(NEW.role, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(NEW.status, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(NEW.contact_person, '')), 'B');
+    RETURN NEW;
+END
+$$
+"""
+
+PG_NOTES_REFRESH = """
+CREATE OR REPLACE FUNCTION notes_search_vector_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE job_applications j
+        SET search_vector = coalesce(j.search_vector, ''::tsvector)
+            || setweight(to_tsvector('english', coalesce(NEW.content, '')), 'C')
+        WHERE j.user_id = NEW.user_id AND j.id = NEW.application_id;
+        RETURN NULL;
+    END IF;
+    UPDATE job_applications j
+    SET search_vector = job_application_search_vector(j.id, j.company_name, j.role, j.status, j.contact_person)
+    WHERE j.user_id = OLD.user_id AND j.id = OLD.application_id;
+    IF TG_OP = 'UPDATE' AND NEW.application_id IS DISTINCT FROM OLD.application_id THEN
+        UPDATE job_applications j
+        SET search_vector = job_application_search_vector(j.id, j.company_name, j.role, j.status, j.contact_person)
+        WHERE j.user_id = NEW.user_id AND j.id = NEW.application_id;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+# What both did at the tenancy revision: every change rebuilds the whole document
+# (the note's, scoped to its user now that the tables lead with user_id)
+PG_APPLICATION_REFRESH_PREVIOUS = """
+CREATE OR REPLACE FUNCTION job_applications_search_vector_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := job_application_search_vector(NEW.id, NEW.company_name, NEW.role, NEW.status, NEW.contact_person);
+    RETURN NEW;
+END
+$$
+"""
+
+PG_NOTES_REFRESH_PREVIOUS = """
+CREATE OR REPLACE FUNCTION notes_search_vector_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    owner integer := CASE WHEN TG_OP = 'DELETE' THEN OLD.user_id ELSE NEW.user_id END;
+    target integer := CASE WHEN TG_OP = 'DELETE' THEN OLD.application_id ELSE NEW.application_id END;
+BEGIN
+    UPDATE job_applications j
+    SET search_vector = job_application_search_vector(j.id, j.company_name, j.role, j.status, j.contact_person)
+    WHERE j.user_id = owner AND j.id = target;
+    RETURN NULL;
+END
+$$
+"""
+
+SQLITE_TRIGGERS = {
+    'notes_fts_insert': """CREATE TRIGGER notes_fts_insert AFTER INSERT ON notes BEGIN
+        UPDATE job_applications_fts
+        SET notes = CASE WHEN notes = '' THEN new.content ELSE notes || ' ' || new.content END
+        WHERE rowid = new.application_id;
+    END""",
+    'job_applications_fts_update': """CREATE TRIGGER job_applications_fts_update
+    AFTER UPDATE OF company_name, role, status, contact_person ON job_applications
+    WHEN old.company_name IS NOT new.company_name OR old.role IS NOT new.role
+        OR old.status IS NOT new.status OR old.contact_person IS NOT new.contact_person
+    BEGIN
+        UPDATE job_applications_fts
+        SET company_name = new.company_name, role = new.role, status = new.status, contact_person = new.contact_person
+        WHERE rowid = new.id;
+    END""",
+}
+
+SQLITE_TRIGGERS_PREVIOUS = {
+    'notes_fts_insert': """CREATE TRIGGER notes_fts_insert AFTER INSERT ON notes BEGIN
+        UPDATE job_applications_fts
+        SET notes = (SELECT group_concat(content, ' ') FROM notes WHERE application_id = new.application_id)
+        WHERE rowid = new.application_id;
+    END""",
+    'job_applications_fts_update': """CREATE TRIGGER job_applications_fts_update
+    AFTER UPDATE OF company_name, role, status, contact_person ON job_applications BEGIN
+        UPDATE job_applications_fts
+        SET company_name = new.company_name, role = new.role, status = new.status, contact_person = new.contact_person
+        WHERE rowid = new.id;
+    END""",
+}
+
+
+def _replace_sqlite_triggers(triggers):
+    # Only where the search-indexes migration installed the FTS5 table (it may have been torn down)
+    for name, statement in triggers.items():
+        installed = op.get_bind().exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)
+        ).first()
+        if installed:
+            op.execute(f'DROP TRIGGER {name}')
+            op.execute(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        _replace_sqlite_triggers(SQLITE_TRIGGERS)
+        return
+    op.execute(PG_APPLICATION_REFRESH)
+    op.execute(PG_NOTES_REFRESH)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        _replace_sqlite_triggers(SQLITE_TRIGGERS_PREVIOUS)
+        return
+    op.execute(PG_APPLICATION_REFRESH_PREVIOUS)
+    op.execute(PG_NOTES_REFRESH_PREVIOUS)
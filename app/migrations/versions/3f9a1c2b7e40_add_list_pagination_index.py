@@ -0,0 +1,35 @@
+"""add list pagination index
+
+Revision ID: 3f9a1c2b7e40
+Revises: d8c1fbe847c7
+Create Date: 2026-10-18 09:12:31.418204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2b7e40'
+down_revision: Union[str, None] = 'd8c1fbe847c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Matches the list ordering (application_date DESC, id DESC) within each is_active partition,
+    # so keyset pagination is a single index range scan at any depth.
+    op.create_index(
+        'ix_job_applications_active_date_id',
+        'job_applications',
+        ['is_active', sa.text('application_date DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_applications_active_date_id', table_name='job_applications')
@@ -0,0 +1,75 @@
+"""add deleted_rows, tombstones written by delete triggers for incremental backups
+
+Revision ID: 4c8e2a7b5d19
+Revises: 1b6f4e8a9d02
+Create Date: 2026-10-19 11:03:52.774160
+
+An incremental backup replays the deletes recorded here since its base, instead
+of listing the id of every surviving row.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e2a7b5d19'
+down_revision: Union[str, None] = '1b6f4e8a9d02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = ('job_applications', 'notes', 'reminders')
+
+PG_RECORD_DELETE = """
+CREATE OR REPLACE FUNCTION record_deleted_row() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    -- The table comes in as an argument: on a partitioned table TG_TABLE_NAME is the partition
+    INSERT INTO deleted_rows (table_name, user_id, row_id, deleted_at) VALUES (TG_ARGV[0], OLD.user_id, OLD.id, now());
+    RETURN NULL;
+END
+$$
+"""
+
+# Millisecond stamps; SQLite's CURRENT_TIMESTAMP is whole seconds
+SQLITE_RECORD_DELETE = """CREATE TRIGGER {table}_record_delete AFTER DELETE ON {table} BEGIN
+        INSERT INTO deleted_rows (table_name, user_id, row_id, deleted_at)
+        VALUES ('{table}', old.user_id, old.id, strftime('%Y-%m-%d %H:%M:%f', 'now'));
+    END"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'deleted_rows',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_deleted_rows_table_name_deleted_at', 'deleted_rows', ['table_name', 'deleted_at'], unique=False)
+
+    if op.get_bind().dialect.name == 'sqlite':
+        for table in TRACKED_TABLES:
+            op.execute(SQLITE_RECORD_DELETE.format(table=table))
+        return
+    op.execute(PG_RECORD_DELETE)
+    for table in TRACKED_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_record_delete AFTER DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION record_deleted_row('{table}')
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    is_sqlite = op.get_bind().dialect.name == 'sqlite'
+    for table in TRACKED_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_record_delete' + ('' if is_sqlite else f' ON {table}'))
+    if not is_sqlite:
+        op.execute('DROP FUNCTION IF EXISTS record_deleted_row()')
+    op.drop_index('ix_deleted_rows_table_name_deleted_at', table_name='deleted_rows')
+    op.drop_table('deleted_rows')
@@ -0,0 +1,35 @@
+"""add note created_at and application index
+
+Revision ID: 5b7e2d9f0a13
+Revises: 3f9a1c2b7e40
+Create Date: 2026-10-18 10:03:52.771930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2d9f0a13'
+down_revision: Union[str, None] = '3f9a1c2b7e40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing notes keep NULL (their timestamp only lives in the content prefix);
+    # the default applies to rows inserted from now on.
+    op.add_column('notes', sa.Column('created_at', sa.DateTime(timezone=True), nullable=True))
+    with op.batch_alter_table('notes') as batch_op:
+        batch_op.alter_column('created_at', server_default=sa.text('CURRENT_TIMESTAMP'))
+    # Lets the list's per-page note counts be read from the index instead of scanning notes
+    op.create_index(op.f('ix_notes_application_id'), 'notes', ['application_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_notes_application_id'), table_name='notes')
+    op.drop_column('notes', 'created_at')
@@ -0,0 +1,44 @@
+"""index the importer's normalized company name instead of lower(company_name)
+
+Revision ID: 6e1f9b3a7c52
+Revises: 4c8e2a7b5d19
+Create Date: 2026-10-19 12:20:09.631475
+
+The importer normalizes company names by collapsing whitespace as well as
+lower-casing, so stored rows are looked up by the same expression
+(app.models.normalized_name, rendered here as it was at this revision).
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1f9b3a7c52'
+down_revision: Union[str, None] = '4c8e2a7b5d19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NORMALIZED_COMPANY_NAME = {
+    'postgresql': r"lower(btrim(regexp_replace(company_name, '[ \t\n\r\f\v]+', ' ', 'g')))",
+    'sqlite': (
+        "lower(trim(replace(replace(replace("
+        "replace(replace(replace(replace(replace(company_name, char(9), ' '), char(10), ' '), char(13), ' '), char(12), ' '), char(11), ' '), "
+        "' ', char(1) || char(2)), char(2) || char(1), ''), char(1) || char(2), ' ')))"
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    expression = NORMALIZED_COMPANY_NAME[op.get_bind().dialect.name]
+    op.drop_index('ix_job_applications_user_company_name_lower', table_name='job_applications')
+    op.create_index('ix_job_applications_user_company_name_key', 'job_applications', ['user_id', sa.text(expression)], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_applications_user_company_name_key', table_name='job_applications')
+    op.create_index('ix_job_applications_user_company_name_lower', 'job_applications', ['user_id', sa.text('lower(company_name)')], unique=False)
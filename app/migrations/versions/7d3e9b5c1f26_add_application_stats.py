@@ -0,0 +1,79 @@
+"""add application_stats summary table for the pipeline dashboard
+
+Revision ID: 7d3e9b5c1f26
+Revises: b2d5f8a1c347
+Create Date: 2026-10-18 20:12:08.514927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3e9b5c1f26'
+down_revision: Union[str, None] = 'b2d5f8a1c347'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The counters app/stats.py keeps, recomputed in one statement, frozen as of this
+# revision: every fact an application contributes, counted per (metric, bucket).
+# Salary bands truncate like Decimal floor division; weeks start on Monday.
+REBUILD_STATS = """
+INSERT INTO application_stats (metric, bucket, count, total)
+SELECT metric, bucket, count(*), coalesce(sum(amount), 0)
+FROM (
+    SELECT 'applications' AS metric, 'all' AS bucket, NULL AS amount FROM job_applications
+    UNION ALL
+    SELECT 'applications', CASE WHEN is_active IS FALSE THEN 'inactive' ELSE 'active' END, NULL FROM job_applications
+    UNION ALL
+    SELECT 'status', trim(coalesce(status, '')), NULL FROM job_applications
+    UNION ALL
+    SELECT 'status_active', trim(coalesce(status, '')), NULL FROM job_applications WHERE is_active IS NOT FALSE
+    UNION ALL
+    SELECT 'week', coalesce({week}, 'undated'), NULL FROM job_applications
+    UNION ALL
+    SELECT 'interviews', 'all', NULL FROM job_applications WHERE interview_date IS NOT NULL
+    UNION ALL
+    SELECT 'offers', 'all', NULL FROM job_applications WHERE offer
+    UNION ALL
+    SELECT 'salary', trim(coalesce(status, '')), salary FROM job_applications WHERE salary IS NOT NULL
+    UNION ALL
+    SELECT 'salary_band', trim(coalesce(status, '')) || '|' || {band}, NULL FROM job_applications WHERE salary IS NOT NULL
+) facts
+GROUP BY metric, bucket
+"""
+REBUILD_EXPRESSIONS = {
+    'postgresql': {
+        'week': "to_char(date_trunc('week', application_date), 'YYYY-MM-DD')",
+        'band': "CAST(trunc(salary / 25000) * 25000 AS bigint)::text",
+    },
+    'sqlite': {
+        'week': "date(application_date, '-6 days', 'weekday 1')",
+        'band': "CAST(CAST(salary / 25000 AS INTEGER) * 25000 AS TEXT)",
+    },
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('application_stats',
+    sa.Column('metric', sa.String(), nullable=False),
+    sa.Column('bucket', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('total', sa.Numeric(precision=16, scale=2), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('metric', 'bucket')
+    )
+    # Counters for the existing applications; from here on app/crud.py keeps them current
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'postgresql':
+        # Writers wait rather than apply deltas to counters that are being computed
+        op.execute('LOCK TABLE job_applications IN SHARE MODE')
+    op.execute(REBUILD_STATS.format(**REBUILD_EXPRESSIONS[dialect_name]))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('application_stats')
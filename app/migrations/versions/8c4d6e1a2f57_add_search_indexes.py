@@ -0,0 +1,168 @@
+"""add search indexes
+
+Revision ID: 8c4d6e1a2f57
+Revises: 5b7e2d9f0a13
+Create Date: 2026-10-18 11:27:05.130482
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4d6e1a2f57'
+down_revision: Union[str, None] = '5b7e2d9f0a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The document indexed for each application: names weigh more than notes.
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION job_application_search_vector(app_id integer, company text, role text, status text, contact text)
+RETURNS tsvector LANGUAGE sql STABLE AS $$
+    SELECT setweight(to_tsvector('english', coalesce(company, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(role, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(status, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(contact, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(
+               (SELECT string_agg(n.content, ' ') FROM notes n WHERE n.application_id = app_id), '')), 'C')
+$$
+"""
+
+APPLICATION_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION job_applications_search_vector_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := job_application_search_vector(NEW.id, NEW.company_name, NEW.role, NEW.status, NEW.contact_person);
+    RETURN NEW;
+END
+$$
+"""
+
+NOTE_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION notes_search_vector_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    target integer := CASE WHEN TG_OP = 'DELETE' THEN OLD.application_id ELSE NEW.application_id END;
+BEGIN
+    UPDATE job_applications j
+    SET search_vector = job_application_search_vector(j.id, j.company_name, j.role, j.status, j.contact_person)
+    WHERE j.id = target;
+    RETURN NULL;
+END
+$$
+"""
+
+
+# SQLite: the same document in an FTS5 table keyed by application id, kept by triggers
+SQLITE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS job_applications_fts USING fts5(
+        company_name, role, status, contact_person, notes,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS job_applications_fts_insert AFTER INSERT ON job_applications BEGIN
+        INSERT INTO job_applications_fts(rowid, company_name, role, status, contact_person, notes)
+        VALUES (new.id, new.company_name, new.role, new.status, new.contact_person, '');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS job_applications_fts_update
+    AFTER UPDATE OF company_name, role, status, contact_person ON job_applications BEGIN
+        UPDATE job_applications_fts
+        SET company_name = new.company_name, role = new.role, status = new.status, contact_person = new.contact_person
+        WHERE rowid = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS job_applications_fts_delete AFTER DELETE ON job_applications BEGIN
+        DELETE FROM job_applications_fts WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+        UPDATE job_applications_fts
+        SET notes = (SELECT group_concat(content, ' ') FROM notes WHERE application_id = new.application_id)
+        WHERE rowid = new.application_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE OF content ON notes BEGIN
+        UPDATE job_applications_fts
+        SET notes = (SELECT group_concat(content, ' ') FROM notes WHERE application_id = new.application_id)
+        WHERE rowid = new.application_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes BEGIN
+        UPDATE job_applications_fts
+        SET notes = coalesce((SELECT group_concat(content, ' ') FROM notes WHERE application_id = old.application_id), '')
+        WHERE rowid = old.application_id;
+    END""",
+]
+
+SQLITE_FTS_BACKFILL = """
+    INSERT INTO job_applications_fts(rowid, company_name, role, status, contact_person, notes)
+    SELECT j.id, j.company_name, j.role, j.status, j.contact_person,
+           coalesce((SELECT group_concat(n.content, ' ') FROM notes n WHERE n.application_id = j.id), '')
+    FROM job_applications j
+"""
+
+SQLITE_FTS_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS notes_fts_delete",
+    "DROP TRIGGER IF EXISTS notes_fts_update",
+    "DROP TRIGGER IF EXISTS notes_fts_insert",
+    "DROP TRIGGER IF EXISTS job_applications_fts_delete",
+    "DROP TRIGGER IF EXISTS job_applications_fts_update",
+    "DROP TRIGGER IF EXISTS job_applications_fts_insert",
+    "DROP TABLE IF EXISTS job_applications_fts",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+        op.execute(SQLITE_FTS_BACKFILL)
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('job_applications', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(SEARCH_VECTOR_FUNCTION)
+    op.execute(APPLICATION_TRIGGER_FUNCTION)
+    op.execute(NOTE_TRIGGER_FUNCTION)
+    op.execute("""
+        CREATE TRIGGER job_applications_search_vector_update
+        BEFORE INSERT OR UPDATE OF company_name, role, status, contact_person ON job_applications
+        FOR EACH ROW EXECUTE FUNCTION job_applications_search_vector_refresh()
+    """)
+    op.execute("""
+        CREATE TRIGGER notes_search_vector_update
+        AFTER INSERT OR UPDATE OF content, application_id OR DELETE ON notes
+        FOR EACH ROW EXECUTE FUNCTION notes_search_vector_refresh()
+    """)
+    # Backfill existing rows, then index
+    op.execute("""
+        UPDATE job_applications
+        SET search_vector = job_application_search_vector(id, company_name, role, status, contact_person)
+    """)
+    op.create_index('ix_job_applications_search_vector', 'job_applications', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_job_applications_company_name_trgm', 'job_applications', ['company_name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'company_name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_job_applications_role_trgm', 'job_applications', ['role'], unique=False,
+        postgresql_using='gin', postgresql_ops={'role': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for statement in SQLITE_FTS_TEARDOWN:
+            op.execute(statement)
+        return
+
+    op.drop_index('ix_job_applications_role_trgm', table_name='job_applications')
+    op.drop_index('ix_job_applications_company_name_trgm', table_name='job_applications')
+    op.drop_index('ix_job_applications_search_vector', table_name='job_applications')
+    op.execute('DROP TRIGGER IF EXISTS notes_search_vector_update ON notes')
+    op.execute('DROP TRIGGER IF EXISTS job_applications_search_vector_update ON job_applications')
+    op.execute('DROP FUNCTION IF EXISTS notes_search_vector_refresh()')
+    op.execute('DROP FUNCTION IF EXISTS job_applications_search_vector_refresh()')
+    op.execute('DROP FUNCTION IF EXISTS job_application_search_vector(integer, text, text, text, text)')
+    op.drop_column('job_applications', 'search_vector')
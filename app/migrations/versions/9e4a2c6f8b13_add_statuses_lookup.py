@@ -0,0 +1,217 @@
+"""add statuses lookup table and job_applications.status_id
+
+Revision ID: 9e4a2c6f8b13
+Revises: 7d3e9b5c1f26
+Create Date: 2026-10-18 21:03:44.172630
+
+"""
+import re
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4a2c6f8b13'
+down_revision: Union[str, None] = '7d3e9b5c1f26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Everything below is frozen as of this revision; app/statuses.py and app/stats.py move on.
+
+# Canonical statuses in pipeline order, each with the spellings that mean it
+CANONICAL_STATUSES = (
+    ("Applied", ("application sent", "submitted", "sent", "apply")),
+    ("Phone Screen", ("phone screening", "screen", "screening", "phone interview", "recruiter call", "recruiter screen")),
+    ("Interviewing", ("interview", "interviews", "interviewed", "onsite", "on site", "technical interview", "final round")),
+    ("Offer", ("offered", "offer received", "offer extended")),
+    ("Accepted", ("offer accepted", "hired")),
+    ("Rejected", ("rejection", "not selected", "turned down")),
+    ("Withdrawn", ("withdrew",)),
+    ("Ghosted", ("no response", "no reply")),
+)
+OTHER_POSITION = 100
+BACKFILL_BATCH_SIZE = 10_000
+
+_SEPARATORS_RE = re.compile(r"[\s_-]+")
+
+statuses_table = sa.table(
+    'statuses',
+    sa.column('id', sa.Integer()), sa.column('name', sa.String()),
+    sa.column('key', sa.String()), sa.column('position', sa.Integer()),
+)
+
+SELECT_BATCH = sa.text("""
+    SELECT id, status FROM job_applications
+    WHERE status IS NOT NULL AND status_id IS NULL AND id > :last_id
+    ORDER BY id
+    LIMIT :batch_size
+""")
+UPDATE_APPLICATION = sa.text("UPDATE job_applications SET status_id = :status_id, status = :status WHERE id = :application_id")
+
+# The pipeline counters recounted in one statement, as in 7d3e9b5c1f26
+REBUILD_STATS = """
+INSERT INTO application_stats (metric, bucket, count, total)
+SELECT metric, bucket, count(*), coalesce(sum(amount), 0)
+FROM (
+    SELECT 'applications' AS metric, 'all' AS bucket, NULL AS amount FROM job_applications
+    UNION ALL
+    SELECT 'applications', CASE WHEN is_active IS FALSE THEN 'inactive' ELSE 'active' END, NULL FROM job_applications
+    UNION ALL
+    SELECT 'status', trim(coalesce(status, '')), NULL FROM job_applications
+    UNION ALL
+    SELECT 'status_active', trim(coalesce(status, '')), NULL FROM job_applications WHERE is_active IS NOT FALSE
+    UNION ALL
+    SELECT 'week', coalesce({week}, 'undated'), NULL FROM job_applications
+    UNION ALL
+    SELECT 'interviews', 'all', NULL FROM job_applications WHERE interview_date IS NOT NULL
+    UNION ALL
+    SELECT 'offers', 'all', NULL FROM job_applications WHERE offer
+    UNION ALL
+    SELECT 'salary', trim(coalesce(status, '')), salary FROM job_applications WHERE salary IS NOT NULL
+    UNION ALL
+    SELECT 'salary_band', trim(coalesce(status, '')) || '|' || {band}, NULL FROM job_applications WHERE salary IS NOT NULL
+) facts
+GROUP BY metric, bucket
+"""
+REBUILD_EXPRESSIONS = {
+    'postgresql': {
+        'week': "to_char(date_trunc('week', application_date), 'YYYY-MM-DD')",
+        'band': "CAST(trunc(salary / 25000) * 25000 AS bigint)::text",
+    },
+    'sqlite': {
+        'week': "date(application_date, '-6 days', 'weekday 1')",
+        'band': "CAST(CAST(salary / 25000 AS INTEGER) * 25000 AS TEXT)",
+    },
+}
+
+
+def _status_key(name: str) -> str:
+    return _SEPARATORS_RE.sub(" ", name).strip().casefold()
+
+
+_ALIASES: Dict[str, str] = {
+    _status_key(spelling): name
+    for name, spellings in CANONICAL_STATUSES
+    for spelling in (name, *spellings)
+}
+
+
+def _canonical_name(status: Optional[str]) -> Optional[str]:
+    cleaned = " ".join((status or "").split())
+    if not cleaned:
+        return None
+    return _ALIASES.get(_status_key(cleaned), cleaned)
+
+
+def _resolve_statuses(connection, statuses) -> Dict[str, Tuple[int, str]]:
+    # Free text -> (status id, canonical name), adding the statuses that don't exist yet
+    names = {status: _canonical_name(status) for status in statuses}
+    wanted: Dict[str, str] = {}
+    for name in names.values():
+        if name is not None:
+            wanted.setdefault(_status_key(name), name)
+    if not wanted:
+        return {}
+    query = sa.select(statuses_table.c.key, statuses_table.c.id, statuses_table.c.name)
+    found = {key: (status_id, name) for key, status_id, name in connection.execute(query.where(statuses_table.c.key.in_(wanted)))}
+    missing = sorted(set(wanted) - set(found))
+    if missing:
+        connection.execute(
+            statuses_table.insert(),
+            [{"name": wanted[key], "key": key, "position": OTHER_POSITION} for key in missing],
+        )
+        found.update({key: (status_id, name) for key, status_id, name in connection.execute(query.where(statuses_table.c.key.in_(missing)))})
+    return {status: found[_status_key(name)] for status, name in names.items() if name is not None}
+
+
+def _backfill_status_ids(connection) -> None:
+    last_id = 0
+    while True:
+        rows = connection.execute(SELECT_BATCH, {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE}).all()
+        if not rows:
+            return
+        resolved = _resolve_statuses(connection, dict.fromkeys(status for _, status in rows))
+        values = []
+        for application_id, status in rows:
+            # A blank status becomes NULL rather than a status of its own
+            status_id, name = resolved.get(status, (None, None))
+            values.append({"application_id": application_id, "status_id": status_id, "status": name})
+        connection.execute(UPDATE_APPLICATION, values)
+        last_id = rows[-1][0]
+
+
+def _sqlite_triggers(table_name: str) -> list:
+    return [sql for (sql,) in op.get_bind().exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (table_name,)
+    )]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    statuses = op.create_table('statuses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('position', sa.Integer(), server_default='100', nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('key')
+    )
+    op.bulk_insert(statuses, [
+        {"name": name, "key": _status_key(name), "position": position}
+        for position, (name, _) in enumerate(CANONICAL_STATUSES)
+    ])
+
+    if op.get_bind().dialect.name == 'sqlite':
+        # SQLite can add a column with a REFERENCES clause, but not a constraint to an existing column
+        op.execute('ALTER TABLE job_applications ADD COLUMN status_id INTEGER REFERENCES statuses (id)')
+    else:
+        op.add_column('job_applications', sa.Column('status_id', sa.Integer(), nullable=True))
+        op.create_foreign_key(
+            'job_applications_status_id_fkey', 'job_applications', 'statuses', ['status_id'], ['id'],
+        )
+
+    # Map the existing free text in id-ordered batches, each durable on its own, so a
+    # large table never sits in one long transaction and an interrupted upgrade resumes
+    with op.get_context().autocommit_block():
+        _backfill_status_ids(op.get_bind())
+
+        op.create_index(
+            'ix_job_applications_active_status_date_id', 'job_applications',
+            ['is_active', 'status_id', sa.text('application_date DESC'), sa.text('id DESC')],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_job_applications_status_id', 'job_applications', ['status_id'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+    # Statuses that differed only in spelling are one now; recount the pipeline stats under them
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'postgresql':
+        op.execute('LOCK TABLE job_applications IN SHARE MODE')
+    op.execute('DELETE FROM application_stats')
+    op.execute(REBUILD_STATS.format(**REBUILD_EXPRESSIONS[dialect_name]))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Canonicalized status text is kept
+    op.drop_index('ix_job_applications_status_id', table_name='job_applications')
+    op.drop_index('ix_job_applications_active_status_date_id', table_name='job_applications')
+    if op.get_bind().dialect.name == 'sqlite':
+        triggers = _sqlite_triggers('job_applications')
+        # SQLite won't drop a column that has a foreign key; batch mode rebuilds the table
+        with op.batch_alter_table('job_applications', recreate='always') as batch_op:
+            batch_op.drop_column('status_id')
+        # The rebuilt table lost its search triggers and its expression index (not reflected);
+        # rows kept their ids, so the search index itself is still current
+        for trigger in triggers:
+            op.execute(trigger)
+        op.create_index('ix_job_applications_company_name_lower', 'job_applications', [sa.text('lower(company_name)')])
+    else:
+        op.drop_constraint('job_applications_status_id_fkey', 'job_applications', type_='foreignkey')
+        op.drop_column('job_applications', 'status_id')
+    op.drop_table('statuses')
@@ -0,0 +1,29 @@
+"""add company name lower index
+
+Revision ID: a21f7c9e4b68
+Revises: 8c4d6e1a2f57
+Create Date: 2026-10-18 12:40:17.602388
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a21f7c9e4b68'
+down_revision: Union[str, None] = '8c4d6e1a2f57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Lets the bulk importer check a whole batch for existing rows with one indexed lookup
+    op.create_index('ix_job_applications_company_name_lower', 'job_applications', [sa.text('lower(company_name)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_applications_company_name_lower', table_name='job_applications')
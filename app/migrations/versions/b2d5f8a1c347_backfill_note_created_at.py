@@ -0,0 +1,86 @@
+"""backfill note created_at and index it for the activity feed
+
+Revision ID: b2d5f8a1c347
+Revises: f41c8d27a6e9
+Create Date: 2026-10-18 18:05:47.260381
+
+"""
+import re
+from datetime import datetime, timezone
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d5f8a1c347'
+down_revision: Union[str, None] = 'f41c8d27a6e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The backfill as of this revision (app/note_timestamps.py keeps a CLI copy that may move on)
+BATCH_SIZE = 10_000
+
+PREFIX_RE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] -- ")
+
+SELECT_BATCH = sa.text("""
+    SELECT id, content FROM notes
+    WHERE created_at IS NULL AND id > :last_id
+    ORDER BY id
+    LIMIT :batch_size
+""")
+# Typed so each dialect stores the value the way the ORM column does
+UPDATE_NOTE = sa.text("UPDATE notes SET created_at = :created_at WHERE id = :note_id").bindparams(
+    sa.bindparam("created_at", type_=sa.DateTime(timezone=True)),
+)
+
+
+def _note_timestamp(content: Optional[str]) -> Optional[datetime]:
+    match = PREFIX_RE.match(content or "")
+    if match is None:
+        return None
+    try:
+        stamp = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+    # The note form stamped notes with the server's local clock, which is UTC in the container
+    return stamp.replace(tzinfo=timezone.utc)
+
+
+def _backfill_note_created_at(connection) -> None:
+    last_id = 0
+    while True:
+        rows = connection.execute(SELECT_BATCH, {"last_id": last_id, "batch_size": BATCH_SIZE}).all()
+        if not rows:
+            return
+        values = [
+            {"note_id": note_id, "created_at": created_at}
+            for note_id, created_at in ((note_id, _note_timestamp(content)) for note_id, content in rows)
+            if created_at is not None
+        ]
+        if values:
+            connection.execute(UPDATE_NOTE, values)
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Notes written before created_at existed only carry their time in the content
+    # prefix. In autocommit mode each batch is durable on its own, so a large table never sits in one long
+    # transaction, and an interrupted upgrade picks up the remaining NULL rows.
+    with op.get_context().autocommit_block():
+        _backfill_note_created_at(op.get_bind())
+
+        # The activity feed pages all notes newest first (ORDER BY created_at DESC, id DESC)
+        op.create_index(
+            'ix_notes_created_at_id', 'notes', [sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The backfilled timestamps are kept; they are correct data either way
+    op.drop_index('ix_notes_created_at_id', table_name='notes')
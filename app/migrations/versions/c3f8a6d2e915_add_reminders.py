@@ -0,0 +1,48 @@
+"""add reminders table and the (is_active, interview_date) index
+
+Revision ID: c3f8a6d2e915
+Revises: 9e4a2c6f8b13
+Create Date: 2026-10-18 22:14:09.518304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a6d2e915'
+down_revision: Union[str, None] = '9e4a2c6f8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('reminders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('due_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('fired_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['application_id'], ['job_applications.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('application_id', 'kind', 'due_at', name='uq_reminders_application_kind_due')
+    )
+    op.create_index('ix_reminders_fired_at', 'reminders', [sa.text('fired_at DESC')], unique=False)
+
+    # Built without blocking writes to job_applications on PostgreSQL
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_job_applications_active_interview_date', 'job_applications', ['is_active', 'interview_date'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_applications_active_interview_date', table_name='job_applications')
+    op.drop_index('ix_reminders_fired_at', table_name='reminders')
+    op.drop_table('reminders')
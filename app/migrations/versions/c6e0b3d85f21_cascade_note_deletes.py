@@ -0,0 +1,69 @@
+"""cascade note deletes
+
+Revision ID: c6e0b3d85f21
+Revises: a21f7c9e4b68
+Create Date: 2026-10-18 13:55:48.209116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e0b3d85f21'
+down_revision: Union[str, None] = 'a21f7c9e4b68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _sqlite_notes_table(ondelete):
+    # SQLite can't alter a constraint in place; batch mode rebuilds the table from this definition
+    return sa.Table(
+        'notes', sa.MetaData(),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('application_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['application_id'], ['job_applications.id'], ondelete=ondelete),
+        sa.PrimaryKeyConstraint('id'),
+        sa.Index('ix_notes_id', 'id'),
+        sa.Index('ix_notes_application_id', 'application_id'),
+    )
+
+
+def _rebuild_sqlite_notes(ondelete):
+    triggers = [sql for (sql,) in op.get_bind().exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'notes'"
+    )]
+    with op.batch_alter_table('notes', recreate='always', copy_from=_sqlite_notes_table(ondelete)):
+        pass
+    # Dropping the old table dropped its search triggers; the rows (and so the index) are unchanged
+    for trigger in triggers:
+        op.execute(trigger)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Deleting an application becomes a single DELETE; the database removes its notes
+    if op.get_bind().dialect.name == 'sqlite':
+        _rebuild_sqlite_notes('CASCADE')
+        return
+    op.drop_constraint('notes_application_id_fkey', 'notes', type_='foreignkey')
+    op.create_foreign_key(
+        'notes_application_id_fkey', 'notes', 'job_applications',
+        ['application_id'], ['id'], ondelete='CASCADE',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        _rebuild_sqlite_notes(None)
+        return
+    op.drop_constraint('notes_application_id_fkey', 'notes', type_='foreignkey')
+    op.create_foreign_key(
+        'notes_application_id_fkey', 'notes', 'job_applications',
+        ['application_id'], ['id'],
+    )
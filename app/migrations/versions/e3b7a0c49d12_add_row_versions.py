@@ -0,0 +1,52 @@
+"""add row versions
+
+Revision ID: e3b7a0c49d12
+Revises: c6e0b3d85f21
+Create Date: 2026-10-18 15:12:06.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b7a0c49d12'
+down_revision: Union[str, None] = 'c6e0b3d85f21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # version has a constant default, so existing rows get 1 without a rewrite
+    op.add_column('job_applications', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('notes', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+    timestamps = [('job_applications', 'created_at'), ('job_applications', 'updated_at'), ('notes', 'updated_at')]
+    if op.get_bind().dialect.name == 'sqlite':
+        # SQLite's ADD COLUMN rejects a CURRENT_TIMESTAMP default, and making the column
+        # NOT NULL would mean rebuilding job_applications (and its search triggers).
+        # The app always supplies these values, so backfill and leave them nullable.
+        for table, column in timestamps:
+            op.add_column(table, sa.Column(column, sa.DateTime(timezone=True), nullable=True))
+            op.execute(f"UPDATE {table} SET {column} = CURRENT_TIMESTAMP")
+    else:
+        # now() is stable, so PostgreSQL fills existing rows without rewriting the table
+        for table, column in timestamps:
+            op.add_column(table, sa.Column(column, sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    # Notes that already know when they were written keep that as their last change
+    op.execute("UPDATE notes SET updated_at = created_at WHERE created_at IS NOT NULL")
+
+    op.create_index('ix_job_applications_active_updated_at', 'job_applications', ['is_active', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_applications_active_updated_at', table_name='job_applications')
+    op.drop_column('notes', 'updated_at')
+    op.drop_column('notes', 'version')
+    op.drop_column('job_applications', 'updated_at')
+    op.drop_column('job_applications', 'created_at')
+    op.drop_column('job_applications', 'version')
@@ -0,0 +1,32 @@
+"""notes keyset index
+
+Revision ID: f41c8d27a6e9
+Revises: e3b7a0c49d12
+Create Date: 2026-10-18 16:40:21.093514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f41c8d27a6e9'
+down_revision: Union[str, None] = 'e3b7a0c49d12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Notes are paged newest first per application; the composite index covers
+    # that and everything the single-column index served, so it replaces it
+    op.create_index('ix_notes_application_id_id', 'notes', ['application_id', sa.text('id DESC')], unique=False)
+    op.drop_index('ix_notes_application_id', table_name='notes')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_notes_application_id', 'notes', ['application_id'], unique=False)
+    op.drop_index('ix_notes_application_id_id', table_name='notes')
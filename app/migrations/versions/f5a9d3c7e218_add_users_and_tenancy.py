@@ -0,0 +1,383 @@
+"""add users, user_id on every tenant table, tenant-led indexes and optional hash partitioning
+
+Revision ID: f5a9d3c7e218
+Revises: c3f8a6d2e915
+Create Date: 2026-10-18 23:41:27.306815
+
+Existing rows go to a new `default` user. With TENANT_PARTITIONS=<n> set on
+PostgreSQL (13 or later), job_applications and notes are also rebuilt as
+PARTITION BY HASH (user_id) tables with n partitions each. That copies both
+tables under an exclusive lock, so run it in a maintenance window.
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a9d3c7e218'
+down_revision: Union[str, None] = 'c3f8a6d2e915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONED_TABLES = ('job_applications', 'notes')
+
+# Single-tenant indexes and what replaces them, leading with user_id
+REPLACED_INDEXES = {
+    'job_applications': [
+        'ix_job_applications_active_date_id',
+        'ix_job_applications_active_status_date_id',
+        'ix_job_applications_status_id',
+        'ix_job_applications_company_name_lower',
+    ],
+    'notes': ['ix_notes_created_at_id'],
+    'reminders': ['ix_reminders_fired_at'],
+}
+PG_REPLACED_INDEXES = [
+    'ix_job_applications_search_vector',
+    'ix_job_applications_company_name_trgm',
+    'ix_job_applications_role_trgm',
+]
+TENANT_INDEXES = [
+    ('ix_job_applications_user_active_date_id', 'job_applications',
+     ['user_id', 'is_active', sa.text('application_date DESC'), sa.text('id DESC')]),
+    ('ix_job_applications_user_active_status_date_id', 'job_applications',
+     ['user_id', 'is_active', 'status_id', sa.text('application_date DESC'), sa.text('id DESC')]),
+    ('ix_job_applications_user_status_id', 'job_applications', ['user_id', 'status_id']),
+    ('ix_job_applications_user_active_updated_at', 'job_applications', ['user_id', 'is_active', 'updated_at']),
+    ('ix_job_applications_user_active_interview_date', 'job_applications', ['user_id', 'is_active', 'interview_date']),
+    ('ix_job_applications_user_company_name_lower', 'job_applications', ['user_id', sa.text('lower(company_name)')]),
+    ('ix_notes_user_created_at_id', 'notes', ['user_id', sa.text('created_at DESC'), sa.text('id DESC')]),
+    ('ix_reminders_user_fired_at', 'reminders', ['user_id', sa.text('fired_at DESC')]),
+]
+
+# The pipeline counters recounted in one statement (as in 7d3e9b5c1f26), per user
+# when `owner` is "user_id, " and for the whole table when it is empty
+REBUILD_STATS = """
+INSERT INTO application_stats ({owner}metric, bucket, count, total)
+SELECT {owner}metric, bucket, count(*), coalesce(sum(amount), 0)
+FROM (
+    SELECT {owner}'applications' AS metric, 'all' AS bucket, NULL AS amount FROM job_applications
+    UNION ALL
+    SELECT {owner}'applications', CASE WHEN is_active IS FALSE THEN 'inactive' ELSE 'active' END, NULL FROM job_applications
+    UNION ALL
+    SELECT {owner}'status', trim(coalesce(status, '')), NULL FROM job_applications
+    UNION ALL
+    SELECT {owner}'status_active', trim(coalesce(status, '')), NULL FROM job_applications WHERE is_active IS NOT FALSE
+    UNION ALL
+    SELECT {owner}'week', coalesce({week}, 'undated'), NULL FROM job_applications
+    UNION ALL
+    SELECT {owner}'interviews', 'all', NULL FROM job_applications WHERE interview_date IS NOT NULL
+    UNION ALL
+    SELECT {owner}'offers', 'all', NULL FROM job_applications WHERE offer
+    UNION ALL
+    SELECT {owner}'salary', trim(coalesce(status, '')), salary FROM job_applications WHERE salary IS NOT NULL
+    UNION ALL
+    SELECT {owner}'salary_band', trim(coalesce(status, '')) || '|' || {band}, NULL FROM job_applications WHERE salary IS NOT NULL
+) facts
+GROUP BY {owner}metric, bucket
+"""
+REBUILD_EXPRESSIONS = {
+    'postgresql': {
+        'week': "to_char(date_trunc('week', application_date), 'YYYY-MM-DD')",
+        'band': "CAST(trunc(salary / 25000) * 25000 AS bigint)::text",
+    },
+    'sqlite': {
+        'week': "date(application_date, '-6 days', 'weekday 1')",
+        'band': "CAST(CAST(salary / 25000 AS INTEGER) * 25000 AS TEXT)",
+    },
+}
+
+
+def _tenant_partitions(bind) -> int:
+    if bind.dialect.name != 'postgresql':
+        return 0
+    return int(os.getenv('TENANT_PARTITIONS', '0'))
+
+
+def _sqlite_notes_table(tenant):
+    # SQLite can't alter a constraint in place; batch mode rebuilds the table from this definition
+    user_id = [sa.Column('user_id', sa.Integer(), nullable=False)] if tenant else []
+    return sa.Table(
+        'notes', sa.MetaData(),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('application_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+        # Left nullable on SQLite by the row-versions migration
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        *user_id,
+        sa.ForeignKeyConstraint(
+            ['user_id', 'application_id'] if tenant else ['application_id'],
+            ['job_applications.user_id', 'job_applications.id'] if tenant else ['job_applications.id'],
+            ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.Index('ix_notes_id', 'id'),
+        sa.Index('ix_notes_application_id_id', 'application_id', sa.text('id DESC')),
+    )
+
+
+def _sqlite_reminders_table(tenant):
+    user_id = [sa.Column('user_id', sa.Integer(), nullable=False)] if tenant else []
+    return sa.Table(
+        'reminders', sa.MetaData(),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('application_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('due_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('fired_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        *user_id,
+        sa.ForeignKeyConstraint(
+            ['user_id', 'application_id'] if tenant else ['application_id'],
+            ['job_applications.user_id', 'job_applications.id'] if tenant else ['job_applications.id'],
+            ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('application_id', 'kind', 'due_at', name='uq_reminders_application_kind_due'),
+    )
+
+
+def _sqlite_triggers(table_name: str) -> list:
+    return [sql for (sql,) in op.get_bind().exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (table_name,)
+    )]
+
+
+def _rebuild_sqlite_children(tenant):
+    for copy_from in (_sqlite_notes_table(tenant), _sqlite_reminders_table(tenant)):
+        triggers = _sqlite_triggers(copy_from.name)
+        with op.batch_alter_table(copy_from.name, recreate='always', copy_from=copy_from):
+            pass
+        # Dropping the old table dropped its (search) triggers; the rows keep their ids
+        for trigger in triggers:
+            op.execute(trigger)
+
+
+def _create_application_stats(tenant):
+    """The counters table, per user when `tenant` is set, filled from the applications."""
+    user_id = [sa.Column('user_id', sa.Integer(), nullable=False)] if tenant else []
+    op.create_table('application_stats',
+    *user_id,
+    sa.Column('metric', sa.String(), nullable=False),
+    sa.Column('bucket', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('total', sa.Numeric(precision=16, scale=2), server_default='0', nullable=False),
+    *([sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE')] if tenant else []),
+    sa.PrimaryKeyConstraint(*(['user_id'] if tenant else []), 'metric', 'bucket')
+    )
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'postgresql':
+        op.execute('LOCK TABLE job_applications IN SHARE MODE')
+    op.execute(REBUILD_STATS.format(owner='user_id, ' if tenant else '', **REBUILD_EXPRESSIONS[dialect_name]))
+
+
+def _relayout(bind, partitions: int) -> None:
+    """
+    Rebuild PARTITIONED_TABLES as hash-partitioned by user_id (`partitions` > 0) or
+    as plain tables (0), keeping their rows, sequences, indexes, triggers and foreign keys.
+    """
+    tables = list(PARTITIONED_TABLES)
+    names = ', '.join(f"'{name}'" for name in tables)
+    # Indexes other than the primary key, the search triggers, and every foreign key from or to the tables;
+    # constraints cloned onto partitions (conparentid) come back with their parents
+    indexes = bind.execute(sa.text(f"""
+        SELECT indexdef FROM pg_indexes i
+        WHERE schemaname = current_schema() AND tablename IN ({names})
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conname = i.indexname AND c.contype = 'p')
+    """)).scalars().all()
+    triggers = bind.execute(sa.text(f"""
+        SELECT pg_get_triggerdef(oid) FROM pg_trigger
+        WHERE tgrelid IN ({', '.join(f"'{name}'::regclass" for name in tables)}) AND NOT tgisinternal
+    """)).scalars().all()
+    foreign_keys = bind.execute(sa.text(f"""
+        SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE contype = 'f' AND conparentid = 0
+          AND (conrelid::regclass::text IN ({names}) OR confrelid::regclass::text IN ({names}))
+    """)).all()
+    for table, name, _ in foreign_keys:
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT {name}')
+
+    for table in tables:
+        sequence = bind.execute(sa.text(f"SELECT pg_get_serial_sequence('{table}', 'id')")).scalar()
+        op.execute(f'ALTER TABLE {table} RENAME TO {table}_old')
+        # The id sequence would go with the old table
+        op.execute(f'ALTER SEQUENCE {sequence} OWNED BY NONE')
+        layout = ' PARTITION BY HASH (user_id)' if partitions else ''
+        op.execute(f'CREATE TABLE {table} (LIKE {table}_old INCLUDING DEFAULTS){layout}')
+        for remainder in range(partitions):
+            op.execute(
+                f'CREATE TABLE {table}_p{remainder} PARTITION OF {table} '
+                f'FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})'
+            )
+        op.execute(f'INSERT INTO {table} SELECT * FROM {table}_old')
+        op.execute(f'DROP TABLE {table}_old')
+        op.execute(f'ALTER SEQUENCE {sequence} OWNED BY {table}.id')
+        # A partitioned table's unique keys must include the partition key
+        op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY ({"user_id, id" if partitions else "id"})')
+
+    for indexdef in indexes:
+        if partitions and indexdef.startswith('CREATE UNIQUE INDEX uq_job_applications_user_id_id '):
+            continue  # The primary key is (user_id, id) now
+        op.execute(indexdef.replace(' ON ONLY ', ' ON '))
+    for triggerdef in triggers:
+        op.execute(triggerdef)
+    for table, name, definition in foreign_keys:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+    for table in tables:
+        op.execute(f'ANALYZE {table}')
+
+
+def _create_tenant_indexes(bind, concurrently: bool) -> None:
+    for name, table, columns in TENANT_INDEXES:
+        op.create_index(name, table, columns, unique=False, postgresql_concurrently=concurrently)
+    if bind.dialect.name != 'postgresql':
+        return
+    op.create_index(
+        'ix_job_applications_user_search_vector', 'job_applications', ['user_id', 'search_vector'],
+        unique=False, postgresql_using='gin', postgresql_concurrently=concurrently,
+    )
+    for column in ('company_name', 'role'):
+        op.create_index(
+            f'ix_job_applications_user_{column}_trgm', 'job_applications', ['user_id', column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}, postgresql_concurrently=concurrently,
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    partitions = _tenant_partitions(bind)
+
+    users = op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('username')
+    )
+    # Owner of everything created before accounts existed (app.users.DEFAULT_USERNAME)
+    default_id = bind.execute(sa.insert(users).values(username='default').returning(users.c.id)).scalar_one()
+
+    # The single-tenant indexes go first, so the rebuilds below don't carry them
+    for table, index_names in REPLACED_INDEXES.items():
+        for name in index_names:
+            op.drop_index(name, table_name=table)
+    if bind.dialect.name == 'postgresql':
+        for name in PG_REPLACED_INDEXES:
+            op.drop_index(name, table_name='job_applications')
+        # GIN operator classes for plain columns, so search indexes can lead with user_id
+        op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+
+    if bind.dialect.name == 'sqlite':
+        # A column added with a default needs no table rebuild; SQLite keeps the default, the app always sets user_id
+        op.execute(
+            f'ALTER TABLE job_applications ADD COLUMN user_id INTEGER NOT NULL DEFAULT {default_id} '
+            'REFERENCES users (id) ON DELETE CASCADE'
+        )
+        for table in ('notes', 'reminders'):
+            op.execute(f'ALTER TABLE {table} ADD COLUMN user_id INTEGER NOT NULL DEFAULT {default_id}')
+        # Notes and reminders belong to their application's user; SQLite checks the
+        # (user_id, id) key it references on use, so it can be indexed afterwards
+        _rebuild_sqlite_children(tenant=True)
+    else:
+        # With a constant default, PostgreSQL adds a NOT NULL column without rewriting the table
+        for table in ('job_applications', 'notes', 'reminders'):
+            op.add_column(table, sa.Column('user_id', sa.Integer(), server_default=str(default_id), nullable=False))
+            op.alter_column(table, 'user_id', server_default=None)
+        op.create_foreign_key(
+            'job_applications_user_id_fkey', 'job_applications', 'users', ['user_id'], ['id'], ondelete='CASCADE',
+        )
+        # Replaced by (user_id, application_id) keys once job_applications has a unique (user_id, id)
+        op.drop_constraint('notes_application_id_fkey', 'notes', type_='foreignkey')
+        op.drop_constraint('reminders_application_id_fkey', 'reminders', type_='foreignkey')
+
+    # Counters are per user now; recount them from the applications
+    op.drop_table('application_stats')
+    _create_application_stats(tenant=True)
+
+    if partitions:
+        # The tables are rewritten anyway, so their new indexes are built inside the same transaction
+        _relayout(bind, partitions)
+        _create_tenant_indexes(bind, concurrently=False)
+    else:
+        # Built without blocking writes on PostgreSQL
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'uq_job_applications_user_id_id', 'job_applications', ['user_id', 'id'],
+                unique=True, postgresql_concurrently=True,
+            )
+            _create_tenant_indexes(bind, concurrently=True)
+
+    # Notes and reminders belong to their application's user
+    if bind.dialect.name == 'postgresql':
+        for table in ('notes', 'reminders'):
+            op.create_foreign_key(
+                f'{table}_user_id_application_id_fkey', table, 'job_applications',
+                ['user_id', 'application_id'], ['user_id', 'id'], ondelete='CASCADE',
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Every user's rows are kept and become the single tenant's
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        for table in ('notes', 'reminders'):
+            op.drop_constraint(f'{table}_user_id_application_id_fkey', table, type_='foreignkey')
+        partitioned = bind.execute(sa.text("SELECT relkind = 'p' FROM pg_class WHERE oid = 'job_applications'::regclass")).scalar()
+        if partitioned:
+            _relayout(bind, 0)
+        for name in ('ix_job_applications_user_search_vector', 'ix_job_applications_user_company_name_trgm', 'ix_job_applications_user_role_trgm'):
+            op.drop_index(name, table_name='job_applications')
+    for name, table, _ in TENANT_INDEXES:
+        op.drop_index(name, table_name=table)
+    # Absent when the table was partitioned: its primary key was (user_id, id)
+    op.drop_index('uq_job_applications_user_id_id', table_name='job_applications', if_exists=True)
+
+    if bind.dialect.name == 'sqlite':
+        _rebuild_sqlite_children(tenant=False)
+        triggers = _sqlite_triggers('job_applications')
+        # SQLite won't drop a column that has a foreign key; batch mode rebuilds the table
+        with op.batch_alter_table('job_applications', recreate='always') as batch_op:
+            batch_op.drop_column('user_id')
+        # The rebuilt table lost its search triggers
+        for trigger in triggers:
+            op.execute(trigger)
+    else:
+        for table in ('notes', 'reminders'):
+            op.create_foreign_key(
+                f'{table}_application_id_fkey', table, 'job_applications', ['application_id'], ['id'], ondelete='CASCADE',
+            )
+            op.drop_column(table, 'user_id')
+        op.drop_constraint('job_applications_user_id_fkey', 'job_applications', type_='foreignkey')
+        op.drop_column('job_applications', 'user_id')
+
+    op.create_index(
+        'ix_job_applications_active_date_id', 'job_applications',
+        ['is_active', sa.text('application_date DESC'), sa.text('id DESC')], unique=False,
+    )
+    op.create_index(
+        'ix_job_applications_active_status_date_id', 'job_applications',
+        ['is_active', 'status_id', sa.text('application_date DESC'), sa.text('id DESC')], unique=False,
+    )
+    op.create_index('ix_job_applications_status_id', 'job_applications', ['status_id'], unique=False)
+    op.create_index('ix_job_applications_company_name_lower', 'job_applications', [sa.text('lower(company_name)')], unique=False)
+    op.create_index('ix_notes_created_at_id', 'notes', [sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+    op.create_index('ix_reminders_fired_at', 'reminders', [sa.text('fired_at DESC')], unique=False)
+    if bind.dialect.name == 'postgresql':
+        op.create_index('ix_job_applications_search_vector', 'job_applications', ['search_vector'], unique=False, postgresql_using='gin')
+        for column in ('company_name', 'role'):
+            op.create_index(
+                f'ix_job_applications_{column}_trgm', 'job_applications', [column], unique=False,
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+            )
+
+    op.drop_table('application_stats')
+    _create_application_stats(tenant=False)
+    op.drop_table('users')
@@ -1,15 +1,72 @@
-from sqlalchemy import Column, Integer, String, Date, Boolean, ForeignKey, Numeric, Float, Text
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, PrimaryKeyConstraint, UniqueConstraint, ForeignKeyConstraint, Date, DateTime, Boolean, ForeignKey, Numeric, Float, Text, Index, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.functions import FunctionElement
 from .database import Base
 
+def utcnow() -> datetime:
+    # Set from Python rather than now(): microsecond resolution on every backend
+    # (SQLite's CURRENT_TIMESTAMP is whole seconds), so two writes never share a version stamp
+    return datetime.now(timezone.utc)
+
+# What the importer's normalization (app/importer.py) counts as whitespace
+WHITESPACE = " \t\n\r\f\v"
+
+class normalized_name(FunctionElement):
+    """
+    SQL for a name in lower case, trimmed and with each run of whitespace as one
+    space. The importer keys duplicates on it, and an index is built on it, so the
+    query and the index must render the same expression (everything is inlined).
+    """
+    type = String()
+    inherit_cache = True
+    name = "normalized_name"
+
+@compiles(normalized_name)
+def _normalized_name_postgresql(element, compiler, **kw):
+    return r"lower(btrim(regexp_replace(%s, '[ \t\n\r\f\v]+', ' ', 'g')))" % compiler.process(element.clauses, **kw)
+
+@compiles(normalized_name, "sqlite")
+def _normalized_name_sqlite(element, compiler, **kw):
+    # No regexp_replace: map the other whitespace characters to spaces, then collapse runs of
+    # spaces exactly by marking each as char(1)char(2) and deleting every char(2)char(1) between them
+    value = compiler.process(element.clauses, **kw)
+    for character in WHITESPACE[1:]:
+        value = f"replace({value}, char({ord(character)}), ' ')"
+    value = f"replace(replace(replace({value}, ' ', char(1) || char(2)), char(2) || char(1), ''), char(1) || char(2), ' ')"
+    return f"lower(trim({value}))"
+
+class User(Base):
+    """An account; every application, note, reminder and stats counter belongs to one (see app/users.py)."""
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    username = Column(String, nullable=False, unique=True)
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
+
+class Status(Base):
+    """Lookup table of application statuses; see app/statuses.py for how free text maps onto it."""
+    __tablename__ = "statuses"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    key = Column(String, nullable=False, unique=True)  # Normalized name: lower case, single spaces
+    position = Column(Integer, default=100, server_default="100", nullable=False)  # Pipeline order
+
 class JobApplication(Base):
     __tablename__ = "job_applications"
 
     id = Column(Integer, primary_key=True, index=True)
+    # The tenant. Every query in app/crud.py filters on it, and every index the pages use leads with it
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     company_name = Column(String, index=True, nullable=False)
     role = Column(String, nullable=False)
     application_date = Column(Date)
+    # The status's canonical name, kept next to status_id so lists, search and exports need no join
     status = Column(String)
+    status_id = Column(Integer, ForeignKey("statuses.id"), nullable=True)
     contact_person = Column(String, nullable=True)
     phone = Column(String, nullable=True)
     url = Column(String, nullable=True)
@@ -22,14 +79,119 @@ class JobApplication(Base):
     health_coverage = Column(Boolean, default=False)
     pto = Column(String, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
+    # Row versioning: every write in app/crud.py sets updated_at and bumps version
+    # (note writes bump their application too); app/conditional.py builds ETags from them.
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+    # Maintained by database triggers on PostgreSQL (see app/search.py); not mapped, so the ORM never writes it
+    search_vector = Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True)
+
+    # passive_deletes: the database cascades note deletion, the ORM never loads notes to delete them
+    notes = relationship("Note", back_populates="application", order_by="desc(Note.id)", passive_deletes=True)
 
-    notes = relationship("Note", back_populates="application", order_by="desc(Note.id)")
+    # Indexes behind per-user queries lead with user_id, so their cost follows one
+    # user's rows. On PostgreSQL the table may also be hash-partitioned by user_id
+    # (see the tenancy migration); its primary key is then (user_id, id).
+    __table_args__ = (
+        # What notes and reminders reference, so they always belong to their application's user
+        Index("uq_job_applications_user_id_id", user_id, id, unique=True),
+        # Serves the paginated list views: WHERE user_id = ? AND is_active = ? ORDER BY application_date DESC, id DESC
+        Index("ix_job_applications_user_active_date_id", user_id, is_active, application_date.desc(), id.desc()),
+        # Serves status-filtered list pages (... AND status_id = ? ORDER BY ...) and per-view status facet counts
+        Index("ix_job_applications_user_active_status_date_id", user_id, is_active, status_id, application_date.desc(), id.desc()),
+        # Status facets over all of a user's applications
+        Index("ix_job_applications_user_status_id", user_id, status_id),
+        # Serves the conditional-request probe: max(updated_at) per view, and the follow-ups on /upcoming
+        Index("ix_job_applications_user_active_updated_at", user_id, is_active, updated_at),
+        # Upcoming interviews on /upcoming
+        Index("ix_job_applications_user_active_interview_date", user_id, is_active, interview_date),
+        # The reminder scheduler works across all users: follow-up windows and change sync,
+        # and interview windows (app/reminders.py)
+        Index("ix_job_applications_active_updated_at", is_active, updated_at),
+        Index("ix_job_applications_active_interview_date", is_active, interview_date),
+        # Full-text and trigram (substring / fuzzy) search, per user (btree_gin supplies user_id's GIN operator class)
+        Index("ix_job_applications_user_search_vector", user_id, "search_vector", postgresql_using="gin"),
+        Index("ix_job_applications_user_company_name_trgm", user_id, company_name, postgresql_using="gin", postgresql_ops={"company_name": "gin_trgm_ops"}),
+        Index("ix_job_applications_user_role_trgm", user_id, role, postgresql_using="gin", postgresql_ops={"role": "gin_trgm_ops"}),
+        # Importer deduplication looks rows up by normalized company name
+        Index("ix_job_applications_user_company_name_key", user_id, normalized_name(company_name)),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
 class Note(Base):
     __tablename__ = "notes"
 
     id = Column(Integer, primary_key=True, index=True)
+    # Always the application's user (the foreign key includes it); lets the activity feed
+    # be read per user and notes be partitioned alongside their applications
+    user_id = Column(Integer, nullable=False)
     content = Column(Text, nullable=False)
-    application_id = Column(Integer, ForeignKey("job_applications.id"))
+    application_id = Column(Integer)
+    # NULL only for old notes whose content has no timestamp prefix to backfill from
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+
+    application = relationship("JobApplication", back_populates="notes")
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            [user_id, application_id], ["job_applications.user_id", "job_applications.id"], ondelete="CASCADE",
+        ),
+        # Serves the detail page's notes pages (WHERE application_id = ? ORDER BY id DESC)
+        # and the list's per-application note counts
+        Index("ix_notes_application_id_id", application_id, id.desc()),
+        # Serves the activity feed (WHERE user_id = ? ORDER BY created_at DESC, id DESC, optionally within a time range)
+        Index("ix_notes_user_created_at_id", user_id, created_at.desc(), id.desc()),
+    )
+
+class ApplicationStat(Base):
+    """One running counter of the pipeline dashboard; maintained by app/stats.py, never edited directly."""
+    __tablename__ = "application_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    metric = Column(String, nullable=False)  # e.g. "status", "week", "salary_band"
+    bucket = Column(String, nullable=False)  # e.g. "Offer", "2026-03-02", "Offer|100000"
+    count = Column(Integer, default=0, server_default="0", nullable=False)
+    total = Column(Numeric(16, 2), default=0, server_default="0", nullable=False)  # Salary sum, for "salary" rows
+
+    __table_args__ = (
+        PrimaryKeyConstraint(user_id, metric, bucket),
+    )
+
+class Reminder(Base):
+    """A reminder fired by the scheduler in app/reminders.py; unique per due item, so one worker records (and sends) it."""
+    __tablename__ = "reminders"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    application_id = Column(Integer, nullable=False)
+    kind = Column(String, nullable=False)  # "interview" or "follow_up"
+    due_at = Column(DateTime(timezone=True), nullable=False)
+    fired_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now(), nullable=False)
+    message = Column(Text, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            [user_id, application_id], ["job_applications.user_id", "job_applications.id"], ondelete="CASCADE",
+        ),
+        UniqueConstraint(application_id, kind, due_at, name="uq_reminders_application_kind_due"),
+        # Recent reminders on the /upcoming page
+        Index("ix_reminders_user_fired_at", user_id, fired_at.desc()),
+    )
+
+class DeletedRow(Base):
+    """A tombstone written by a trigger when an application, note or reminder is deleted; incremental backups replay them (see app/backup.py)."""
+    __tablename__ = "deleted_rows"
+
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    row_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    application = relationship("JobApplication", back_populates="notes") 
\ No newline at end of file
+    __table_args__ = (
+        # An incremental backup reads one table's tombstones newer than its base
+        Index("ix_deleted_rows_table_name_deleted_at", table_name, deleted_at),
+    )
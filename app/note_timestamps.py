@@ -0,0 +1,111 @@
+"""
+Backfill of `notes.created_at` from the "[YYYY-mm-dd HH:MM:SS] -- " prefix that
+the note form wrote into every note's content before notes had that column (new
+notes are stored as typed; their time is created_at alone).
+
+Runs in batches ordered by id, each committed on its own, and only ever selects
+notes whose created_at is still NULL, so an interrupted backfill resumes where
+it stopped when run again. Notes without a parseable prefix keep NULL.
+
+The migration that adds the activity index runs a frozen copy of it; for very
+large tables it can also be run (or re-run) ahead of time from the web container:
+
+    python -m app.note_timestamps --batch-size 20000
+"""
+import argparse
+import os
+import re
+import sys
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import DateTime, bindparam, create_engine, text
+from sqlalchemy.engine import Connection
+
+from .preflight import sync_url
+
+DEFAULT_BATCH_SIZE = 10_000
+
+_PREFIX_RE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\] -- ")
+
+_SELECT_BATCH = text("""
+    SELECT id, content FROM notes
+    WHERE created_at IS NULL AND id > :last_id
+    ORDER BY id
+    LIMIT :batch_size
+""")
+# Typed so each dialect stores the value the way the ORM column does
+_UPDATE_NOTE = text("UPDATE notes SET created_at = :created_at WHERE id = :note_id").bindparams(
+    bindparam("created_at", type_=DateTime(timezone=True)),
+)
+
+
+def parse_note_timestamp(content: Optional[str]) -> Optional[datetime]:
+    """The time in a note's content prefix, or None if it has none."""
+    match = _PREFIX_RE.match(content or "")
+    if match is None:
+        return None
+    try:
+        stamp = datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+    # The form stamps notes with the server's local clock, which is UTC in the container
+    return stamp.replace(tzinfo=timezone.utc)
+
+
+def backfill_note_created_at(
+    connection: Connection,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Optional[Callable[[int, int], None]] = None,
+    commit: bool = True,
+) -> int:
+    """
+    Set created_at from the content prefix on notes that lack it; returns how many were set.
+
+    Commits after every batch unless `commit` is False, which is for connections
+    already in autocommit mode (an Alembic autocommit block).
+    """
+    last_id = 0
+    scanned = updated = 0
+    while True:
+        rows = connection.execute(_SELECT_BATCH, {"last_id": last_id, "batch_size": batch_size}).all()
+        if not rows:
+            break
+        values = []
+        for note_id, content in rows:
+            created_at = parse_note_timestamp(content)
+            if created_at is not None:
+                values.append({"note_id": note_id, "created_at": created_at})
+        if values:
+            connection.execute(_UPDATE_NOTE, values)
+        if commit:
+            connection.commit()
+        last_id = rows[-1][0]
+        scanned += len(rows)
+        updated += len(values)
+        if progress:
+            progress(scanned, updated)
+    return updated
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Backfill notes.created_at from note content prefixes.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    url = os.getenv("DATABASE_URL", "postgresql+asyncpg://user:password@db/apptrackerdb")
+    engine = create_engine(sync_url(url))
+    try:
+        with engine.connect() as connection:
+            updated = backfill_note_created_at(
+                connection, args.batch_size,
+                progress=lambda scanned, done: print(f"scanned {scanned}, set {done}", file=sys.stderr),
+            )
+    finally:
+        engine.dispose()
+    print(f"Set created_at on {updated} notes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Lists are ordered by a fixed tuple of sort keys, all descending. A cursor is
+the sort-key values of the row at the edge of a page, encoded as an opaque
+url-safe token. Fetching the next page is then a range condition on those keys
+("rows strictly after this tuple") which the database answers from an index
+range scan, no matter how deep into the list the page is. Besides the exact
+"strictly after" condition, which is an OR of one branch per key and gives the
+planner no index bound, every cursor also adds a plain range on the first key
+that the condition implies, so the scan starts at the cursor.
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, false, or_, true
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """One column of a keyset ordering. Ordering is always DESC; nullable keys sort NULLS FIRST."""
+    column: Any
+    nullable: bool = False
+    kind: str = "int"  # how the value is stored in a cursor: "int", "float", "date" or "datetime"
+
+    def order_by(self, backwards: bool = False):
+        if backwards:
+            clause = self.column.asc()
+            return clause.nulls_last() if self.nullable else clause
+        clause = self.column.desc()
+        return clause.nulls_first() if self.nullable else clause
+
+
+@dataclass
+class Page:
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = [v.isoformat() if isinstance(v, date) else v for v in values]
+    payload = json.dumps(raw, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[SortKey]) -> Tuple[Any, ...]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if not isinstance(raw, list) or len(raw) != len(keys):
+        raise InvalidCursor("Cursor does not match this listing")
+
+    values = []
+    for key, value in zip(keys, raw):
+        if value is None:
+            if not key.nullable:
+                raise InvalidCursor("Cursor does not match this listing")
+            values.append(None)
+            continue
+        try:
+            if key.kind == "datetime":
+                values.append(datetime.fromisoformat(value))
+            elif key.kind == "date":
+                values.append(date.fromisoformat(value))
+            elif key.kind == "float":
+                values.append(float(value))
+            else:
+                values.append(int(value))
+        except (ValueError, TypeError) as e:
+            raise InvalidCursor("Cursor does not match this listing") from e
+    return tuple(values)
+
+
+def _strictly_past(key: SortKey, value: Any, backwards: bool):
+    # "Past" means later in the listing order, or earlier when paging backwards.
+    # DESC NULLS FIRST puts NULL ahead of every value.
+    if not backwards:
+        if value is None:
+            return key.column.isnot(None)
+        return key.column < value
+    if value is None:
+        return false()
+    if key.nullable:
+        return or_(key.column > value, key.column.is_(None))
+    return key.column > value
+
+
+def _equal(key: SortKey, value: Any):
+    if value is None:
+        return key.column.is_(None)
+    return key.column == value
+
+
+def _at_or_past(key: SortKey, value: Any, backwards: bool):
+    # Redundant with the keyset branches, but sargable: a range on the leading key's index column
+    if not backwards:
+        return true() if value is None else key.column <= value
+    if value is None:
+        return key.column.is_(None)
+    if key.nullable:
+        return or_(key.column >= value, key.column.is_(None))
+    return key.column >= value
+
+
+def keyset_condition(keys: Sequence[SortKey], values: Sequence[Any], backwards: bool = False):
+    """Rows strictly after `values` in the (key0 DESC, key1 DESC, ...) ordering, or before it when backwards."""
+    branches = []
+    for i, key in enumerate(keys):
+        prefix = [_equal(k, v) for k, v in zip(keys[:i], values[:i])]
+        branches.append(and_(*prefix, _strictly_past(key, values[i], backwards)))
+    if len(branches) < 2:
+        return branches[0] if branches else true()
+    return and_(_at_or_past(keys[0], values[0], backwards), or_(*branches))
+
+
+def paginate_query(query, keys: Sequence[SortKey], limit: int, after: Optional[str] = None, before: Optional[str] = None):
+    """
+    Apply ordering, cursor range and LIMIT to `query`.
+
+    Returns the query plus a flag saying whether results come back in reverse
+    order (paging backwards) and must be flipped by `build_page`.
+    """
+    backwards = before is not None and after is None
+    cursor = before if backwards else after
+    if cursor:
+        query = query.where(keyset_condition(keys, decode_cursor(cursor, keys), backwards))
+    query = query.order_by(*(k.order_by(backwards) for k in keys))
+    # One extra row tells us whether another page exists without a COUNT(*)
+    return query.limit(limit + 1), backwards
+
+
+def build_page(rows: Sequence[Any], keys_of, limit: int, backwards: bool, has_cursor: bool) -> Page:
+    """Trim the look-ahead row, restore display order and compute neighbour cursors."""
+    rows = list(rows)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    page = Page(items=rows)
+    if not rows:
+        return page
+    if backwards:
+        page.prev_cursor = encode_cursor(keys_of(rows[0])) if has_more else None
+        page.next_cursor = encode_cursor(keys_of(rows[-1]))
+    else:
+        page.next_cursor = encode_cursor(keys_of(rows[-1])) if has_more else None
+        page.prev_cursor = encode_cursor(keys_of(rows[0])) if has_cursor else None
+    return page
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Startup preflight: wait for the database and bring the schema to head, over one connection.
+
+The migration heads are read straight from the revision files (no Alembic
+import), then compared with the database's `alembic_version`. Alembic is only
+imported and run when a migration is actually pending, on the same
+connection, so a normal restart costs one connect and one query. Each phase is
+logged with its duration.
+
+    python -m app.preflight            # wait, check, migrate if needed
+    python -m app.preflight --check    # exit 1 if a migration is pending, never migrate
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Set, Tuple
+
+from sqlalchemy import create_engine, inspect, pool, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+
+APP_DIR = Path(__file__).parent
+ALEMBIC_INI = APP_DIR / "alembic.ini"
+MIGRATIONS_DIR = APP_DIR / "migrations"
+
+DATABASE_URL = os.getenv("DATABASE_URL", "postgresql+asyncpg://user:password@db/apptrackerdb")
+MAX_TRIES = int(os.getenv("PREFLIGHT_MAX_TRIES", "30"))
+WAIT_SECONDS = float(os.getenv("PREFLIGHT_WAIT_SECONDS", "1"))
+
+logger = logging.getLogger("app.preflight")
+
+_REVISION_RE = re.compile(r"^revision(?:\s*:\s*[^=]+)?\s*=\s*['\"](\w+)['\"]", re.MULTILINE)
+_DOWN_REVISION_RE = re.compile(r"^down_revision(?:\s*:\s*[^=]+)?\s*=\s*(.+)$", re.MULTILINE)
+
+
+# Async driver -> the sync driver in requirements.txt. Named explicitly: SQLAlchemy's
+# default for a bare postgresql:// URL is not psycopg2 in every version.
+SYNC_DRIVERS = {"+asyncpg": "+psycopg2", "+aiosqlite": ""}
+
+
+def sync_url(url: str) -> str:
+    """The same database through a sync driver (psycopg2 / pysqlite), as Alembic uses."""
+    for async_driver, sync_driver in SYNC_DRIVERS.items():
+        url = url.replace(async_driver, sync_driver)
+    return url
+
+
+@contextmanager
+def _phase(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        logger.info("preflight %s: %.1f ms", name, (time.perf_counter() - start) * 1000)
+
+
+def script_revisions(versions_dir: Path = MIGRATIONS_DIR / "versions") -> Tuple[Set[str], Set[str]]:
+    """(all revisions, head revisions) of the migration scripts; heads are those nothing builds on."""
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION_RE.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down = _DOWN_REVISION_RE.search(source)
+        if down is not None:
+            parents.update(re.findall(r"['\"](\w+)['\"]", down.group(1)))
+    return revisions, revisions - parents
+
+
+def connect(url: str, max_tries: int = MAX_TRIES, wait_seconds: float = WAIT_SECONDS) -> Connection:
+    """One connection, retried until the database accepts it."""
+    engine = create_engine(sync_url(url), poolclass=pool.NullPool)
+    attempt = 1
+    while True:
+        try:
+            return engine.connect()
+        except (OperationalError, OSError) as e:
+            if attempt >= max_tries:
+                raise
+            logger.info("database not ready (attempt %d/%d): %s", attempt, max_tries, str(e).splitlines()[0])
+            attempt += 1
+            time.sleep(wait_seconds)
+
+
+def database_revisions(connection: Connection) -> Set[str]:
+    if not inspect(connection).has_table("alembic_version"):
+        return set()
+    return {row[0] for row in connection.execute(text("SELECT version_num FROM alembic_version"))}
+
+
+def upgrade(connection: Connection) -> None:
+    # Imported here: a restart with nothing to migrate never loads Alembic
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    # env.py runs on this connection instead of opening its own
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
+def preflight(url: str = DATABASE_URL, migrate: bool = True) -> Optional[bool]:
+    """
+    Wait for the database and migrate it to head if needed.
+
+    Returns True if migrations ran, False if the schema was already current, or
+    None if a migration is pending and `migrate` is False.
+    """
+    started = time.perf_counter()
+    with _phase("scan migration scripts"):
+        revisions, heads = script_revisions()
+    with _phase("connect"):
+        connection = connect(url)
+    try:
+        with _phase("read alembic_version"):
+            current = database_revisions(connection)
+            # Don't hold a transaction open into the migration (some need autocommit blocks)
+            connection.rollback()
+
+        ran = False
+        if current == heads:
+            logger.info("schema is at head %s; skipping migrations", ", ".join(sorted(heads)))
+        elif current and not current <= revisions:
+            # During a rolling deploy older code can start against a newer schema
+            logger.warning("database revision %s is unknown to this code; leaving the schema alone", ", ".join(sorted(current)))
+        elif not migrate:
+            logger.warning("migrations pending: %s -> %s", ", ".join(sorted(current)) or "(empty)", ", ".join(sorted(heads)))
+            return None
+        else:
+            with _phase("migrate"):
+                upgrade(connection)
+            ran = True
+    finally:
+        connection.close()
+    logger.info("preflight total: %.1f ms", (time.perf_counter() - started) * 1000)
+    return ran
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Wait for the database and migrate it to head if needed.")
+    parser.add_argument("--check", action="store_true", help="Only report whether a migration is pending")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    # alembic.ini's logging config (applied if Alembic runs) sets the root to WARNING
+    logger.setLevel(logging.INFO)
+    try:
+        result = preflight(migrate=not args.check)
+    except Exception:
+        logger.exception("preflight failed")
+        return 1
+    return 1 if result is None else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
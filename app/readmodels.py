@@ -0,0 +1,132 @@
+"""
+Read-only query layer for list pages, feeds and exports.
+
+Statements run on the session's connection rather than through the ORM, so no
+instances are built, registered in the identity map or instrumented for change
+tracking. Each row becomes an immutable record: a NamedTuple, which keeps its
+values in one tuple with no per-instance `__dict__` (`__slots__ = ()`) and is
+created in C from the database row. Templates read records like any object
+(`item.company_name`), and JSON endpoints hand them to pydantic-core's
+serializer as dicts, skipping model validation.
+
+Use the ORM (models + crud) for anything that is written back; use records
+for anything that is only displayed or exported.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, List, NamedTuple, Optional, Type, TypeVar
+
+from fastapi import Response
+from pydantic_core import to_json
+from sqlalchemy.engine import Result
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .pagination import Page
+
+R = TypeVar("R", bound=tuple)
+
+
+class ApplicationListItem(NamedTuple):
+    """One row of the application list pages; fields as schemas.JobApplicationSimple."""
+    id: int
+    company_name: str
+    role: str
+    application_date: Optional[date]
+    status: Optional[str]
+    status_id: Optional[int]
+    contact_person: Optional[str]
+    is_active: bool
+    note_count: int
+    last_note_at: Optional[datetime]
+
+
+class ActivityItem(NamedTuple):
+    """One note of the activity feed; fields as schemas.ActivityItem."""
+    note_id: int
+    application_id: int
+    company_name: str
+    role: str
+    content: str
+    created_at: datetime
+
+
+class NoteItem(NamedTuple):
+    id: int
+    application_id: int
+    content: str
+    created_at: Optional[datetime]
+
+
+class UpcomingItem(NamedTuple):
+    """An application on the upcoming page, with when its reminder is due."""
+    id: int
+    company_name: str
+    role: str
+    status: Optional[str]
+    interview_date: Optional[date]
+    updated_at: datetime
+
+
+class ReminderItem(NamedTuple):
+    id: int
+    application_id: int
+    kind: str
+    due_at: datetime
+    fired_at: datetime
+    message: str
+
+
+class ExportRow(NamedTuple):
+    """One exported application; fields and order are exporter.EXPORT_FIELDS."""
+    id: int
+    company_name: str
+    role: str
+    application_date: Optional[date]
+    status: Optional[str]
+    contact_person: Optional[str]
+    phone: Optional[str]
+    url: Optional[str]
+    cover_letter: Optional[bool]
+    interview_date: Optional[date]
+    offer: Optional[bool]
+    salary: Optional[Decimal]
+    equity: Optional[bool]
+    bonus: Optional[float]
+    health_coverage: Optional[bool]
+    pto: Optional[str]
+    is_active: bool
+
+
+def columns(record_type: Type[R]) -> tuple:
+    """Field names of a record, in the order a statement must select them."""
+    return record_type._fields
+
+
+async def execute(db: AsyncSession, statement) -> Result:
+    # The session's connection: its transaction, none of its ORM machinery
+    connection = await db.connection()
+    return await connection.execute(statement)
+
+
+def to_records(record_type: Type[R], rows: Iterable[Any]) -> List[R]:
+    """
+    Records from result rows whose leading columns are the record's fields, in
+    order; trailing columns (e.g. a search relevance used for cursors) are dropped.
+    """
+    rows = list(rows)
+    width = len(record_type._fields)
+    # Records are filled by position, so check the names once per result
+    if rows and tuple(rows[0]._fields[:width]) != record_type._fields:
+        raise ValueError(f"Columns {rows[0]._fields} don't match {record_type.__name__}{record_type._fields}")
+    make = record_type._make
+    return [make(row[:width]) for row in rows]
+
+
+def as_dicts(records: Iterable[tuple]) -> List[dict]:
+    return [record._asdict() for record in records]
+
+
+def page_response(page: Page, **extra: Any) -> Response:
+    """A keyset page of records as JSON, shaped like the *Page schemas."""
+    body = {"items": as_dicts(page.items), "next_cursor": page.next_cursor, "prev_cursor": page.prev_cursor, **extra}
+    return Response(content=to_json(body), media_type="application/json")
@@ -0,0 +1,340 @@
+"""
+Interview and follow-up reminders, scheduled in process.
+
+Each active application is due one reminder:
+
+- interview: at REMINDER_HOUR (server local time) on the day before its interview_date
+- follow_up: FOLLOW_UP_DAYS after its last change (updated_at, which a new note also
+  moves) when it has no interview date
+
+The scheduler runs as a task in the app's lifespan, in one worker at a time:
+with REMINDER_LOCK_FILE set (app/server.py sets it for several workers) a
+worker runs it only while it holds an flock on that file, and the others try
+to take over every REMINDER_SYNC_SECONDS, so a worker that exits is replaced.
+It loads the reminders due
+in the next REMINDER_HORIZON_HOURS into an asyncio min-heap, in keyset batches
+read straight off two indexes, (is_active, interview_date) and
+(is_active, updated_at). It then sleeps until the earliest is due, and loads
+the next window as the horizon approaches.
+
+Schedule changes are picked up incrementally, never by rescanning the table.
+Writes in this process (creating, editing, activating) wake the scheduler.
+Every REMINDER_SYNC_SECONDS it also reads the applications whose updated_at
+moved since its last look, from the same index, which covers the other
+workers. Entries for rescheduled applications are superseded in place, and
+each application is rechecked by primary key just before its reminder fires.
+
+Firing inserts a row into `reminders`, unique per (application, kind, due time).
+Where several schedulers run (several hosts, or no lock file) exactly one
+succeeds, and that one sends the notification: a log line, plus a JSON POST
+when REMINDER_WEBHOOK_URL is set. Notifications are sent as tasks, at most
+REMINDER_NOTIFY_CONCURRENCY at once, so a slow webhook doesn't hold up the
+reminders due after it. One scheduler serves every user; notifications carry
+the user_id they are for.
+"""
+import asyncio
+import heapq
+import logging
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from . import database, metrics, models
+from .pagination import SortKey, keyset_condition
+
+INTERVIEW = "interview"
+FOLLOW_UP = "follow_up"
+KINDS = (INTERVIEW, FOLLOW_UP)
+
+ENABLED = os.getenv("REMINDERS_ENABLED", "1") == "1"
+REMINDER_HOUR = int(os.getenv("REMINDER_HOUR", "9"))
+FOLLOW_UP_DAYS = int(os.getenv("FOLLOW_UP_DAYS", "14"))
+HORIZON = timedelta(hours=float(os.getenv("REMINDER_HORIZON_HOURS", "24")))
+SYNC_SECONDS = float(os.getenv("REMINDER_SYNC_SECONDS", "30"))
+# Reminders that fell due while no worker was running still fire if they are this recent
+CATCH_UP = timedelta(hours=float(os.getenv("REMINDER_CATCH_UP_HOURS", "24")))
+WEBHOOK_URL = os.getenv("REMINDER_WEBHOOK_URL")
+WEBHOOK_TIMEOUT = 10
+NOTIFY_CONCURRENCY = int(os.getenv("REMINDER_NOTIFY_CONCURRENCY", "10"))
+# Only the worker holding an flock on this file runs the scheduler
+LOCK_FILE = os.getenv("REMINDER_LOCK_FILE")
+BATCH_SIZE = 500
+# updated_at is stamped before a write commits, so each sync re-reads a little of the last one
+SYNC_OVERLAP = timedelta(seconds=60)
+
+logger = logging.getLogger("app.reminders")
+
+JA = models.JobApplication
+# What the due times depend on, plus what a reminder says
+_COLUMNS = (JA.id, JA.user_id, JA.is_active, JA.interview_date, JA.updated_at)
+_INTERVIEW_KEYS = (SortKey(JA.interview_date, kind="date"), SortKey(JA.id))
+_FOLLOW_UP_KEYS = (SortKey(JA.updated_at, kind="datetime"), SortKey(JA.id))
+
+DueItem = Tuple[datetime, int, str]
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite hands back the stored UTC timestamps without their zone
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def interview_due_at(interview_date: date) -> datetime:
+    return datetime.combine(interview_date - timedelta(days=1), time(REMINDER_HOUR)).astimezone(timezone.utc)
+
+
+def follow_up_due_at(updated_at: datetime) -> datetime:
+    return as_utc(updated_at) + timedelta(days=FOLLOW_UP_DAYS)
+
+
+def due_reminders(row: Any) -> Dict[str, datetime]:
+    """The reminder an application row (is_active, interview_date, updated_at) is due, by kind."""
+    if not row.is_active:
+        return {}
+    if row.interview_date is not None:
+        return {INTERVIEW: interview_due_at(row.interview_date)}
+    return {FOLLOW_UP: follow_up_due_at(row.updated_at)}
+
+
+def interviews_between(start: datetime, end: datetime, columns=_COLUMNS):
+    """Active applications whose interview reminder may fall in [start, end), by (interview_date, id)."""
+    # Day bounds in local time, where REMINDER_HOUR applies; exact times are checked per row
+    first = start.astimezone().date() + timedelta(days=1)
+    last = end.astimezone().date() + timedelta(days=1)
+    return (
+        select(*columns)
+        .where(JA.is_active.is_(True), JA.interview_date >= first, JA.interview_date <= last)
+        .order_by(*(key.order_by(backwards=True) for key in _INTERVIEW_KEYS))
+    )
+
+
+def follow_ups_between(start: Optional[datetime], end: datetime, columns=_COLUMNS):
+    """Active applications without an interview whose follow-up falls in [start, end), by (updated_at, id)."""
+    query = select(*columns).where(
+        JA.is_active.is_(True), JA.interview_date.is_(None), JA.updated_at < end - timedelta(days=FOLLOW_UP_DAYS),
+    )
+    if start is not None:
+        query = query.where(JA.updated_at >= start - timedelta(days=FOLLOW_UP_DAYS))
+    return query.order_by(*(key.order_by(backwards=True) for key in _FOLLOW_UP_KEYS))
+
+
+def reminder_message(kind: str, row: Any) -> str:
+    if kind == INTERVIEW:
+        return f"Interview with {row.company_name} ({row.role}) on {row.interview_date:%a %d %b %Y}"
+    return f"Follow up with {row.company_name} ({row.role}): no activity for {FOLLOW_UP_DAYS} days"
+
+
+async def notify(reminder: Dict[str, Any]) -> None:
+    logger.info(
+        "Reminder for user %s, application %s: %s", reminder["user_id"], reminder["application_id"], reminder["message"]
+    )
+    metrics.REMINDERS_FIRED.inc(kind=reminder["kind"])
+    if not WEBHOOK_URL:
+        return
+    try:
+        async with httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT) as client:
+            response = await client.post(WEBHOOK_URL, json=reminder)
+            response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.warning("Reminder webhook failed: %s", e)
+
+
+def try_lock(path: str) -> Optional[int]:
+    """A descriptor holding an exclusive flock on `path`, or None if another process holds it; close it to release."""
+    import fcntl  # POSIX only, like the shared cache broker; without a lock file every worker schedules
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+class Scheduler:
+    """This process's reminder timer: a min-heap of (due time, application id, kind)."""
+
+    def __init__(self) -> None:
+        self._heap: List[DueItem] = []
+        # Current due time per (application, kind); heap entries that disagree were superseded
+        self._scheduled: Dict[Tuple[int, str], datetime] = {}
+        self._loaded_until: Optional[datetime] = None
+        self._synced_at: Optional[datetime] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock_fd: Optional[int] = None
+        # Notifications being sent; held here so they aren't garbage-collected mid-send
+        self._sending: Set[asyncio.Task] = set()
+        self._send_slots = asyncio.Semaphore(NOTIFY_CONCURRENCY)
+
+    def start(self) -> None:
+        if not ENABLED or self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="reminder-scheduler")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        # Their reminders are already recorded as fired, so give them the webhook's timeout to finish
+        await self.flush(timeout=WEBHOOK_TIMEOUT)
+        for sending in list(self._sending):
+            sending.cancel()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+        self._heap.clear()
+        self._scheduled.clear()
+        self._loaded_until = self._synced_at = None
+
+    async def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait for the notifications being sent, up to `timeout` seconds."""
+        if self._sending:
+            await asyncio.wait(list(self._sending), timeout=timeout)
+
+    def wake(self) -> None:
+        """Pick up schedule changes now rather than at the next sync; a no-op when not running."""
+        if self._wake is not None:
+            self._wake.set()
+
+    def pending(self) -> int:
+        return len(self._scheduled)
+
+    def _apply(self, rows: List[Any]) -> None:
+        # Schedule each row's reminder if it falls inside the loaded window, and drop any it no longer has.
+        # Synced rows can carry reminders long past (a note on an old interview): those are never fired.
+        oldest = utcnow() - CATCH_UP
+        for row in rows:
+            due = due_reminders(row)
+            for kind in KINDS:
+                key = (row.id, kind)
+                due_at = due.get(kind)
+                if due_at is None or not oldest <= due_at < self._loaded_until:
+                    self._scheduled.pop(key, None)
+                elif self._scheduled.get(key) != due_at:
+                    self._scheduled[key] = due_at
+                    heapq.heappush(self._heap, (due_at, row.id, kind))
+
+    async def _batches(self, query, keys) -> None:
+        cursor = None
+        while True:
+            page = query if cursor is None else query.where(keyset_condition(keys, cursor, backwards=True))
+            async with database.AsyncSessionLocal() as db:
+                rows = (await db.execute(page.limit(BATCH_SIZE))).all()
+            self._apply(rows)
+            if len(rows) < BATCH_SIZE:
+                return
+            cursor = tuple(getattr(rows[-1], key.column.key) for key in keys)
+
+    async def _load(self, start: datetime, end: datetime) -> None:
+        self._loaded_until = end
+        await self._batches(interviews_between(start, end), _INTERVIEW_KEYS)
+        await self._batches(follow_ups_between(start, end), _FOLLOW_UP_KEYS)
+
+    async def _sync(self, now: datetime) -> None:
+        # Both halves of the (is_active, updated_at) index: deactivations cancel reminders
+        query = (
+            select(*_COLUMNS)
+            .where(JA.is_active.in_([True, False]), JA.updated_at > self._synced_at - SYNC_OVERLAP)
+            .order_by(*(key.order_by(backwards=True) for key in _FOLLOW_UP_KEYS))
+        )
+        self._synced_at = now
+        await self._batches(query, _FOLLOW_UP_KEYS)
+
+    async def _fire(self, application_id: int, kind: str, due_at: datetime) -> None:
+        async with database.AsyncSessionLocal() as db:
+            row = (await db.execute(
+                select(*_COLUMNS, JA.company_name, JA.role).where(JA.id == application_id)
+            )).first()
+            # Deleted, deactivated or rescheduled since it was loaded
+            if row is None or due_reminders(row).get(kind) != due_at:
+                return
+            message = reminder_message(kind, row)
+            table = models.Reminder.__table__
+            dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[db.get_bind().dialect.name]
+            result = await db.execute(
+                dialect_insert(table)
+                .values(
+                    user_id=row.user_id, application_id=application_id, kind=kind,
+                    due_at=due_at, fired_at=utcnow(), message=message,
+                )
+                .on_conflict_do_nothing(index_elements=[table.c.application_id, table.c.kind, table.c.due_at])
+                .returning(table.c.id)
+            )
+            reminder_id = result.scalar()
+            await db.commit()
+        # Another worker got there first
+        if reminder_id is None:
+            return
+        task = asyncio.create_task(self._send({
+            "id": reminder_id, "user_id": row.user_id, "application_id": application_id, "kind": kind,
+            "due_at": due_at.isoformat(), "message": message,
+        }))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, reminder: Dict[str, Any]) -> None:
+        async with self._send_slots:
+            try:
+                await notify(reminder)
+            except Exception:
+                logger.exception("Sending reminder %s failed", reminder["id"])
+
+    async def _tick(self) -> float:
+        """Fire what is due, extend the window and sync changes as needed; returns seconds to sleep."""
+        now = utcnow()
+        if self._loaded_until is None:
+            self._synced_at = now
+            await self._load(now - CATCH_UP, now + HORIZON)
+        elif self._wake.is_set() or now - self._synced_at >= timedelta(seconds=SYNC_SECONDS):
+            self._wake.clear()
+            await self._sync(now)
+        if self._loaded_until - now < HORIZON / 2:
+            await self._load(self._loaded_until, now + HORIZON)
+
+        while self._heap and self._heap[0][0] <= now:
+            due_at, application_id, kind = heapq.heappop(self._heap)
+            if self._scheduled.get((application_id, kind)) != due_at:
+                continue
+            del self._scheduled[(application_id, kind)]
+            await self._fire(application_id, kind, due_at)
+
+        wakeups = [SYNC_SECONDS, (self._loaded_until - HORIZON / 2 - now).total_seconds()]
+        if self._heap:
+            wakeups.append((self._heap[0][0] - utcnow()).total_seconds())
+        return max(0.0, min(wakeups))
+
+    async def _run(self) -> None:
+        while LOCK_FILE and self._lock_fd is None:
+            self._lock_fd = try_lock(LOCK_FILE)
+            if self._lock_fd is None:
+                # Another worker is scheduling; the lock is freed if that worker exits
+                await asyncio.sleep(SYNC_SECONDS)
+        while True:
+            try:
+                delay = await self._tick()
+            except Exception:
+                # The database may be restarting; keep what is loaded and try again later
+                logger.exception("Reminder scheduler tick failed")
+                delay = SYNC_SECONDS
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+scheduler = Scheduler()
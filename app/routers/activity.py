@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from .. import crud, readmodels, schemas
+from ..database import get_read_db
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor
+from ..users import get_user_id
+
+router = APIRouter(prefix="/activity", tags=["activity"])
+
+@router.get("", response_model=schemas.ActivityPage)
+async def list_activity(
+    db: AsyncSession = Depends(get_read_db),
+    user_id: int = Depends(get_user_id),
+    since: Optional[datetime] = Query(None, description="Only notes created at or after this time (UTC if no offset)"),
+    until: Optional[datetime] = Query(None, description="Only notes created before this time (UTC if no offset)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    before: Optional[str] = Query(None, description="Opaque cursor from a previous page's prev_cursor"),
+):
+    try:
+        page = await crud.get_activity_page(db, user_id, since=since, until=until, limit=limit, after=after, before=before)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid page cursor")
+    return readmodels.page_response(page)
@@ -0,0 +1,180 @@
+import io
+
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Response, UploadFile
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+
+from .. import crud, importer, readmodels, schemas
+from ..database import get_read_db, get_write_db
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor
+from ..users import get_user_id
+
+router = APIRouter(prefix="/applications", tags=["applications"])
+
+VIEW_FILTERS = {"active": True, "inactive": False, "all": None}
+
+# Upper bound on items per batch request; each batch is one transaction
+MAX_BATCH_SIZE = 1000
+
+def json_response(model: BaseModel, status_code: int = 200) -> Response:
+    # Serialize straight to JSON bytes in pydantic-core instead of going through
+    # FastAPI's jsonable_encoder + json.dumps; matters for large batch/list payloads.
+    return Response(content=model.model_dump_json(), status_code=status_code, media_type="application/json")
+
+def _item_errors(index: int, error: ValidationError, application_id: Optional[int] = None) -> schemas.BatchItemError:
+    return schemas.BatchItemError(
+        index=index,
+        id=application_id,
+        errors=error.errors(include_url=False, include_context=False, include_input=False),
+    )
+
+def _check_batch_size(items: List[Any]) -> None:
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {MAX_BATCH_SIZE} items)")
+
+@router.get("", response_model=schemas.JobApplicationPage)
+async def list_applications(
+    db: AsyncSession = Depends(get_read_db),
+    user_id: int = Depends(get_user_id),
+    view: str = Query("active", pattern="^(active|inactive|all)$"),
+    search: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    before: Optional[str] = Query(None, description="Opaque cursor from a previous page's prev_cursor"),
+    status: Optional[int] = Query(None, ge=0, description="Only this status id (0: no status)"),
+    facets: bool = Query(False, description="Include per-status counts for the view and search"),
+):
+    try:
+        page = await crud.get_job_application_list(
+            db, user_id, limit=limit, is_active=VIEW_FILTERS[view], search_term=search, after=after, before=before, status_id=status
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid page cursor")
+    # Items are records; they are serialized as JobApplicationPage without being validated into it
+    return readmodels.page_response(
+        page,
+        facets=await crud.get_status_facets(db, user_id, is_active=VIEW_FILTERS[view], search_term=search) if facets else None,
+    )
+
+# --- Batch endpoints ---
+# Declared before the /{application_id} routes so "batch" is never parsed as an id.
+# Items are validated one by one: invalid items are reported with their index and
+# the valid remainder is written in a single transaction.
+
+@router.post("/batch", response_model=schemas.BatchCreateResult)
+async def create_applications_batch(
+    items: List[Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_write_db),
+    user_id: int = Depends(get_user_id),
+):
+    _check_batch_size(items)
+    valid: List[schemas.JobApplicationCreate] = []
+    errors: List[schemas.BatchItemError] = []
+    for index, item in enumerate(items):
+        try:
+            valid.append(schemas.JobApplicationCreate.model_validate(item))
+        except ValidationError as e:
+            errors.append(_item_errors(index, e))
+
+    created = await crud.create_job_applications(db, user_id, valid)
+    status_code = 201 if created else 422 if errors else 200
+    return json_response(schemas.BatchCreateResult(created=created, errors=errors), status_code=status_code)
+
+@router.patch("/batch", response_model=schemas.BatchUpdateResult)
+async def update_applications_batch(
+    items: List[Dict[str, Any]] = Body(...),
+    db: AsyncSession = Depends(get_write_db),
+    user_id: int = Depends(get_user_id),
+):
+    _check_batch_size(items)
+    updates: Dict[int, schemas.JobApplicationUpdate] = {}
+    positions: Dict[int, int] = {}
+    errors: List[schemas.BatchItemError] = []
+    for index, item in enumerate(items):
+        try:
+            item_update = schemas.JobApplicationBatchUpdate.model_validate(item)
+        except ValidationError as e:
+            errors.append(_item_errors(index, e, item.get("id") if isinstance(item.get("id"), int) else None))
+            continue
+        if item_update.id in updates:
+            errors.append(schemas.BatchItemError(
+                index=index, id=item_update.id,
+                errors=[{"type": "duplicate_id", "msg": "Application id appears more than once in this batch"}],
+            ))
+            continue
+        updates[item_update.id] = item_update
+        positions[item_update.id] = index
+
+    updated = await crud.update_job_applications(db, user_id, updates)
+    found = set(updated)
+    for application_id, index in positions.items():
+        if application_id not in found:
+            errors.append(schemas.BatchItemError(
+                index=index, id=application_id,
+                errors=[{"type": "not_found", "msg": "Application not found"}],
+            ))
+    errors.sort(key=lambda e: e.index)
+    return json_response(schemas.BatchUpdateResult(updated=updated, errors=errors))
+
+@router.post("/batch/state", response_model=schemas.ApplicationStateChangeResult)
+async def change_applications_state(
+    change: schemas.ApplicationStateChange,
+    db: AsyncSession = Depends(get_write_db),
+    user_id: int = Depends(get_user_id),
+):
+    _check_batch_size(change.ids)
+    changed = await crud.set_job_applications_state(db, user_id, change.ids, change.action)
+    affected = set(changed)
+    not_found = [i for i in dict.fromkeys(change.ids) if i not in affected]
+    return json_response(schemas.ApplicationStateChangeResult(action=change.action, changed=changed, not_found=not_found))
+
+@router.post("/import", response_model=schemas.ImportResult)
+async def import_applications(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Defaults to the file extension"),
+    batch_size: int = Query(importer.DEFAULT_BATCH_SIZE, ge=1, le=MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_write_db),
+    user_id: int = Depends(get_user_id),
+):
+    # The upload is spooled to disk by the multipart parser; records are read from it lazily
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = await importer.import_stream(db, user_id, stream, format or importer.detect_format(file.filename), batch_size)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Import file must be UTF-8 encoded")
+    finally:
+        stream.detach()
+    return json_response(schemas.ImportResult.model_validate(report.__dict__))
+
+# --- Single-item endpoints ---
+
+@router.get("/{application_id}", response_model=schemas.JobApplication)
+async def get_application(
+    application_id: int, db: AsyncSession = Depends(get_read_db), user_id: int = Depends(get_user_id)
+):
+    application = await crud.get_job_application(db, user_id, application_id=application_id, include_notes=True)
+    if application is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return json_response(schemas.JobApplication.model_validate(application))
+
+@router.post("", response_model=schemas.JobApplicationRead, status_code=201)
+async def create_application(
+    application: schemas.JobApplicationCreate,
+    db: AsyncSession = Depends(get_write_db),
+    user_id: int = Depends(get_user_id),
+):
+    db_application = await crud.create_job_application(db=db, user_id=user_id, application=application)
+    return json_response(schemas.JobApplicationRead.model_validate(db_application), status_code=201)
+
+@router.patch("/{application_id}", response_model=schemas.JobApplicationRead)
+async def update_application(
+    application_id: int,
+    application_update: schemas.JobApplicationUpdate,
+    db: AsyncSession = Depends(get_write_db),
+    user_id: int = Depends(get_user_id),
+):
+    db_application = await crud.update_job_application(db=db, user_id=user_id, application_id=application_id, application_update=application_update)
+    if db_application is None:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return json_response(schemas.JobApplicationRead.model_validate(db_application))
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import crud, schemas, stats
+from ..database import get_read_db
+from ..users import get_user_id
+from .applications import json_response
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+@router.get("", response_model=schemas.PipelineStats)
+async def get_stats(
+    db: AsyncSession = Depends(get_read_db),
+    user_id: int = Depends(get_user_id),
+    weeks: int = Query(stats.DEFAULT_WEEKS, ge=1, le=520, description="Weeks in the applications-per-week series"),
+):
+    # Precomputed counters: the cost doesn't depend on how many applications exist
+    return json_response(await crud.get_pipeline_stats(db, user_id, weeks=weeks))
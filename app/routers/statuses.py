@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from .. import crud, schemas
+from ..database import get_read_db
+from ..users import get_user_id
+
+router = APIRouter(prefix="/statuses", tags=["statuses"])
+
+@router.get("", response_model=List[schemas.Status])
+async def list_statuses(db: AsyncSession = Depends(get_read_db), user_id: int = Depends(get_user_id)):
+    # In pipeline order; ids are what ?status= filters on
+    return await crud.get_statuses(db, user_id)
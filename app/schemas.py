@@ -1,6 +1,6 @@
 from pydantic import BaseModel, HttpUrl, Field
-from typing import List, Optional
-from datetime import date
+from typing import Any, Dict, List, Literal, Optional
+from datetime import date, datetime
 from decimal import Decimal
 
 # --- Note Schemas ---
@@ -62,19 +62,136 @@ class JobApplicationUpdate(JobApplicationBase):
 
 class JobApplication(JobApplicationBase):
     id: int
+    status_id: Optional[int] = None
     notes: List[Note] = []
     is_active: bool # Must be present when reading from DB
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True # Changed from orm_mode for Pydantic v2
 
+class JobApplicationRead(JobApplicationBase): # Full record without notes (API create/update responses)
+    id: int
+    status_id: Optional[int] = None
+    is_active: bool
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    version: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
 class JobApplicationSimple(BaseModel): # For listing on the main page
     id: int
     company_name: str
     role: str
     application_date: Optional[date] = None
     status: Optional[str] = None
+    status_id: Optional[int] = None
+    contact_person: Optional[str] = None
     is_active: bool
+    note_count: int = 0
+    last_note_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+class StatusFacet(BaseModel): # Applications per status in a list view
+    status_id: int # 0 for applications without a status
+    name: Optional[str] = None
+    count: int
+
+class Status(BaseModel):
+    id: int
+    name: str
+
+    class Config:
+        from_attributes = True
+
+class JobApplicationPage(BaseModel): # One keyset page of the application list
+    items: List[JobApplicationSimple]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    facets: Optional[List[StatusFacet]] = None # Only when requested with ?facets=true
+
+class ActivityItem(BaseModel): # One note in the cross-application activity feed
+    note_id: int
+    application_id: int
+    company_name: str
+    role: str
+    content: str
+    created_at: datetime
+
+class ActivityPage(BaseModel):
+    items: List[ActivityItem]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+# --- Pipeline Stats Schemas ---
+class SalaryBand(BaseModel):
+    floor: int # Salaries in [floor, floor + salary_band_width)
+    count: int
+
+class StatusStats(BaseModel):
+    status: Optional[str] = None # None groups applications without a status
+    count: int
+    active: int
+    salary_count: int # Applications in this status with a salary
+    salary_average: Optional[Decimal] = None
+    salary_bands: List[SalaryBand] = []
+
+class WeekCount(BaseModel):
+    week_start: date # Monday
+    count: int
+
+class PipelineStats(BaseModel):
+    total: int
+    active: int
+    inactive: int
+    interviews: int # Applications with an interview date
+    offers: int
+    interview_rate: Optional[float] = None # interviews / total
+    offer_rate: Optional[float] = None # offers / total
+    interview_to_offer_rate: Optional[float] = None # offers / interviews
+    by_status: List[StatusStats] = []
+    weekly: List[WeekCount] = [] # Applications by application_date week, oldest first
+    undated: int = 0 # Applications without an application_date
+    salary_band_width: int
+
+# --- Batch API Schemas ---
+class BatchItemError(BaseModel):
+    index: int # Position of the item in the submitted array
+    id: Optional[int] = None
+    errors: List[Dict[str, Any]]
+
+class BatchCreateResult(BaseModel):
+    created: List[int] = [] # New ids, in submission order of the valid items
+    errors: List[BatchItemError] = []
+
+class JobApplicationBatchUpdate(JobApplicationUpdate):
+    id: int
+
+class BatchUpdateResult(BaseModel):
+    updated: List[int] = []
+    errors: List[BatchItemError] = []
+
+class ApplicationStateChange(BaseModel):
+    ids: List[int] = Field(min_length=1)
+    action: Literal["activate", "deactivate", "delete"]
+
+class ApplicationStateChangeResult(BaseModel):
+    action: str
+    changed: List[int] = []
+    not_found: List[int] = []
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+class ImportResult(BaseModel):
+    rows_read: int
+    inserted: int
+    duplicates: int
+    failed: int
+    errors: List[ImportRowError] = []
@@ -0,0 +1,164 @@
+"""
+Indexed search over job applications and their notes.
+
+PostgreSQL: `job_applications.search_vector` is a tsvector over company, role,
+status, contact and the text of every note, kept current by triggers and served
+by a GIN index. A new note is appended to the vector, and changing a searched
+column recomputes only that part of it; editing or deleting a note rebuilds it
+from all of the application's notes. pg_trgm GIN indexes on company_name/role
+cover substring and fuzzy (similarity) matches that full-text search misses.
+All three indexes lead with user_id (btree_gin), so a search only reads the
+searching user's entries.
+
+SQLite: an FTS5 table, `job_applications_fts`, holds the same document keyed by
+application id and is maintained by triggers in the same way. This keeps search
+testable without a Postgres server.
+
+Both backends return a relevance score so results can be ranked; larger is better.
+"""
+import re
+from typing import Tuple
+
+from sqlalchemy import Float, and_, cast, column, func, literal_column, or_, select, table
+
+from . import models
+
+# Text search configuration used for both the stored vectors and the queries
+TS_CONFIG = "english"
+
+FTS_TABLE = "job_applications_fts"
+
+SQLITE_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        company_name, role, status, contact_person, notes,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS job_applications_fts_insert AFTER INSERT ON job_applications BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, company_name, role, status, contact_person, notes)
+        VALUES (new.id, new.company_name, new.role, new.status, new.contact_person, '');
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS job_applications_fts_update
+    AFTER UPDATE OF company_name, role, status, contact_person ON job_applications
+    WHEN old.company_name IS NOT new.company_name OR old.role IS NOT new.role
+        OR old.status IS NOT new.status OR old.contact_person IS NOT new.contact_person
+    BEGIN
+        UPDATE {FTS_TABLE}
+        SET company_name = new.company_name, role = new.role, status = new.status, contact_person = new.contact_person
+        WHERE rowid = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS job_applications_fts_delete AFTER DELETE ON job_applications BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes BEGIN
+        UPDATE {FTS_TABLE}
+        SET notes = CASE WHEN notes = '' THEN new.content ELSE notes || ' ' || new.content END
+        WHERE rowid = new.application_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE OF content ON notes BEGIN
+        UPDATE {FTS_TABLE}
+        SET notes = (SELECT group_concat(content, ' ') FROM notes WHERE application_id = new.application_id)
+        WHERE rowid = new.application_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes BEGIN
+        UPDATE {FTS_TABLE}
+        SET notes = coalesce((SELECT group_concat(content, ' ') FROM notes WHERE application_id = old.application_id), '')
+        WHERE rowid = old.application_id;
+    END""",
+]
+
+SQLITE_FTS_BACKFILL = f"""
+    INSERT INTO {FTS_TABLE}(rowid, company_name, role, status, contact_person, notes)
+    SELECT j.id, j.company_name, j.role, j.status, j.contact_person,
+           coalesce((SELECT group_concat(n.content, ' ') FROM notes n WHERE n.application_id = j.id), '')
+    FROM job_applications j
+"""
+
+SQLITE_FTS_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS notes_fts_delete",
+    "DROP TRIGGER IF EXISTS notes_fts_update",
+    "DROP TRIGGER IF EXISTS notes_fts_insert",
+    "DROP TRIGGER IF EXISTS job_applications_fts_delete",
+    "DROP TRIGGER IF EXISTS job_applications_fts_update",
+    "DROP TRIGGER IF EXISTS job_applications_fts_insert",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# PostgreSQL search triggers (created by the search-indexes migration), per table,
+# and the statement that recomputes every vector; used to pause them during bulk loads
+PG_SEARCH_TRIGGERS = {
+    "job_applications": "job_applications_search_vector_update",
+    "notes": "notes_search_vector_update",
+}
+PG_SEARCH_BACKFILL = """
+    UPDATE job_applications
+    SET search_vector = job_application_search_vector(id, company_name, role, status, contact_person)
+"""
+
+_fts = table(FTS_TABLE, column("rowid"), column("rank"))
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def install_sqlite_fts(connection) -> None:
+    """Create the FTS5 table and triggers on a sync SQLite connection and index existing rows."""
+    for statement in SQLITE_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+    connection.exec_driver_sql(SQLITE_FTS_BACKFILL)
+
+
+def fts5_query(term: str) -> str:
+    # Quote every token so user input can't inject FTS5 syntax; the trailing * makes each a prefix match
+    tokens = _TOKEN_RE.findall(term)
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def apply_search(query, term: str, dialect_name: str, user_id: int) -> Tuple[object, object]:
+    """
+    Restrict `query` (which selects the user's job_applications) to rows matching `term`.
+
+    Returns the filtered query and a relevance expression suitable for ORDER BY ... DESC.
+    """
+    JA = models.JobApplication
+    search_vector = JA.__table__.c.search_vector
+    pattern = _like_pattern(term.strip())
+    substring_match = or_(
+        JA.company_name.ilike(pattern, escape="\\"),
+        JA.role.ilike(pattern, escape="\\"),
+    )
+
+    if dialect_name == "postgresql":
+        ts_query = func.websearch_to_tsquery(TS_CONFIG, term)
+        # The user goes into every arm, so each can be a BitmapOr branch on its (user_id, ...) index
+        condition = or_(*(and_(JA.user_id == user_id, arm) for arm in (
+            search_vector.bool_op("@@")(ts_query),
+            JA.company_name.ilike(pattern, escape="\\"),
+            JA.role.ilike(pattern, escape="\\"),
+            JA.company_name.bool_op("%")(term),  # trigram similarity, tolerates typos
+        )))
+        rank = cast(
+            func.ts_rank_cd(search_vector, ts_query)
+            + func.greatest(func.similarity(JA.company_name, term), func.similarity(JA.role, term)),
+            Float,
+        )
+        return query.where(condition), rank
+
+    if dialect_name == "sqlite":
+        match_expr = fts5_query(term)
+        if not match_expr:
+            return query.where(substring_match), cast(literal_column("0.0"), Float)
+        matches = (
+            select(_fts.c.rowid.label("application_id"), (-_fts.c.rank).label("relevance"))
+            .where(literal_column(FTS_TABLE).op("MATCH")(match_expr))
+            .subquery("fts_matches")
+        )
+        query = query.outerjoin(matches, matches.c.application_id == JA.id)
+        condition = or_(matches.c.application_id.isnot(None), substring_match)
+        return query.where(condition), cast(func.coalesce(matches.c.relevance, 0.0), Float)
+
+    # Any other backend: unindexed substring search, unranked
+    return query.where(substring_match), cast(literal_column("0.0"), Float)
@@ -0,0 +1,105 @@
+"""
+Production server: Gunicorn managing Uvicorn workers.
+
+    python -m app.server               # preflight (wait for DB, migrate if needed), then serve
+    python -m app.server --no-preflight
+
+This module is also the Gunicorn config (`gunicorn -c python:app.server app.main:app`).
+Settings come from the environment:
+
+    WEB_CONCURRENCY     worker processes (default: CPU count)
+    BIND                listen address (default 0.0.0.0:8000)
+    GRACEFUL_TIMEOUT    seconds a worker gets to finish in-flight requests after SIGTERM (default 30)
+    WORKER_TIMEOUT      seconds before a silent worker is killed and replaced (default 60)
+    KEEPALIVE           HTTP keep-alive seconds (default 5)
+    MAX_REQUESTS        recycle a worker after this many requests, with jitter (default 0 = never)
+    PRELOAD_APP=1       import the app, build the stylesheet and compile templates once in
+                        the master, so workers fork with them already in (shared) memory
+
+With more than one worker and no APP_CACHE_BROKER set, the page cache
+(app/cache.py) shares its invalidations through a generations file in the
+temp directory, so a write on one worker invalidates every worker's pages.
+Likewise, without REMINDER_LOCK_FILE set, the reminder scheduler
+(app/reminders.py) is given a lock file there, so one worker runs it at a time.
+
+Each worker creates its own database engine in the app's lifespan and disposes
+of it on shutdown; nothing database-related exists in the master, so preloading
+is fork-safe. Pool sizing is per worker (DB_POOL_SIZE, DB_MAX_OVERFLOW, ... in
+app/database.py).
+
+On SIGTERM Gunicorn stops accepting connections and each worker finishes the
+requests it has, runs the lifespan shutdown (closing its pool) and exits, up
+to GRACEFUL_TIMEOUT.
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+# --- Gunicorn settings ---
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = _env_int("WEB_CONCURRENCY", multiprocessing.cpu_count())
+worker_class = "uvicorn_worker.UvicornWorker"
+graceful_timeout = _env_int("GRACEFUL_TIMEOUT", 30)
+timeout = _env_int("WORKER_TIMEOUT", 60)
+keepalive = _env_int("KEEPALIVE", 5)
+max_requests = _env_int("MAX_REQUESTS", 0)
+max_requests_jitter = max_requests // 10
+preload_app = os.getenv("PRELOAD_APP", "0") == "1"
+accesslog = "-"
+errorlog = "-"
+# Proxies in front of the app (docker, a load balancer) set X-Forwarded-*
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+# This module is evaluated in the master, so every worker inherits the same file (named after the master)
+if workers > 1 and not os.getenv("APP_CACHE_BROKER"):
+    os.environ["APP_CACHE_BROKER"] = "file:" + os.path.join(tempfile.gettempdir(), f"app-cache-generations.{os.getpid()}")
+if workers > 1 and not os.getenv("REMINDER_LOCK_FILE"):
+    os.environ["REMINDER_LOCK_FILE"] = os.path.join(tempfile.gettempdir(), f"app-reminders.{os.getpid()}.lock")
+
+
+def when_ready(server) -> None:
+    from . import database
+
+    per_worker = database.POOL_SIZE + database.MAX_OVERFLOW
+    server.log.info(
+        "%d workers; up to %d database connections (%d per worker)", workers, workers * per_worker, per_worker
+    )
+    server.log.info("page cache invalidation broker: %s", os.getenv("APP_CACHE_BROKER", "local"))
+    server.log.info("reminder scheduler lock: %s", os.getenv("REMINDER_LOCK_FILE", "none, every worker schedules"))
+    if preload_app:
+        # Done once here instead of in every worker's lifespan (where it is then a no-op)
+        from . import assets, templating
+
+        assets.ensure_built()
+        server.log.info("precompiled %d templates before forking", templating.precompile())
+
+
+def main(argv=None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if "--no-preflight" in argv:
+        argv.remove("--no-preflight")
+    else:
+        # Once, in the master: workers never race each other to migrate
+        from . import preflight
+
+        status = preflight.main([])
+        if status:
+            return status
+
+    from gunicorn.app.wsgiapp import WSGIApplication
+
+    sys.argv = ["gunicorn", "-c", "python:app.server", *argv, "app.main:app"]
+    WSGIApplication("%(prog)s [OPTIONS]").run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
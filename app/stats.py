@@ -0,0 +1,262 @@
+"""
+Pipeline analytics kept in the `application_stats` summary table.
+
+Each application contributes a fixed set of facts, such as "1 application with
+status Offer" or "1 application in the week of 2026-03-02". The table stores one
+running counter (and a salary total) per (user, metric, bucket). Every write in
+app/crud.py works out the facts of the rows it changes before and after the
+change and applies the difference to its user's counters in the same
+transaction with one upsert. The dashboard therefore reads a few hundred
+counter rows however many applications there are.
+
+The counters can always be recomputed from `job_applications` with
+
+    python -m app.stats --rebuild
+
+The migrations that fill the table compute the same counters with SQL frozen
+into each revision, so they never depend on this module.
+"""
+import argparse
+import os
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models, schemas
+from .preflight import sync_url
+
+# Width of a salary histogram band
+SALARY_BAND = 25_000
+# Weeks shown in the applications-per-week series, the current one included
+DEFAULT_WEEKS = 26
+REBUILD_BATCH_SIZE = 10_000
+
+# Application columns the facts depend on; writes that change none of them leave the counters alone
+STAT_COLUMNS = ("status", "application_date", "interview_date", "offer", "salary", "is_active")
+
+StatKey = Tuple[str, str]
+
+UNDATED = "undated"
+
+
+@dataclass
+class StatDelta:
+    count: int = 0
+    total: Decimal = Decimal(0)
+
+
+def _field(row: Any, name: str) -> Any:
+    # ORM instances, result rows and plain dicts (bulk values) all describe an application
+    if isinstance(row, Mapping):
+        return row.get(name)
+    return getattr(row, name, None)
+
+
+def stat_columns() -> list:
+    return [getattr(models.JobApplication, column) for column in STAT_COLUMNS]
+
+
+def stat_values(row: Any) -> Dict[str, Any]:
+    """A copy of the fields of `row` that the counters depend on, taken before it is changed."""
+    return {column: _field(row, column) for column in STAT_COLUMNS}
+
+
+def status_label(status: Optional[str]) -> str:
+    return (status or "").strip()
+
+
+def week_start(day: date) -> date:
+    """The Monday of `day`'s ISO week."""
+    return day - timedelta(days=day.weekday())
+
+
+def application_facts(row: Any) -> Iterator[Tuple[str, str, Optional[Decimal]]]:
+    """(metric, bucket, salary) facts one application contributes to the counters."""
+    status = status_label(_field(row, "status"))
+    # Column defaults (active, no offer) apply to values that were never set
+    is_active = _field(row, "is_active") is not False
+    application_date = _field(row, "application_date")
+
+    yield "applications", "all", None
+    yield "applications", "active" if is_active else "inactive", None
+    yield "status", status, None
+    if is_active:
+        yield "status_active", status, None
+    yield "week", week_start(application_date).isoformat() if application_date else UNDATED, None
+    if _field(row, "interview_date") is not None:
+        yield "interviews", "all", None
+    if _field(row, "offer"):
+        yield "offers", "all", None
+    salary = _field(row, "salary")
+    if salary is not None:
+        salary = Decimal(str(salary))
+        yield "salary", status, salary
+        yield "salary_band", f"{status}|{int(salary // SALARY_BAND) * SALARY_BAND}", None
+
+
+def add_facts(deltas: Dict[StatKey, StatDelta], row: Any, sign: int) -> None:
+    for metric, bucket, salary in application_facts(row):
+        delta = deltas[(metric, bucket)]
+        delta.count += sign
+        if salary is not None:
+            delta.total += sign * salary
+
+
+def stat_deltas(changes: Iterable[Tuple[Any, Any]]) -> Dict[StatKey, StatDelta]:
+    """
+    Net counter changes for (before, after) pairs of application rows; None on
+    either side is an insert or a delete. Facts that cancel out are dropped.
+    """
+    deltas: Dict[StatKey, StatDelta] = defaultdict(StatDelta)
+    for before, after in changes:
+        if before is not None:
+            add_facts(deltas, before, -1)
+        if after is not None:
+            add_facts(deltas, after, +1)
+    return {key: delta for key, delta in deltas.items() if delta.count or delta.total}
+
+
+def _upsert(dialect_name: str, rows: List[dict]):
+    table = models.ApplicationStat.__table__
+    dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[dialect_name]
+    statement = dialect_insert(table).values(rows)
+    # Increment in place: concurrent writers never read-modify-write the same counter
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.metric, table.c.bucket],
+        set_={
+            "count": table.c["count"] + statement.excluded["count"],
+            "total": table.c.total + statement.excluded.total,
+        },
+    )
+
+
+def _delta_rows(deltas: Dict[StatKey, StatDelta], user_id: int) -> List[dict]:
+    # Sorted, so two transactions always lock shared counter rows in the same order
+    return [
+        {"user_id": user_id, "metric": metric, "bucket": bucket, "count": delta.count, "total": delta.total}
+        for (metric, bucket), delta in sorted(deltas.items())
+    ]
+
+
+async def apply_stat_deltas(db: AsyncSession, user_id: int, deltas: Dict[StatKey, StatDelta]) -> None:
+    """Add `deltas` to `user_id`'s counters in `db`'s transaction; the caller commits."""
+    if deltas:
+        await db.execute(_upsert(db.get_bind().dialect.name, _delta_rows(deltas, user_id)))
+
+
+async def record_changes(db: AsyncSession, user_id: int, changes: Iterable[Tuple[Any, Any]]) -> None:
+    await apply_stat_deltas(db, user_id, stat_deltas(changes))
+
+
+def rebuild_stats(connection: Connection, commit: bool = True) -> int:
+    """
+    Recompute every counter from `job_applications`; returns how many applications were counted.
+
+    On PostgreSQL the applications table is share-locked for the duration, so
+    writes wait instead of applying deltas to counters that are being replaced.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("LOCK TABLE job_applications IN SHARE MODE")
+    deltas: Dict[int, Dict[StatKey, StatDelta]] = defaultdict(lambda: defaultdict(StatDelta))
+    counted = 0
+    result = connection.execute(
+        select(models.JobApplication.user_id, *stat_columns()),
+        execution_options={"yield_per": REBUILD_BATCH_SIZE},
+    )
+    for row in result:
+        add_facts(deltas[row.user_id], row, +1)
+        counted += 1
+    connection.execute(delete(models.ApplicationStat))
+    rows = []
+    for user_id in sorted(deltas):
+        rows += _delta_rows(deltas[user_id], user_id)
+    if rows:
+        connection.execute(insert(models.ApplicationStat), rows)
+    if commit:
+        connection.commit()
+    return counted
+
+
+# --- Reading ---
+
+def summarize(rows: Iterable[Any], today: date, weeks: int = DEFAULT_WEEKS) -> schemas.PipelineStats:
+    """Turn counter rows (metric, bucket, count, total) into the dashboard's numbers."""
+    counters: Dict[str, Dict[str, Tuple[int, Decimal]]] = defaultdict(dict)
+    for metric, bucket, count, total in rows:
+        if count:
+            counters[metric][bucket] = (count, total)
+
+    def count_of(metric: str, bucket: str = "all") -> int:
+        return counters[metric].get(bucket, (0, 0))[0]
+
+    bands: Dict[str, List[schemas.SalaryBand]] = defaultdict(list)
+    for bucket, (count, _) in counters["salary_band"].items():
+        status, floor = bucket.rsplit("|", 1)
+        bands[status].append(schemas.SalaryBand(floor=int(floor), count=count))
+
+    by_status = []
+    for status, (count, _) in counters["status"].items():
+        salary_count, salary_total = counters["salary"].get(status, (0, Decimal(0)))
+        by_status.append(schemas.StatusStats(
+            status=status or None,
+            count=count,
+            active=count_of("status_active", status),
+            salary_count=salary_count,
+            salary_average=(Decimal(salary_total) / salary_count).quantize(Decimal("0.01")) if salary_count else None,
+            salary_bands=sorted(bands[status], key=lambda band: band.floor),
+        ))
+    by_status.sort(key=lambda s: (-s.count, s.status or ""))
+
+    current = week_start(today)
+    weekly = [
+        schemas.WeekCount(week_start=start, count=count_of("week", start.isoformat()))
+        for start in (current - timedelta(weeks=n) for n in range(weeks - 1, -1, -1))
+    ]
+
+    total = count_of("applications")
+    interviews, offers = count_of("interviews"), count_of("offers")
+    return schemas.PipelineStats(
+        total=total,
+        active=count_of("applications", "active"),
+        inactive=count_of("applications", "inactive"),
+        interviews=interviews,
+        offers=offers,
+        interview_rate=interviews / total if total else None,
+        offer_rate=offers / total if total else None,
+        interview_to_offer_rate=offers / interviews if interviews else None,
+        by_status=by_status,
+        weekly=weekly,
+        undated=count_of("week", UNDATED),
+        salary_band_width=SALARY_BAND,
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain the application_stats summary table.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute every counter from job_applications")
+    args = parser.parse_args(argv)
+    if not args.rebuild:
+        parser.print_help()
+        return 2
+
+    url = os.getenv("DATABASE_URL", "postgresql+asyncpg://user:password@db/apptrackerdb")
+    engine = create_engine(sync_url(url))
+    try:
+        with engine.connect() as connection:
+            counted = rebuild_stats(connection)
+    finally:
+        engine.dispose()
+    print(f"Rebuilt pipeline stats from {counted} applications")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Application statuses as rows of the `statuses` lookup table.
+
+Free-text statuses are normalized on every write. Whitespace is collapsed, and a
+known spelling ("interview", "Interviewed ", "on-site") maps onto its canonical
+status ("Interviewing"). Anything else is matched case-insensitively against
+the statuses that already exist and added as a new one if there is no match.
+The application row stores both `status_id`, which is indexed and used for
+filtering and facets, and the status `name`, which the list pages, search index
+and exports read without a join.
+
+Existing rows are mapped by the migration that adds the table. It can also be
+run (or re-run) ahead of a large migration from the web container:
+
+    python -m app.statuses --batch-size 20000
+"""
+import argparse
+import os
+import re
+import sys
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+
+from . import models
+from .preflight import sync_url
+
+DEFAULT_BATCH_SIZE = 10_000
+
+# Canonical statuses in pipeline order, each with the spellings that mean it
+CANONICAL_STATUSES = (
+    ("Applied", ("application sent", "submitted", "sent", "apply")),
+    ("Phone Screen", ("phone screening", "screen", "screening", "phone interview", "recruiter call", "recruiter screen")),
+    ("Interviewing", ("interview", "interviews", "interviewed", "onsite", "on site", "technical interview", "final round")),
+    ("Offer", ("offered", "offer received", "offer extended")),
+    ("Accepted", ("offer accepted", "hired")),
+    ("Rejected", ("rejection", "not selected", "turned down")),
+    ("Withdrawn", ("withdrew",)),
+    ("Ghosted", ("no response", "no reply")),
+)
+# Statuses created from other free text sort after the canonical ones
+OTHER_POSITION = 100
+
+_SEPARATORS_RE = re.compile(r"[\s_-]+")
+
+_SELECT_BATCH = text("""
+    SELECT id, status FROM job_applications
+    WHERE status IS NOT NULL AND status_id IS NULL AND id > :last_id
+    ORDER BY id
+    LIMIT :batch_size
+""")
+_UPDATE_APPLICATION = text("UPDATE job_applications SET status_id = :status_id, status = :status WHERE id = :application_id")
+
+
+def status_key(name: str) -> str:
+    """Case-, whitespace- and separator-insensitive form of a status, unique in the table."""
+    return _SEPARATORS_RE.sub(" ", name).strip().casefold()
+
+
+_ALIASES: Dict[str, str] = {
+    status_key(spelling): name
+    for name, spellings in CANONICAL_STATUSES
+    for spelling in (name, *spellings)
+}
+
+
+def canonical_name(status: Optional[str]) -> Optional[str]:
+    """The canonical spelling of a free-text status, or the tidied text itself; None if blank."""
+    cleaned = " ".join((status or "").split())
+    if not cleaned:
+        return None
+    return _ALIASES.get(status_key(cleaned), cleaned)
+
+
+def canonical_rows() -> list:
+    return [
+        {"name": name, "key": status_key(name), "position": position}
+        for position, (name, _) in enumerate(CANONICAL_STATUSES)
+    ]
+
+
+def resolve_statuses(connection, statuses: Iterable[str]) -> Dict[str, Tuple[int, str]]:
+    """
+    Map free-text statuses to (status id, canonical name), creating missing statuses.
+
+    `connection` is a sync Connection or Session; async callers go through
+    `run_sync`. New statuses are created in the caller's transaction.
+    """
+    names = {status: canonical_name(status) for status in statuses}
+    # A new status is named after the first spelling of it seen
+    wanted: Dict[str, str] = {}
+    for name in names.values():
+        if name is not None:
+            wanted.setdefault(status_key(name), name)
+    if not wanted:
+        return {}
+    Status = models.Status
+    query = select(Status.key, Status.id, Status.name)
+    found = {key: (status_id, name) for key, status_id, name in connection.execute(query.where(Status.key.in_(wanted)))}
+    missing = sorted(set(wanted) - set(found))
+    if missing:
+        dialect = connection.dialect if hasattr(connection, "dialect") else connection.get_bind().dialect
+        dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[dialect.name]
+        # A concurrent writer may be adding the same status; whichever commits first wins
+        connection.execute(
+            dialect_insert(Status.__table__)
+            .values([{"name": wanted[key], "key": key, "position": OTHER_POSITION} for key in missing])
+            .on_conflict_do_nothing(index_elements=[Status.key])
+        )
+        found.update({key: (status_id, name) for key, status_id, name in connection.execute(query.where(Status.key.in_(missing)))})
+    return {status: found[status_key(name)] for status, name in names.items() if name is not None}
+
+
+async def resolve_application_statuses(db, rows: Iterable[dict]) -> None:
+    """Replace the `status` of each application values dict with its canonical name and set `status_id`."""
+    rows = [row for row in rows if "status" in row]
+    resolved = await db.run_sync(resolve_statuses, dict.fromkeys(row["status"] for row in rows if row["status"] is not None))
+    for row in rows:
+        status_id, name = resolved.get(row["status"], (None, None))
+        row["status_id"], row["status"] = status_id, name
+
+
+def backfill_status_ids(
+    connection,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Optional[Callable[[int, int], None]] = None,
+    commit: bool = True,
+) -> int:
+    """
+    Point every application that has a free-text status but no status_id at its
+    status row, rewriting the text to the canonical name; returns how many were mapped.
+
+    Batches are ordered by id and commit on their own unless `commit` is False
+    (an Alembic autocommit block), so an interrupted run resumes where it stopped.
+    """
+    last_id = 0
+    scanned = updated = 0
+    while True:
+        rows = connection.execute(_SELECT_BATCH, {"last_id": last_id, "batch_size": batch_size}).all()
+        if not rows:
+            break
+        resolved = resolve_statuses(connection, dict.fromkeys(status for _, status in rows))
+        values = []
+        for application_id, status in rows:
+            # A blank status becomes NULL rather than a status of its own
+            status_id, name = resolved.get(status, (None, None))
+            values.append({"application_id": application_id, "status_id": status_id, "status": name})
+        connection.execute(_UPDATE_APPLICATION, values)
+        if commit:
+            connection.commit()
+        last_id = rows[-1][0]
+        scanned += len(rows)
+        updated += len(values)
+        if progress:
+            progress(scanned, updated)
+    return updated
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Map free-text application statuses onto the statuses table.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    url = os.getenv("DATABASE_URL", "postgresql+asyncpg://user:password@db/apptrackerdb")
+    engine = create_engine(sync_url(url))
+    try:
+        with engine.connect() as connection:
+            updated = backfill_status_ids(
+                connection, args.batch_size,
+                progress=lambda scanned, done: print(f"scanned {scanned}, mapped {done}", file=sys.stderr),
+            )
+    finally:
+        engine.dispose()
+    print(f"Mapped {updated} application statuses")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+The Jinja2 environment behind every HTML page, plus streamed rendering.
+
+Compiled templates are kept in a `FileSystemBytecodeCache`, so a new worker
+loads ready-made bytecode instead of parsing and compiling every template on
+its first requests; entries are keyed on the template source's checksum and
+can never go stale. Set TEMPLATE_CACHE_DIR to a directory that outlives the
+process (the Docker image fills one at build time with
+`python -m app.templating`); without it Jinja uses a per-user temp directory.
+`precompile()` runs at startup and loads every template into memory.
+
+List pages render through `stream_template`, which feeds `Template.generate()`
+into a `StreamingResponse` in fixed-size chunks: the first bytes leave before
+the last row is rendered, and the page never exists as one string.
+"""
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from . import assets, metrics, statuses
+from .cache import Generations, response_cache
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+# Rendered output is sent in chunks of about this size; Template.generate() yields
+# one string per template node, far too small to send one by one.
+STREAM_CHUNK_SIZE = 16 * 1024
+# Streamed pages up to this size are also kept in the page cache; larger ones
+# would cost the memory that streaming saves, so they are not cached.
+MAX_CACHED_STREAM = 512 * 1024
+
+
+def _bytecode_cache() -> FileSystemBytecodeCache:
+    directory = os.getenv("TEMPLATE_CACHE_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return FileSystemBytecodeCache(directory)
+
+
+environment = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(),
+    bytecode_cache=_bytecode_cache(),
+)
+environment.template_class = metrics.TimedTemplate
+# {{ url_for('static', path=asset_path('app.css')) }} -> the current content-hashed build
+environment.globals["asset_path"] = assets.asset_path
+# Canonical statuses offered by the status inputs
+environment.globals["status_names"] = [name for name, _ in statuses.CANONICAL_STATUSES]
+templates = Jinja2Templates(env=environment)
+
+
+def precompile() -> int:
+    """Load (compiling if needed) every template into the environment; returns how many."""
+    names = environment.list_templates(extensions=["html"])
+    for name in names:
+        environment.get_template(name)
+    return len(names)
+
+
+def _chunks(template, context: Dict[str, Any], cache_key: Optional[Hashable], generations: Generations) -> Iterator[bytes]:
+    buffer, size = [], 0
+    kept, kept_size = ([] if cache_key is not None else None), 0
+    for text in template.generate(context):
+        buffer.append(text)
+        size += len(text)
+        if size >= STREAM_CHUNK_SIZE:
+            chunk = "".join(buffer).encode()
+            buffer, size = [], 0
+            if kept is not None:
+                kept_size += len(chunk)
+                if kept_size <= MAX_CACHED_STREAM:
+                    kept.append(chunk)
+                else:
+                    kept = None
+            yield chunk
+    chunk = "".join(buffer).encode()
+    if kept is not None and kept_size + len(chunk) <= MAX_CACHED_STREAM:
+        kept.append(chunk)
+        response_cache.set(cache_key, b"".join(kept), generations)
+    yield chunk
+
+
+def stream_template(
+    request: Request,
+    name: str,
+    context: Dict[str, Any],
+    headers: Optional[Dict[str, str]] = None,
+    cache_key: Optional[Hashable] = None,
+    generations: Generations = (),
+) -> StreamingResponse:
+    """
+    Render `name` incrementally into a streaming HTML response.
+
+    With `cache_key`, the finished body is stored in the page cache under the
+    `generations` snapshot taken before the page's data was read, as
+    `TemplateResponse` callers do with `response.body`.
+    """
+    template = environment.get_template(name)
+    context = {"request": request, **context}
+    return StreamingResponse(
+        _chunks(template, context, cache_key, generations),
+        media_type="text/html; charset=utf-8",
+        headers=headers,
+    )
+
+
+if __name__ == "__main__":
+    print(f"Compiled {precompile()} templates into {environment.bytecode_cache.directory}")
+    sys.exit(0)
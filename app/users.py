@@ -0,0 +1,118 @@
+"""
+User accounts, and which one a request belongs to.
+
+Every application, note, reminder and stats counter belongs to one user
+(`user_id`), and every function in app/crud.py takes the user it works for.
+Routes get it from the `get_user_id` dependency.
+
+The app does not handle sign-in itself. Run it behind an authenticating reverse
+proxy (oauth2-proxy, Authelia, a VPN gateway, ...) that sets a header with the
+signed-in username, and name that header:
+
+    AUTH_USER_HEADER=X-Forwarded-User
+
+The proxy must strip that header from client requests. Without
+AUTH_USER_HEADER the app is single-user: every request is the `default` user,
+who owns everything created before accounts existed.
+
+Accounts are created with
+
+    python -m app.users add alice bob
+    python -m app.users list
+
+or, with AUTH_AUTO_CREATE_USERS=1, on a username's first request.
+"""
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, Request
+from sqlalchemy import and_, create_engine, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import database, models
+from .preflight import sync_url
+
+USER_HEADER = os.getenv("AUTH_USER_HEADER")
+AUTO_CREATE = os.getenv("AUTH_AUTO_CREATE_USERS", "0") == "1"
+# Created by the tenancy migration as the owner of the existing rows
+DEFAULT_USERNAME = "default"
+MAX_USERNAME_LENGTH = 200
+
+# username -> id, per process; accounts are never renamed, so entries never go stale
+_user_ids: Dict[str, int] = {}
+
+
+async def user_id_for(db: AsyncSession, username: str, create: bool = False) -> Optional[int]:
+    """The id of `username`, creating the account first if `create` is set; None if there is no such user."""
+    User = models.User
+    if create:
+        dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[db.get_bind().dialect.name]
+        await db.execute(dialect_insert(User).values(username=username).on_conflict_do_nothing(index_elements=[User.username]))
+        await db.commit()
+    return (await db.execute(select(User.id).where(User.username == username))).scalar()
+
+
+def request_username(request: Request) -> str:
+    if USER_HEADER is None:
+        return DEFAULT_USERNAME
+    username = request.headers.get(USER_HEADER, "").strip()
+    if not username:
+        raise HTTPException(status_code=401, detail="Not signed in")
+    if len(username) > MAX_USERNAME_LENGTH:
+        raise HTTPException(status_code=400, detail="Username too long")
+    return username
+
+
+async def get_user_id(request: Request) -> int:
+    """Dependency: the id of the user the request is for; a lookup on the primary the first time per process."""
+    username = request_username(request)
+    user_id = _user_ids.get(username)
+    if user_id is None:
+        async with database.AsyncSessionLocal() as db:
+            user_id = await user_id_for(db, username, create=AUTO_CREATE)
+        if user_id is None:
+            raise HTTPException(status_code=403, detail="Unknown user")
+        _user_ids[username] = user_id
+    return user_id
+
+
+# --- Command line ---
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.users", description="Manage user accounts.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Create accounts (existing usernames are left alone)")
+    add.add_argument("usernames", nargs="+")
+    commands.add_parser("list", help="List accounts with their application counts")
+    args = parser.parse_args(argv)
+
+    url = os.getenv("DATABASE_URL", "postgresql+asyncpg://user:password@db/apptrackerdb")
+    engine = create_engine(sync_url(url))
+    User, Stat = models.User, models.ApplicationStat
+    try:
+        with engine.begin() as connection:
+            if args.command == "add":
+                existing = set(connection.execute(select(User.username).where(User.username.in_(args.usernames))).scalars())
+                new = [name for name in dict.fromkeys(args.usernames) if name not in existing]
+                if new:
+                    connection.execute(User.__table__.insert(), [{"username": name} for name in new])
+                print(f"Created {len(new)} users" + (f"; already existed: {', '.join(sorted(existing))}" if existing else ""))
+            else:
+                # Application counts come from each user's pipeline counters, not a scan
+                rows = connection.execute(
+                    select(User.id, User.username, func.coalesce(Stat.count, 0))
+                    .outerjoin(Stat, and_(Stat.user_id == User.id, Stat.metric == "applications", Stat.bucket == "all"))
+                    .order_by(User.id)
+                )
+                for user_id, username, applications in rows:
+                    print(f"{user_id}\t{username}\t{applications} applications")
+    finally:
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
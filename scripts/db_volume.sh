@@ -23,12 +23,18 @@ Commands:
   restore <file>      Cold restore: stop db, wipe & untar, fix perms, start db & web
   dump                Hot dump: pg_dump → backups/dump_<ts>.sql
   load <file>         Hot load: psql < backups/dump_*.sql
+  online [--incremental]
+                      Online snapshot backup, no downtime: python -m app.backup → backups/<ts>-full|incremental
+  online-restore <dir> [--replace]
+                      Parallel restore of an online backup (and the backups it builds on)
 
 Examples:
   $(basename "$0") backup
   $(basename "$0") restore backups/pgdata_20250520_121314.tar.gz
   $(basename "$0") dump
   $(basename "$0") load backups/dump_20250520_121314.sql
+  $(basename "$0") online --incremental
+  $(basename "$0") online-restore backups/20250520T121314Z-incremental
 EOF
   exit 1
 }
@@ -125,6 +131,17 @@ case "$cmd" in
     echo "✅ Load complete."
     ;;
 
+  online)
+    echo "📸 Online backup via '${WEB_SERVICE}'..."
+    docker compose exec -T "$WEB_SERVICE" python -m app.backup backup "$@"
+    ;;
+
+  online-restore)
+    (( $# >= 1 )) || usage
+    echo "↩️  Parallel restore via '${WEB_SERVICE}' from '$1'"
+    docker compose exec -T "$WEB_SERVICE" python -m app.backup restore "$@"
+    ;;
+
   *)
     usage
     ;;
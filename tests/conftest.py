@@ -0,0 +1,75 @@
+"""
+Shared fixtures: a SQLite database migrated to head, copied fresh for each test.
+
+Async tests run on the anyio pytest plugin (installed with FastAPI); mark them
+with `pytest.mark.anyio`.
+"""
+import shutil
+
+import httpx
+import pytest
+
+from app import database, preflight, users
+from app.cache import response_cache
+from app.database import AsyncSessionLocal
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def migrated_database(tmp_path_factory):
+    """A database file brought to head by the same preflight the app runs at startup."""
+    path = tmp_path_factory.mktemp("template") / "template.db"
+    preflight.preflight(f"sqlite:///{path}")
+    return path
+
+
+@pytest.fixture
+def database_path(migrated_database, tmp_path):
+    path = tmp_path / "test.db"
+    shutil.copyfile(migrated_database, path)
+    return path
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def engine(database_path):
+    """This test's engine, bound to the session factory the app uses."""
+    engine = database.init_engine(f"sqlite+aiosqlite:///{database_path}", replica_urls=[])
+    yield engine
+    await database.dispose_engine()
+
+
+@pytest.fixture
+async def db(engine):
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+async def user_id(db):
+    """The `default` user, created by the tenancy migration."""
+    return await users.user_id_for(db, users.DEFAULT_USERNAME)
+
+
+@pytest.fixture
+def user_header(monkeypatch):
+    """The header naming each request's user, as set by an authenticating proxy; accounts are created on first use."""
+    monkeypatch.setattr(users, "USER_HEADER", "X-Forwarded-User")
+    monkeypatch.setattr(users, "AUTO_CREATE", True)
+    # Ids cached by earlier tests belong to their own copies of the database
+    monkeypatch.setattr(users, "_user_ids", {})
+    return "X-Forwarded-User"
+
+
+@pytest.fixture
+async def client(engine):
+    """An HTTP client for the app, in process, acting as the `default` user; the page cache starts empty."""
+    response_cache.clear()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    response_cache.clear()
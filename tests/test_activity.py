@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app import crud, models, schemas
+
+pytestmark = pytest.mark.anyio
+
+
+async def _note_at(db, user_id: int, application_id: int, content: str, created_at) -> int:
+    note = await crud.create_note_for_application(db, user_id, schemas.NoteCreate(content=content), application_id)
+    await db.execute(update(models.Note).where(models.Note.id == note.id).values(created_at=created_at))
+    await db.commit()
+    return note.id
+
+
+@pytest.fixture
+async def notes(db, user_id):
+    """Notes on March 1st to 5th, 2026 at noon UTC, plus one old note without a created_at."""
+    application = await crud.create_job_application(db, user_id, schemas.JobApplicationCreate(company_name="Acme", role="r"))
+    ids = [
+        await _note_at(db, user_id, application.id, f"day {day}", datetime(2026, 3, day, 12, tzinfo=timezone.utc))
+        for day in range(1, 6)
+    ]
+    await _note_at(db, user_id, application.id, "no timestamp", None)
+    return ids
+
+
+async def _contents(client, **params) -> tuple:
+    body = (await client.get("/api/activity", params=params)).json()
+    return [item["content"] for item in body["items"]], body
+
+
+async def test_activity_pages_newest_first_in_both_directions(client, notes):
+    first, body = await _contents(client, limit=2)
+    assert first == ["day 5", "day 4"]
+    assert body["prev_cursor"] is None
+    second, body = await _contents(client, limit=2, after=body["next_cursor"])
+    assert second == ["day 3", "day 2"]
+    third, body = await _contents(client, limit=2, after=body["next_cursor"])
+    assert third == ["day 1"]
+    assert body["next_cursor"] is None
+
+    back, _ = await _contents(client, limit=2, before=body["prev_cursor"])
+    assert back == ["day 3", "day 2"]
+    assert (await client.get("/api/activity", params={"after": "not-a-cursor"})).status_code == 400
+
+
+async def test_activity_since_is_inclusive_and_until_exclusive(client, notes):
+    assert (await _contents(client, since="2026-03-02T12:00:00", until="2026-03-04T12:00:00"))[0] == ["day 3", "day 2"]
+    # Bounds with an offset are compared in UTC: 14:00+02:00 is noon UTC
+    assert (await _contents(client, since="2026-03-04T14:00:00+02:00"))[0] == ["day 5", "day 4"]
+    assert (await _contents(client, until="2026-03-01T12:00:00Z"))[0] == []
+
+
+async def test_the_note_form_stores_the_note_as_typed(client, db, user_id):
+    application = await crud.create_job_application(db, user_id, schemas.JobApplicationCreate(company_name="Acme", role="r"))
+    response = await client.post(f"/applications/{application.id}/notes/new", data={"content": "called the recruiter"})
+    assert response.status_code == 303
+
+    [item] = (await client.get("/api/activity")).json()["items"]
+    assert item["content"] == "called the recruiter"
+    created_at = datetime.fromisoformat(item["created_at"])
+    page = (await client.get(f"/applications/{application.id}")).text
+    assert f'<time datetime="{created_at.isoformat()}"' in page
@@ -0,0 +1,58 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_batch_create_writes_the_valid_items_and_reports_the_rest(client):
+    response = await client.post("/api/applications/batch", json=[
+        {"company_name": "Acme", "role": "Engineer"},
+        {"company_name": "Globex"},
+        {"company_name": "Initech", "role": "Manager", "salary": "100000"},
+    ])
+    assert response.status_code == 201
+    body = response.json()
+    assert len(body["created"]) == 2
+    assert [error["index"] for error in body["errors"]] == [1]
+    assert body["errors"][0]["errors"][0]["loc"] == ["role"]
+
+
+@pytest.mark.parametrize("items, status_code", [([{"company_name": "Acme"}], 422), ([], 200)])
+async def test_batch_create_status_when_nothing_is_created(client, items, status_code):
+    response = await client.post("/api/applications/batch", json=items)
+    assert response.status_code == status_code
+    assert response.json()["created"] == []
+
+
+async def test_batch_update_applies_found_items_and_reports_the_rest(client):
+    created = (await client.post("/api/applications/batch", json=[
+        {"company_name": "Acme", "role": "Engineer"}, {"company_name": "Globex", "role": "Engineer"},
+    ])).json()["created"]
+    acme, globex = created
+
+    response = await client.patch("/api/applications/batch", json=[
+        {"id": acme, "status": "Offer"},
+        {"id": 999999, "status": "Offer"},
+        {"id": globex, "company_name": ""},
+        {"id": acme, "role": "Lead"},
+    ])
+    assert response.status_code == 200
+    body = response.json()
+    assert body["updated"] == [acme]
+    assert [(error["index"], error["errors"][0]["type"]) for error in body["errors"]] == [
+        (1, "not_found"), (2, "string_too_short"), (3, "duplicate_id"),
+    ]
+    assert (await client.get(f"/api/applications/{acme}")).json()["status"] == "Offer"
+    assert (await client.get(f"/api/applications/{globex}")).json()["company_name"] == "Globex"
+
+
+async def test_batch_update_never_touches_another_users_application(client, user_header):
+    alice, bob = {user_header: "alice"}, {user_header: "bob"}
+    [acme] = (await client.post("/api/applications/batch", json=[{"company_name": "Acme", "role": "Engineer"}], headers=alice)).json()["created"]
+    [globex] = (await client.post("/api/applications/batch", json=[{"company_name": "Globex", "role": "Engineer"}], headers=bob)).json()["created"]
+
+    body = (await client.patch("/api/applications/batch", json=[
+        {"id": acme, "status": "Rejected"}, {"id": globex, "status": "Offer"},
+    ], headers=bob)).json()
+    assert body["updated"] == [globex]
+    assert [(error["index"], error["errors"][0]["type"]) for error in body["errors"]] == [(0, "not_found")]
+    assert (await client.get(f"/api/applications/{acme}", headers=alice)).json()["status"] is None
@@ -0,0 +1,31 @@
+import gzip
+import json
+import re
+
+from app import assets
+
+
+def _template_classes() -> set:
+    """Class names in the templates' class attributes, including both branches of Jinja conditionals."""
+    used = set()
+    for path in assets.TEMPLATE_DIR.rglob("*.html"):
+        for value in re.findall(r'class="([^"]*)"', path.read_text(encoding="utf-8")):
+            used.update(re.sub(r"\{[{%#].*?[}%#]\}", " ", value).split())
+    return used
+
+
+def test_build_emits_a_rule_for_every_class_the_templates_use(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "STATIC_DIR", tmp_path)
+    monkeypatch.setattr(assets, "MANIFEST", tmp_path / "manifest.json")
+
+    manifest = assets.build()
+    css = (tmp_path / manifest[assets.STYLESHEET]).read_text(encoding="utf-8")
+    classes = _template_classes()
+    assert {"px-3", "hover:bg-slate-50", "text-sky-600"} <= classes
+    missing = sorted(name for name in classes if not re.search(re.escape("." + assets._escape(name)) + r"[{:\[ ]", css))
+    assert missing == []
+
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+    assert manifest["sources"] == assets.sources_digest()
+    compressed = tmp_path / (manifest[assets.STYLESHEET] + ".gz")
+    assert gzip.decompress(compressed.read_bytes()).decode() == css
@@ -0,0 +1,82 @@
+import shutil
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from app import backup, crud, models, schemas
+
+pytestmark = pytest.mark.anyio
+
+
+def _contents(path) -> dict:
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with engine.connect() as connection:
+            contents = {
+                name: connection.execute(select(*backup.backup_columns(backup._table(name))).order_by("id")).all()
+                for name in backup.TABLES
+            }
+            stats = models.ApplicationStat
+            contents["application_stats"] = connection.execute(
+                select(stats.user_id, stats.metric, stats.bucket, stats.count, stats.total).order_by(stats.user_id, stats.metric, stats.bucket)
+            ).all()
+            return contents
+    finally:
+        engine.dispose()
+
+
+async def _application(db, user_id: int, company_name: str, **values) -> int:
+    application = await crud.create_job_application(
+        db, user_id, schemas.JobApplicationCreate(company_name=company_name, role="Engineer", status="Applied", **values)
+    )
+    await crud.create_note_for_application(db, user_id, schemas.NoteCreate(content=f"{company_name} note"), application.id)
+    db.add(models.Reminder(
+        user_id=user_id, application_id=application.id, kind="follow_up",
+        due_at=datetime(2026, 10, 1, tzinfo=timezone.utc), message=f"Follow up with {company_name}",
+    ))
+    await db.commit()
+    return application.id
+
+
+async def test_full_and_incremental_backups_restore_the_source(db, user_id, database_path, migrated_database, tmp_path):
+    source = f"sqlite:///{database_path}"
+    backups = tmp_path / "backups"
+    kept = await _application(db, user_id, "Kept", salary=90000)
+    edited = await _application(db, user_id, "Edited")
+    removed = await _application(db, user_id, "Removed")
+    full = backup.backup(source, backups, jobs=1)
+
+    await crud.update_job_application(db, user_id, edited, schemas.JobApplicationUpdate(status="Offer", salary=120000))
+    await crud.delete_job_application(db, user_id, removed)
+    await _application(db, user_id, "Added")
+    # Taken within the same second as the full backup otherwise, which would give both the same name
+    incremental = backup.backup(source, backups, incremental=True, jobs=1)
+    assert incremental.name != full.name
+    incremental_dir = backups / incremental.name
+    manifest = backup.read_manifest(incremental_dir)
+    assert manifest["base"] == full.name
+    deleted = {
+        name: [row for chunk in entry["deleted"] for row in backup.read_chunk(incremental_dir, chunk)]
+        for name, entry in manifest["tables"].items() if name in backup.INCREMENTAL_TABLES
+    }
+    assert deleted["job_applications"] == [[user_id, removed]]
+    assert len(deleted["notes"]) == len(deleted["reminders"]) == 1
+
+    target = tmp_path / "target.db"
+    shutil.copyfile(migrated_database, target)
+    report = backup.restore(f"sqlite:///{target}", incremental_dir, jobs=1)
+    assert report.chain == [full.name, incremental.name]
+    assert report.deleted == {"job_applications": 1, "notes": 1, "reminders": 1}
+    assert _contents(target) == _contents(database_path)
+    assert kept in [row.id for row in _contents(target)["job_applications"]]
+
+
+async def test_backup_prunes_tombstones_older_than_its_window(db, user_id, database_path, tmp_path):
+    removed = await _application(db, user_id, "Removed")
+    await crud.delete_job_application(db, user_id, removed)
+    await db.execute(models.DeletedRow.__table__.update().values(deleted_at=datetime.now(timezone.utc) - backup.OVERLAP - timedelta(minutes=1)))
+    await db.commit()
+
+    backup.backup(f"sqlite:///{database_path}", tmp_path / "backups", jobs=1)
+    assert (await db.execute(select(models.DeletedRow))).all() == []
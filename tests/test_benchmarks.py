@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import func, select
+
+from app import models
+from app.benchmarks import datagen, runner
+from app.cache import response_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_a_tiny_seed_runs_and_compares_against_its_own_baseline(engine, db, tmp_path, monkeypatch):
+    # run_benchmarks switches the page cache off for the process
+    monkeypatch.setattr(response_cache, "enabled", response_cache.enabled)
+    report = await datagen.seed(engine, applications=40, notes_per_application=2, users=2, chunk_size=16)
+    assert report.applications == 40
+    assert report.notes == (await db.execute(select(func.count()).select_from(models.Note))).scalar_one()
+
+    current = await runner.run_benchmarks(iterations=2, warmup=0)
+    assert current["meta"]["dataset"]["applications"] == 40
+    assert {result["group"] for result in current["results"].values()} == {"crud", "hydration", "routes"}
+    # The applications created for the write cases are gone again
+    benchmark_writes = select(func.count()).where(models.JobApplication.company_name == runner.BENCH_COMPANY)
+    assert (await db.execute(benchmark_writes)).scalar_one() == 0
+
+    path = tmp_path / "baseline.json"
+    runner.save_report(current, str(path))
+    baseline = runner.load_report(str(path))
+    assert runner.compare_reports(baseline, current) == []
+
+    name = next(iter(baseline["results"]))
+    baseline["results"][name]["queries_per_op"] -= 1
+    baseline["results"][name]["p95_ms"] = current["results"][name]["p95_ms"] / 2
+    regressions = runner.compare_reports(baseline, current)
+    assert {(regression.name, regression.metric) for regression in regressions} == {(name, "p95_ms"), (name, "queries_per_op")}
@@ -0,0 +1,35 @@
+from app.cache import LocalBroker, ResponseCache, SharedFileBroker, application_topic, lists_topic
+
+
+def _cached(cache: ResponseCache, key: str, topics: list) -> None:
+    cache.set(key, key.encode(), cache.snapshot(topics))
+
+
+def test_a_write_invalidates_only_the_pages_that_depend_on_it():
+    cache = ResponseCache(broker=LocalBroker())
+    _cached(cache, "list:1", [lists_topic(1)])
+    _cached(cache, "list:2", [lists_topic(2)])
+    _cached(cache, "detail:7", [application_topic(7)])
+
+    cache.invalidate([lists_topic(1)])
+    assert cache.get("list:1") is None
+    assert cache.get("list:2") == b"list:2"
+    assert cache.get("detail:7") == b"detail:7"
+
+
+def test_a_write_while_a_page_renders_leaves_it_born_stale():
+    cache = ResponseCache(broker=LocalBroker())
+    generations = cache.snapshot([lists_topic(1)])
+    cache.invalidate([lists_topic(1)])
+    cache.set("list:1", b"rendered before the write", generations)
+    assert cache.get("list:1") is None
+
+
+def test_workers_sharing_a_file_broker_see_each_others_invalidations(tmp_path):
+    path = str(tmp_path / "generations")
+    worker, other_worker = ResponseCache(broker=SharedFileBroker(path)), ResponseCache(broker=SharedFileBroker(path))
+    _cached(worker, "detail:7", [application_topic(7)])
+    assert worker.get("detail:7") == b"detail:7"
+
+    other_worker.invalidate([application_topic(7)])
+    assert worker.get("detail:7") is None
@@ -0,0 +1,19 @@
+import pytest
+
+from app import crud, schemas
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_list_pages_are_validated_by_etag_only(client, db, user_id):
+    older = await crud.create_job_application(db, user_id, schemas.JobApplicationCreate(company_name="Older", role="r"))
+    await crud.create_job_application(db, user_id, schemas.JobApplicationCreate(company_name="Newer", role="r"))
+    for path in ("/", "/inactive", "/activity"):
+        assert "Last-Modified" not in (await client.get(path)).headers
+
+    first = await client.get("/")
+    # Deleting a row other than the newest leaves max(updated_at) unchanged
+    await crud.delete_job_application(db, user_id, older.id)
+    since = await client.get("/", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+    assert since.status_code == 200 and "Older" not in since.text
+    assert (await client.get("/", headers={"If-None-Match": first.headers["ETag"]})).status_code == 200
@@ -0,0 +1,43 @@
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app import crud, exporter, importer, schemas, users
+
+pytestmark = pytest.mark.anyio
+
+
+async def _exported(db, user_id: int) -> list:
+    records = []
+    async for chunk in exporter.iter_export_chunks(db, user_id):
+        # Ids differ between the exporting and the importing user
+        records += [row._replace(id=None) for row in chunk.rows]
+    return sorted(records, key=lambda row: row.company_name)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+async def test_export_round_trips_through_the_importer(client, db, user_id, fmt):
+    await crud.create_job_applications(db, user_id, [
+        schemas.JobApplicationCreate(
+            company_name="Acme, Inc.", role="Engineer", application_date=date(2026, 3, 2), status="Interviewing",
+            url="https://acme.example/jobs/1", offer=True, salary=Decimal("120000.50"), bonus=0.1, equity=True,
+            interview_date=date(2026, 3, 20), pto="25 days", is_active=False,
+        ),
+        schemas.JobApplicationCreate(company_name="Globex", role="Manager\nRemote", contact_person="Hank"),
+    ])
+    response = await client.get(f"/export.{fmt}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == exporter.MEDIA_TYPES[fmt]
+
+    importing_user = await users.user_id_for(db, "importer", create=True)
+    report = await importer.import_stream(db, importing_user, io.StringIO(response.text, newline=""), fmt)
+    assert (report.inserted, report.failed) == (2, 0)
+    assert await _exported(db, importing_user) == await _exported(db, user_id)
+
+
+async def test_empty_csv_export_still_has_its_header(client):
+    response = await client.get("/export.csv")
+    assert response.text.splitlines() == [",".join(exporter.EXPORT_FIELDS)]
+    assert (await client.get("/export.ndjson")).text == ""
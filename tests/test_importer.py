@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.dialects import sqlite
+
+from app import crud, importer, models, schemas
+
+pytestmark = pytest.mark.anyio
+
+
+async def _stored(db, user_id: int, company_name: str, role: str) -> int:
+    # Written as given: rows from before the form trimmed input, or edited by hand
+    application = await crud.create_job_application(db, user_id, schemas.JobApplicationCreate(company_name="x", role=role))
+    await db.execute(update(models.JobApplication).where(models.JobApplication.id == application.id).values(company_name=company_name))
+    await db.commit()
+    return application.id
+
+
+@pytest.mark.parametrize("stored", ["  Acme   Corp ", "Acme\tCorp", "ACME\n Corp"])
+async def test_import_skips_rows_matching_stored_names_with_other_whitespace(db, user_id, stored):
+    await _stored(db, user_id, stored, "Engineer")
+    report = await importer.import_records(db, user_id, [
+        (2, {"company_name": "acme corp", "role": "engineer"}),
+        (3, {"company_name": "Acme Corp", "role": "Manager"}),
+    ])
+    assert (report.duplicates, report.inserted) == (1, 1)
+
+
+async def test_stored_names_are_looked_up_through_the_normalized_index(db, user_id):
+    JA = models.JobApplication
+    query = select(JA.company_name).where(JA.user_id == user_id, models.normalized_name(JA.company_name).in_(["acme corp"]))
+    compiled = query.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    plan = " ".join(row[-1] for row in await db.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+    assert "ix_job_applications_user_company_name_key" in plan
@@ -0,0 +1,30 @@
+import re
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+ROUTE_LABELS = 'method="GET",route="/api/applications/{application_id}"'
+
+
+def _sample(text: str, name: str, labels: str) -> float:
+    match = re.search(rf"^{re.escape(name)}\{{{re.escape(labels)}\}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+async def test_metrics_expose_the_request_latency_histogram_by_route_template(client):
+    before = (await client.get("/metrics")).text
+    assert (await client.get("/api/applications/424242")).status_code == 404
+    assert (await client.get("/api/applications/434343")).status_code == 404
+    response = await client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    # Both ids land in one series: labels carry the route template, not the path
+    name = "http_request_duration_seconds_count"
+    assert _sample(text, name, ROUTE_LABELS) - _sample(before, name, ROUTE_LABELS) == 2
+    assert _sample(text, "http_request_duration_seconds_bucket", ROUTE_LABELS + ',le="+Inf"') == _sample(text, name, ROUTE_LABELS)
+    assert "424242" not in text
+    not_found = ROUTE_LABELS + ',status="404"'
+    assert _sample(text, "http_requests_total", not_found) - _sample(before, "http_requests_total", not_found) == 2
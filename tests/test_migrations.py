@@ -0,0 +1,55 @@
+from datetime import date
+from decimal import Decimal
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, select, text
+
+from app import models, preflight, stats, users
+
+# The last revision before user accounts; the ones up to it are applied in the field and stay as they were
+BEFORE_TENANCY = "c3f8a6d2e915"
+
+
+def _upgrade(url: str, revision: str) -> None:
+    engine = create_engine(url)
+    try:
+        with engine.connect() as connection:
+            config = Config(str(preflight.ALEMBIC_INI))
+            config.set_main_option("script_location", str(preflight.MIGRATIONS_DIR))
+            config.attributes["connection"] = connection
+            command.upgrade(config, revision)
+            connection.commit()
+    finally:
+        engine.dispose()
+
+
+def _counters(connection) -> dict:
+    S = models.ApplicationStat
+    rows = connection.execute(select(S.user_id, S.metric, S.bucket, S.count, S.total))
+    return {(user_id, metric, bucket): (count, Decimal(total)) for user_id, metric, bucket, count, total in rows}
+
+
+def test_tenancy_migration_moves_existing_rows_to_the_default_user(tmp_path):
+    url = f"sqlite:///{tmp_path / 'old.db'}"
+    _upgrade(url, BEFORE_TENANCY)
+    engine = create_engine(url)
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("""
+                INSERT INTO job_applications (company_name, role, status, application_date, salary, is_active)
+                VALUES ('Acme', 'r', 'Offer', :day, 95000, 1), ('Globex', 'r', NULL, NULL, NULL, 0)
+            """), {"day": date(2026, 3, 2)})
+            connection.execute(text("INSERT INTO notes (content, application_id) VALUES ('kubernetes', 1)"))
+        # Written behind the app's back, so only the migration's own recount can make the counters right
+        _upgrade(url, "head")
+        with engine.connect() as connection:
+            default_id = connection.execute(select(models.User.id).where(models.User.username == users.DEFAULT_USERNAME)).scalar_one()
+            for table in ("job_applications", "notes"):
+                assert connection.execute(text(f"SELECT DISTINCT user_id FROM {table}")).scalars().all() == [default_id]
+            migrated = _counters(connection)
+            stats.rebuild_stats(connection, commit=False)
+            assert migrated == _counters(connection)
+            assert migrated[(default_id, "applications", "all")] == (2, Decimal(0))
+    finally:
+        engine.dispose()
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+
+from app import models
+from app.note_timestamps import backfill_note_created_at, parse_note_timestamp
+
+
+@pytest.mark.parametrize("content, expected", [
+    ("[2026-03-02 09:15:00] -- called the recruiter", datetime(2026, 3, 2, 9, 15, tzinfo=timezone.utc)),
+    ("[2026-02-30 09:15:00] -- not a date", None),
+    ("called the recruiter [2026-03-02 09:15:00] -- later", None),
+    ("[2026-03-02] -- no time", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_note_timestamp(content, expected):
+    assert parse_note_timestamp(content) == expected
+
+
+def test_backfill_sets_created_at_only_from_a_prefix(database_path):
+    engine = create_engine(f"sqlite:///{database_path}")
+    JA, Note = models.JobApplication, models.Note
+    contents = ["[2026-03-02 09:15:00] -- a", "no prefix", "[2026-03-03 17:00:00] -- b"]
+    try:
+        with engine.connect() as connection:
+            user_id = connection.execute(select(models.User.id)).scalar_one()
+            application_id = connection.execute(
+                insert(JA).values(user_id=user_id, company_name="Acme", role="r").returning(JA.id)
+            ).scalar_one()
+            connection.execute(insert(Note), [
+                {"user_id": user_id, "application_id": application_id, "content": content, "created_at": None} for content in contents
+            ])
+            connection.commit()
+
+            assert backfill_note_created_at(connection, batch_size=1) == 2
+            # Only rows still NULL are looked at, so a second run finds nothing left to set
+            assert backfill_note_created_at(connection) == 0
+            created = connection.execute(select(Note.created_at).order_by(Note.id)).scalars().all()
+    finally:
+        engine.dispose()
+
+    assert [stamp and stamp.replace(tzinfo=None) for stamp in created] == [
+        datetime(2026, 3, 2, 9, 15), None, datetime(2026, 3, 3, 17, 0),
+    ]
@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import update
+
+from app import crud, models, schemas
+
+pytestmark = pytest.mark.anyio
+
+
+async def _write_elsewhere(db, application_id: int, **values) -> None:
+    # What a write handled by another worker looks like to this one: no local invalidation
+    await db.execute(
+        update(models.JobApplication).where(models.JobApplication.id == application_id).values(**values, **crud._touched())
+    )
+    await db.commit()
+
+
+async def test_list_page_is_not_served_from_cache_after_another_workers_write(client, db, user_id):
+    application = await crud.create_job_application(db, user_id, schemas.JobApplicationCreate(company_name="Before", role="r"))
+    first = await client.get("/")
+    assert "Before" in first.text
+    assert (await client.get("/")).headers["ETag"] == first.headers["ETag"]
+
+    await _write_elsewhere(db, application.id, company_name="After")
+    second = await client.get("/")
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert "After" in second.text and "Before" not in second.text
+
+
+async def test_detail_page_is_not_served_from_cache_after_another_workers_write(client, db, user_id):
+    application = await crud.create_job_application(db, user_id, schemas.JobApplicationCreate(company_name="Before", role="r"))
+    assert "Before" in (await client.get(f"/applications/{application.id}")).text
+
+    await _write_elsewhere(db, application.id, company_name="After")
+    assert "After" in (await client.get(f"/applications/{application.id}")).text
+
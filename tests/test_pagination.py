@@ -0,0 +1,75 @@
+from datetime import date
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app import crud, schemas
+from app.pagination import InvalidCursor, SortKey, decode_cursor, encode_cursor, keyset_condition
+
+pytestmark = pytest.mark.anyio
+
+DATES = [None, date(2026, 3, 2), date(2026, 3, 2), None, date(2026, 1, 5), date(2026, 3, 2), date(2025, 12, 31)]
+
+
+@pytest.fixture
+async def listed(db, user_id):
+    """Application ids in listing order: date DESC NULLS FIRST, then id DESC."""
+    created = await crud.create_job_applications(db, user_id, [
+        schemas.JobApplicationCreate(company_name=f"C{i}", role="r", application_date=day)
+        for i, day in enumerate(DATES * 3)
+    ])
+    rows = sorted(zip(DATES * 3, created), key=lambda row: (row[0] is None, row[0] or date.min, row[1]))
+    return [application_id for _, application_id in reversed(rows)]
+
+
+async def _walk(db, user_id, limit, forward=True):
+    ids, cursor = [], {}
+    while True:
+        page = await crud.get_job_application_list(db, user_id, limit=limit, **cursor)
+        ids.extend(item.id for item in page.items)
+        if page.next_cursor is None:
+            return ids, page
+        cursor = {"after": page.next_cursor}
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 5, 50])
+async def test_forward_pages_cover_the_list_in_order(db, user_id, listed, limit):
+    ids, _ = await _walk(db, user_id, limit)
+    assert ids == listed
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4])
+async def test_backward_pages_retrace_the_forward_ones(db, user_id, listed, limit):
+    _, last = await _walk(db, user_id, limit)
+    ids = [item.id for item in last.items]
+    cursor = last.prev_cursor
+    while cursor is not None:
+        page = await crud.get_job_application_list(db, user_id, limit=limit, before=cursor)
+        ids[:0] = [item.id for item in page.items]
+        cursor = page.prev_cursor
+    assert ids == listed
+
+
+def test_cursor_round_trip_and_rejects_foreign_cursors():
+    keys = crud.APPLICATION_LIST_KEYS
+    assert decode_cursor(encode_cursor((date(2026, 3, 2), 7)), keys) == (date(2026, 3, 2), 7)
+    assert decode_cursor(encode_cursor((None, 7)), keys) == (None, 7)
+    for cursor in ("not base64!", encode_cursor((1,)), encode_cursor(("x", 7)), encode_cursor((None, None))):
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor, keys)
+
+
+@pytest.mark.parametrize("backwards, bound", [
+    (False, "application_date <= '2026-03-02' AND"),
+    (True, "(job_applications.application_date >= '2026-03-02' OR job_applications.application_date IS NULL) AND"),
+])
+def test_keyset_condition_bounds_the_leading_key(backwards, bound):
+    # Without a plain range on the first key the planner has no index bound and scans from the list's start
+    condition = keyset_condition(crud.APPLICATION_LIST_KEYS, (date(2026, 3, 2), 7), backwards)
+    sql = str(condition.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert bound in sql
+
+
+def test_single_key_condition_is_the_range_itself():
+    key = SortKey(crud.models.Note.id)
+    assert str(keyset_condition((key,), (10,)).compile(compile_kwargs={"literal_binds": True})) == "notes.id < 10"
@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import preflight
+
+
+@pytest.fixture
+def no_upgrade(monkeypatch):
+    def upgrade(connection):
+        raise AssertionError("preflight ran Alembic")
+
+    monkeypatch.setattr(preflight, "upgrade", upgrade)
+
+
+def _set_revision(path, revision: str) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("UPDATE alembic_version SET version_num = :revision"), {"revision": revision})
+    finally:
+        engine.dispose()
+
+
+def test_preflight_skips_alembic_when_the_schema_is_at_head(database_path, no_upgrade):
+    assert preflight.preflight(f"sqlite:///{database_path}") is False
+
+
+def test_preflight_leaves_a_newer_schema_alone(database_path, no_upgrade):
+    _set_revision(database_path, "ffffffffffff")
+    assert preflight.preflight(f"sqlite:///{database_path}") is False
+
+
+def test_preflight_migrates_only_when_behind(tmp_path):
+    url = f"sqlite:///{tmp_path / 'empty.db'}"
+    assert preflight.preflight(url, migrate=False) is None
+    assert preflight.preflight(url) is True
+
+    _, heads = preflight.script_revisions()
+    connection = preflight.connect(url)
+    try:
+        assert preflight.database_revisions(connection) == heads
+    finally:
+        connection.close()
+    assert preflight.preflight(url) is False
@@ -0,0 +1,133 @@
+import asyncio
+import os
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app import crud, models, reminders, schemas
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    notifications = []
+
+    async def notify(reminder):
+        notifications.append(reminder)
+
+    monkeypatch.setattr(reminders, "notify", notify)
+    return notifications
+
+
+def _scheduler() -> reminders.Scheduler:
+    # Driven tick by tick rather than through start()
+    scheduler = reminders.Scheduler()
+    scheduler._wake = asyncio.Event()
+    return scheduler
+
+
+async def _reminder_count(db) -> int:
+    return (await db.execute(select(func.count()).select_from(models.Reminder))).scalar()
+
+
+async def test_follow_up_due_within_catch_up_fires_once(db, user_id, sent):
+    application = await crud.create_job_application(db, user_id, schemas.JobApplicationCreate(company_name="Acme", role="r"))
+    await db.execute(
+        update(models.JobApplication)
+        .where(models.JobApplication.id == application.id)
+        .values(updated_at=reminders.utcnow() - timedelta(days=reminders.FOLLOW_UP_DAYS, hours=1))
+    )
+    await db.commit()
+
+    scheduler = _scheduler()
+    await scheduler._tick()
+    scheduler.wake()
+    await scheduler._tick()
+    await scheduler.flush()
+
+    assert [(r["application_id"], r["kind"], r["user_id"]) for r in sent] == [(application.id, reminders.FOLLOW_UP, user_id)]
+    assert await _reminder_count(db) == 1
+
+
+async def test_synced_reminder_past_catch_up_is_never_fired(db, user_id, sent):
+    # Its interview reminder fell due 11 days ago, long before the catch-up window
+    application = await crud.create_job_application(
+        db, user_id,
+        schemas.JobApplicationCreate(company_name="Old", role="r", interview_date=date.today() - timedelta(days=10)),
+    )
+    scheduler = _scheduler()
+    await scheduler._tick()
+
+    # A new note moves updated_at, so the next sync re-reads the application
+    assert await crud.create_note_for_application(db, user_id, schemas.NoteCreate(content="thanks"), application.id)
+    scheduler.wake()
+    await scheduler._tick()
+    await scheduler.flush()
+
+    assert sent == []
+    assert scheduler.pending() == 0
+    assert await _reminder_count(db) == 0
+
+
+async def test_notifications_are_sent_concurrently_up_to_the_limit(db, user_id, monkeypatch):
+    in_flight, peak, sent = 0, 0, []
+    release = asyncio.Event()
+
+    async def notify(reminder):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await release.wait()
+        in_flight -= 1
+        sent.append(reminder["application_id"])
+
+    monkeypatch.setattr(reminders, "notify", notify)
+    monkeypatch.setattr(reminders, "NOTIFY_CONCURRENCY", 2)
+    ids = await crud.create_job_applications(db, user_id, [
+        schemas.JobApplicationCreate(company_name=f"Company {n}", role="r") for n in range(5)
+    ])
+    await db.execute(
+        update(models.JobApplication).values(updated_at=reminders.utcnow() - timedelta(days=reminders.FOLLOW_UP_DAYS, hours=1))
+    )
+    await db.commit()
+
+    scheduler = _scheduler()
+    # Every reminder is recorded without waiting for the notifications before it
+    await scheduler._tick()
+    assert await _reminder_count(db) == 5
+    await asyncio.sleep(0)
+    assert (in_flight, sent) == (2, [])
+
+    release.set()
+    await scheduler.flush()
+    assert sorted(sent) == sorted(ids)
+    assert peak == 2
+
+
+async def test_only_the_lock_holder_schedules(engine, tmp_path, monkeypatch):
+    lock_file = str(tmp_path / "reminders.lock")
+    monkeypatch.setattr(reminders, "ENABLED", True)
+    monkeypatch.setattr(reminders, "LOCK_FILE", lock_file)
+    monkeypatch.setattr(reminders, "SYNC_SECONDS", 0.01)
+    held = reminders.try_lock(lock_file)
+    assert held is not None
+    assert reminders.try_lock(lock_file) is None
+
+    scheduler = reminders.Scheduler()
+    scheduler.start()
+    try:
+        await asyncio.sleep(0.05)
+        assert scheduler._loaded_until is None
+        # The other worker exits: this one takes over
+        os.close(held)
+        for _ in range(100):
+            if scheduler._loaded_until is not None:
+                break
+            await asyncio.sleep(0.01)
+        assert scheduler._loaded_until is not None
+        assert reminders.try_lock(lock_file) is None
+    finally:
+        await scheduler.stop()
+    os.close(reminders.try_lock(lock_file))
@@ -0,0 +1,63 @@
+import httpx
+import pytest
+from starlette.responses import PlainTextResponse
+
+from app import replicas
+
+pytestmark = pytest.mark.anyio
+
+
+def test_candidates_rotate_and_skip_replicas_marked_down(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(replicas.time, "monotonic", lambda: now[0])
+    a, b, c = object(), object(), object()
+    replica_set = replicas.ReplicaSet()
+    for engine in (a, b, c):
+        replica_set.add(engine)
+
+    assert replica_set.candidates() == [a, b, c]
+    assert replica_set.candidates() == [b, c, a]
+    replica_set.mark_down(c)
+    assert replica_set.candidates() == [a, b]
+    assert replica_set.healthy() == 2
+
+    # Retried once RETRY_SECONDS have passed, or as soon as it is marked up
+    now[0] += replicas.RETRY_SECONDS
+    assert replica_set.candidates() == [a, b, c]
+    replica_set.mark_down(b)
+    replica_set.mark_up(b)
+    assert replica_set.candidates() == [b, c, a]
+    assert replicas.ReplicaSet().candidates() == []
+
+
+def _client(replica_set: replicas.ReplicaSet) -> httpx.AsyncClient:
+    async def app(scope, receive, send):
+        status_code = int(scope["path"].strip("/"))
+        await PlainTextResponse("ok", status_code=status_code)(scope, receive, send)
+
+    transport = httpx.ASGITransport(app=replicas.ReadYourWritesMiddleware(app, replica_set))
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+@pytest.mark.parametrize("method, path, pinned", [
+    ("POST", "/303", True),
+    ("DELETE", "/204", True),
+    ("POST", "/404", False),
+    ("PATCH", "/422", False),
+    ("GET", "/200", False),
+    ("HEAD", "/200", False),
+])
+async def test_only_successful_unsafe_requests_pin_reads_to_the_primary(method, path, pinned):
+    replica_set = replicas.ReplicaSet()
+    replica_set.add(object())
+    async with _client(replica_set) as client:
+        response = await client.request(method, path)
+    assert (replicas.PRIMARY_COOKIE in response.cookies) is pinned
+    if pinned:
+        assert f"Max-Age={replicas.READ_YOUR_WRITES_SECONDS}" in response.headers["set-cookie"]
+
+
+async def test_no_cookie_without_replicas():
+    async with _client(replicas.ReplicaSet()) as client:
+        response = await client.post("/200")
+    assert "set-cookie" not in response.headers
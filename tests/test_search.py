@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import delete, update
+
+from app import crud, models, schemas
+
+pytestmark = pytest.mark.anyio
+
+
+async def _found(db, user_id: int, term: str) -> list:
+    page = await crud.get_job_application_list(db, user_id, search_term=term)
+    return [item.id for item in page.items]
+
+
+async def test_search_follows_note_inserts_edits_and_deletes(db, user_id):
+    application = await crud.create_job_application(db, user_id, schemas.JobApplicationCreate(company_name="Acme", role="r"))
+    first = await crud.create_note_for_application(db, user_id, schemas.NoteCreate(content="recruiter mentioned kubernetes"), application.id)
+    second = await crud.create_note_for_application(db, user_id, schemas.NoteCreate(content="onsite with the platform team"), application.id)
+    assert await _found(db, user_id, "kubernetes") == [application.id]
+    assert await _found(db, user_id, "acme platform") == [application.id]
+
+    await db.execute(update(models.Note).where(models.Note.id == first.id).values(content="recruiter mentioned terraform"))
+    await db.commit()
+    assert await _found(db, user_id, "kubernetes") == []
+    assert await _found(db, user_id, "terraform") == [application.id]
+
+    await db.execute(delete(models.Note).where(models.Note.id == second.id))
+    await db.commit()
+    assert await _found(db, user_id, "platform") == []
+    assert await _found(db, user_id, "terraform") == [application.id]
+
+
+async def test_search_follows_application_edits_and_keeps_the_notes(db, user_id):
+    application = await crud.create_job_application(db, user_id, schemas.JobApplicationCreate(company_name="Acme", role="r"))
+    await crud.create_note_for_application(db, user_id, schemas.NoteCreate(content="recruiter mentioned kubernetes"), application.id)
+
+    await crud.update_job_application(db, user_id, application.id, schemas.JobApplicationUpdate(company_name="Globex"))
+    assert await _found(db, user_id, "acme") == []
+    assert await _found(db, user_id, "globex kubernetes") == [application.id]
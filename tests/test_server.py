@@ -0,0 +1,48 @@
+import importlib
+
+import pytest
+
+from app import server
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    """Re-evaluate the Gunicorn config under the given environment; everything is restored afterwards."""
+    # Recorded up front so whatever the config sets is undone too
+    monkeypatch.setenv("APP_CACHE_BROKER", "")
+    monkeypatch.setenv("REMINDER_LOCK_FILE", "")
+
+    def configure(**env):
+        for name, value in env.items():
+            if value is None:
+                monkeypatch.delenv(name)
+            else:
+                monkeypatch.setenv(name, value)
+        return importlib.reload(server)
+
+    yield configure
+    monkeypatch.undo()
+    importlib.reload(server)
+
+
+def test_several_workers_share_page_cache_invalidations(configure):
+    config = configure(WEB_CONCURRENCY="4", APP_CACHE_BROKER=None)
+    assert config.workers == 4
+    assert config.os.environ["APP_CACHE_BROKER"].startswith("file:")
+
+
+def test_explicit_broker_is_kept(configure):
+    config = configure(WEB_CONCURRENCY="4", APP_CACHE_BROKER="local")
+    assert config.os.environ["APP_CACHE_BROKER"] == "local"
+
+
+def test_single_worker_keeps_the_local_broker(configure):
+    config = configure(WEB_CONCURRENCY="1", APP_CACHE_BROKER=None)
+    assert "APP_CACHE_BROKER" not in config.os.environ
+
+
+def test_several_workers_share_one_reminder_scheduler(configure):
+    config = configure(WEB_CONCURRENCY="4", REMINDER_LOCK_FILE=None)
+    assert config.os.environ["REMINDER_LOCK_FILE"].endswith(".lock")
+    config = configure(WEB_CONCURRENCY="1", REMINDER_LOCK_FILE=None)
+    assert "REMINDER_LOCK_FILE" not in config.os.environ
@@ -0,0 +1,48 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app import crud, models, schemas, stats, users
+
+pytestmark = pytest.mark.anyio
+
+
+async def _counters(db) -> dict:
+    S = models.ApplicationStat
+    rows = await db.execute(select(S.user_id, S.metric, S.bucket, S.count, S.total))
+    # Deltas leave a counter at zero where a rebuild has no row at all
+    return {(user_id, metric, bucket): (count, Decimal(total)) for user_id, metric, bucket, count, total in rows if count or total}
+
+
+async def _rebuilt(db) -> dict:
+    connection = await db.connection()
+    await connection.run_sync(stats.rebuild_stats, False)
+    return await _counters(db)
+
+
+async def test_counters_kept_by_deltas_match_a_rebuild(db, user_id):
+    other_user = await users.user_id_for(db, "alice", create=True)
+    Create, Update = schemas.JobApplicationCreate, schemas.JobApplicationUpdate
+    ids = await crud.create_job_applications(db, user_id, [
+        Create(company_name="A", role="r", status="Applied", application_date=date(2026, 3, 2), salary=Decimal("95000")),
+        Create(company_name="B", role="r", status="Interview", application_date=date(2026, 3, 8), interview_date=date(2026, 3, 20)),
+        Create(company_name="C", role="r", status="Offer", offer=True, salary=Decimal("124999.50"), is_active=False),
+        Create(company_name="D", role="r", status="Rejected", application_date=date(2026, 2, 27)),
+        Create(company_name="E", role="r"),
+    ])
+    await crud.create_job_application(db, other_user, Create(company_name="A", role="r", status="Applied", salary=Decimal("80000")))
+    a, b, c, d, e = ids
+
+    await crud.update_job_application(db, user_id, a, Update(status="Interview", salary=Decimal("101000"), application_date=date(2026, 3, 10)))
+    await crud.update_job_applications(db, user_id, {b: Update(status="Offer", offer=True), e: Update(salary=Decimal("60000"))})
+    await crud.deactivate_job_application(db, user_id, b)
+    await crud.set_job_applications_state(db, user_id, [c, d], "activate")
+    await crud.set_job_applications_state(db, user_id, [d], "deactivate")
+    await crud.delete_job_application(db, user_id, e)
+    await crud.set_job_applications_state(db, user_id, [c], "delete")
+
+    maintained = await _counters(db)
+    assert maintained
+    assert maintained == await _rebuilt(db)
@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import create_engine, insert, select
+
+from app import models, statuses
+
+
+def test_backfill_maps_free_text_onto_status_rows(database_path):
+    engine = create_engine(f"sqlite:///{database_path}")
+    JA, Status = models.JobApplication, models.Status
+    raw = ["interview", " Offer  received", "Phone_Screen", "Coffee chat", "coffee  CHAT", "   ", "APPLIED"]
+    try:
+        with engine.connect() as connection:
+            user_id = connection.execute(select(models.User.id)).scalar_one()
+            connection.execute(insert(JA), [
+                {"user_id": user_id, "company_name": f"Company {n}", "role": "r", "status": status} for n, status in enumerate(raw)
+            ])
+            connection.commit()
+
+            # Small batches, so the run has to resume after each commit
+            assert statuses.backfill_status_ids(connection, batch_size=2) == len(raw)
+
+            rows = connection.execute(
+                select(JA.status, JA.status_id, Status.name).outerjoin(Status, Status.id == JA.status_id).order_by(JA.id)
+            ).all()
+            new_statuses = connection.execute(select(Status.name).where(Status.position == statuses.OTHER_POSITION)).scalars().all()
+    finally:
+        engine.dispose()
+
+    assert [status for status, _, _ in rows] == [
+        "Interviewing", "Offer", "Phone Screen", "Coffee chat", "Coffee chat", None, "Applied",
+    ]
+    assert all(status == name for status, _, name in rows)
+    assert rows[3].status_id == rows[4].status_id
+    assert new_statuses == ["Coffee chat"]
+
+
+@pytest.mark.anyio
+async def test_statuses_list_the_canonical_ones_and_only_the_users_own_others(client, user_header):
+    alice, bob = {user_header: "alice"}, {user_header: "bob"}
+    response = await client.post("/api/applications", json={"company_name": "Acme", "role": "r", "status": "Coffee chat"}, headers=alice)
+    assert response.status_code == 201
+
+    canonical = [name for name, _ in statuses.CANONICAL_STATUSES]
+    alice_statuses = [status["name"] for status in (await client.get("/api/statuses", headers=alice)).json()]
+    bob_statuses = [status["name"] for status in (await client.get("/api/statuses", headers=bob)).json()]
+    assert alice_statuses == canonical + ["Coffee chat"]
+    assert bob_statuses == canonical
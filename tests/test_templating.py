@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+from starlette.requests import Request
+
+from app import crud, schemas, templating
+from app.cache import response_cache
+from app.main import app
+
+pytestmark = pytest.mark.anyio
+
+
+def _request() -> Request:
+    return Request({
+        "type": "http", "app": app, "router": app.router, "method": "GET", "scheme": "http", "server": ("test", 80),
+        "path": "/", "root_path": "", "query_string": b"", "headers": [],
+    })
+
+
+async def _index_context(db, user_id: int) -> dict:
+    await crud.create_job_applications(db, user_id, [
+        schemas.JobApplicationCreate(company_name=f"Company <{n}> & Sons", role="Engineer", application_date=date(2026, 3, 1 + n % 28))
+        for n in range(40)
+    ])
+    page = await crud.get_job_application_list(db, user_id, is_active=True)
+    facets = await crud.get_status_facets(db, user_id, is_active=True)
+    return {
+        "applications": page.items, "page": page, "facets": facets, "current_status": None,
+        "current_year": 2026, "current_view": "active", "search_term": None,
+    }
+
+
+async def _streamed(response) -> list:
+    return [chunk async for chunk in response.body_iterator]
+
+
+async def test_streamed_page_matches_the_rendered_page(db, user_id, monkeypatch):
+    context = await _index_context(db, user_id)
+    rendered = templating.templates.TemplateResponse(_request(), "index.html", context).body
+
+    monkeypatch.setattr(templating, "STREAM_CHUNK_SIZE", 1024)
+    response_cache.clear()
+    chunks = await _streamed(templating.stream_template(_request(), "index.html", context, cache_key="index", generations=()))
+    assert len(chunks) > 1
+    assert all(len(chunk) >= 1024 for chunk in chunks[:-1])
+    assert b"".join(chunks) == rendered
+    assert response_cache.get("index") == rendered
+
+    # Pages over the cacheable size still stream whole but are not kept
+    monkeypatch.setattr(templating, "MAX_CACHED_STREAM", 2048)
+    response_cache.clear()
+    chunks = await _streamed(templating.stream_template(_request(), "index.html", context, cache_key="index", generations=()))
+    assert b"".join(chunks) == rendered
+    assert response_cache.get("index") is None
+    response_cache.clear()
@@ -0,0 +1,80 @@
+from datetime import date, timedelta
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def alice_and_bob(client, user_header):
+    """Request headers for two users, and an application of alice's with a note."""
+    alice, bob = {user_header: "alice"}, {user_header: "bob"}
+    response = await client.post("/api/applications", headers=alice, json={
+        "company_name": "Acme", "role": "Engineer", "status": "Coffee chat", "application_date": "2026-03-02",
+        "interview_date": (date.today() + timedelta(days=3)).isoformat(), "offer": True, "salary": "120000",
+    })
+    application_id = response.json()["id"]
+    response = await client.post(f"/applications/{application_id}/notes/new", data={"content": "kubernetes onsite"}, headers=alice)
+    assert response.status_code == 303
+    # Bob exists, with nothing of his own
+    assert (await client.get("/api/applications", headers=bob)).status_code == 200
+    return alice, bob, application_id
+
+
+async def test_another_users_application_is_not_found(client, alice_and_bob):
+    alice, bob, application_id = alice_and_bob
+    for path in (f"/api/applications/{application_id}", f"/applications/{application_id}",
+                 f"/applications/{application_id}/edit", f"/applications/{application_id}/notes"):
+        assert (await client.get(path, headers=bob)).status_code == 404, path
+        assert (await client.get(path, headers=alice)).status_code == 200, path
+
+
+async def test_another_users_application_cannot_be_changed(client, alice_and_bob):
+    alice, bob, application_id = alice_and_bob
+    assert (await client.patch(f"/api/applications/{application_id}", json={"role": "Manager"}, headers=bob)).status_code == 404
+    form = {"company_name": "Hijacked", "role": "Manager"}
+    assert (await client.post(f"/applications/{application_id}/edit", data=form, headers=bob)).status_code == 404
+    assert (await client.post(f"/applications/{application_id}/notes/new", data={"content": "hi"}, headers=bob)).status_code == 404
+    for action in ("deactivate", "delete"):
+        # The form actions redirect back to the list whether or not anything matched
+        assert (await client.post(f"/applications/{application_id}/{action}", headers=bob)).status_code == 303
+        response = await client.post("/applications/bulk", data={"ids": [application_id], "action": action}, headers=bob)
+        assert response.status_code == 303
+        body = (await client.post("/api/applications/batch/state", json={"ids": [application_id], "action": action}, headers=bob)).json()
+        assert (body["changed"], body["not_found"]) == ([], [application_id])
+
+    application = (await client.get(f"/api/applications/{application_id}", headers=alice)).json()
+    assert (application["company_name"], application["role"], application["is_active"]) == ("Acme", "Engineer", True)
+    assert [note["content"] for note in application["notes"]] == ["kubernetes onsite"]
+
+
+async def test_another_users_rows_stay_out_of_lists_search_and_exports(client, alice_and_bob):
+    alice, bob, application_id = alice_and_bob
+    for params in ({"view": "all"}, {"search": "acme"}, {"search": "kubernetes"}):
+        assert [item["id"] for item in (await client.get("/api/applications", params=params, headers=alice)).json()["items"]] == [application_id]
+        assert (await client.get("/api/applications", params=params, headers=bob)).json()["items"] == []
+    for path in ("/", "/upcoming"):
+        assert "Acme" in (await client.get(path, headers=alice)).text, path
+        assert "Acme" not in (await client.get(path, headers=bob)).text, path
+
+    bob_facets = (await client.get("/api/applications", params={"facets": "true"}, headers=bob)).json()["facets"]
+    assert bob_facets == []
+    assert [facet["name"] for facet in (await client.get("/api/applications", params={"facets": "true"}, headers=alice)).json()["facets"]] == ["Coffee chat"]
+
+    for fmt in ("csv", "ndjson"):
+        assert "Acme" in (await client.get(f"/export.{fmt}", headers=alice)).text
+        assert "Acme" not in (await client.get(f"/export.{fmt}", headers=bob)).text
+    assert "kubernetes" not in (await client.get("/export.ndjson?notes=true", headers=bob)).text
+
+
+async def test_another_users_notes_and_numbers_stay_out_of_activity_and_stats(client, alice_and_bob):
+    alice, bob, application_id = alice_and_bob
+    assert [item["application_id"] for item in (await client.get("/api/activity", headers=alice)).json()["items"]] == [application_id]
+    assert (await client.get("/api/activity", headers=bob)).json()["items"] == []
+    assert "kubernetes" not in (await client.get("/activity", headers=bob)).text
+
+    alice_stats = (await client.get("/api/stats", headers=alice)).json()
+    bob_stats = (await client.get("/api/stats", headers=bob)).json()
+    assert (alice_stats["total"], alice_stats["interviews"], alice_stats["offers"]) == (1, 1, 1)
+    assert (bob_stats["total"], bob_stats["interviews"], bob_stats["offers"], bob_stats["by_status"]) == (0, 0, 0, [])
+    assert "Coffee chat" not in (await client.get("/stats", headers=bob)).text